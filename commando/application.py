@@ -26,6 +26,8 @@ class CommandoApplication(Adw.Application):
             flags=0
         )
         self.config = Config()
+        # Pick up changes other Commando instances or tools make to the settings
+        self.config.watch()
         self.window = None
         
         # Connect signals
@@ -56,4 +58,7 @@ class CommandoApplication(Adw.Application):
         logger.info("Application shutting down")
         if self.window:
             self.window.cleanup()
+        # Write settings changed within the last moments
+        self.config.unwatch()
+        self.config.flush()
 
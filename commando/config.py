@@ -2,24 +2,79 @@
 Configuration management.
 """
 
+import atexit
+import copy
+import fcntl
+import hashlib
+import itertools
 import json
 import logging
 import os
+import shutil
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict
+
+from commando import config_schema
 
 logger = logging.getLogger(__name__)
 
+# Changes are written once no further change came in for this long...
+SAVE_DELAY_SECONDS = 0.5
+# ...but no later than this after the first unsaved change
+SAVE_MAX_DELAY_SECONDS = 5.0
+
+# Instances with changes not written yet, flushed before loading and at exit
+_unsaved: "weakref.WeakSet[Config]" = weakref.WeakSet()
+
+
+def _flush_all():
+    """Write pending changes of all instances."""
+    for config in list(_unsaved):
+        config.flush()
+
+
+atexit.register(_flush_all)
+
+
+def _content_hash(data: bytes) -> str:
+    """Hash of the config file contents, to tell real changes from our own writes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _idle_dispatch(callback: Callable[[], None]):
+    """Run callback on the next main loop iteration."""
+    from gi.repository import GLib
+    GLib.idle_add(callback)
+
 
 class Config:
     """Configuration manager."""
     
     _instance = None
-    _config: Dict[str, Any] = {}
+    _config: Dict[str, Any] = {}  # Settings that differ from the schema defaults, as saved
+    _values: Dict[str, Any] = {}  # Defaults merged with _config: every lookup is one dict access
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._lock = threading.RLock()
+            cls._instance._save_lock = threading.Lock()  # Serializes writes; taken before _lock, never inside it
+            cls._instance._save_timer = None
+            cls._instance._dirty_since = None  # Time of the first unsaved change
+            cls._instance._batch_depth = 0
+            cls._instance._subscribers = {}  # Subscription id -> (key or prefix, callback)
+            cls._instance._subscription_ids = itertools.count(1)
+            cls._instance._pending_changes = {}  # Key -> (value before the first change, current value)
+            cls._instance._dispatch_scheduled = False
+            cls._instance.dispatcher = _idle_dispatch  # Schedules delivery of change notifications
+            cls._instance._modified = {}  # Key -> wall clock time of its last change (also kept for resets)
+            cls._instance._file_hash = None  # Hash of the file as last read or written
+            cls._instance._synced_at = 0.0  # Wall clock time the file was last read or written
+            cls._instance._monitor = None
             cls._instance._load()
         return cls._instance
     
@@ -85,84 +140,374 @@ class Config:
     
     def _load(self):
         """Load configuration from file."""
+        _flush_all()  # A previous instance may not have written its changes yet
         config_file = self._get_config_file()
+        migrated = False
+        self._config, self._modified = {}, {}
         if config_file.exists():
             try:
-                with open(config_file, "r") as f:
-                    self._config = json.load(f)
+                raw = config_file.read_bytes()
+                self._config, self._modified, migrated = self._parse(raw)
+                self._file_hash = _content_hash(raw)
+                self._synced_at = time.time()
                 logger.debug(f"Loaded configuration from {config_file}")
             except Exception as e:
                 logger.error(f"Failed to load config: {e}")
-                self._config = {}
-        else:
-            self._config = self._get_defaults()
+                self._config, self._modified = {}, {}
+        self._values = {**self._get_defaults(), **self._config}
+        if migrated:
+            # Keep the old layout around for downgrades
+            try:
+                shutil.copy2(config_file, config_file.with_name(config_file.name + ".v1"))
+            except OSError as e:
+                logger.warning(f"Failed to back up config before migration: {e}")
+        if migrated or not config_file.exists():
             self._save()
     
+    @staticmethod
+    def _parse(raw: bytes):
+        """
+        Parse config file contents.
+        
+        Returns:
+            Tuple of (settings, key -> modification time, whether the file was migrated)
+        """
+        data = json.loads(raw)
+        settings, migrated = config_schema.migrate(data)
+        modified = data.get("modified") if not migrated else None
+        if not isinstance(modified, dict):
+            modified = {}
+        modified = {
+            key: float(stamp) for key, stamp in modified.items()
+            if isinstance(stamp, (int, float)) and not isinstance(stamp, bool)
+        }
+        return settings, modified, migrated
+    
+    def _merge(self, raw: bytes) -> bool:
+        """
+        Merge settings another process wrote, per key, the latest change winning.
+        
+        Keys without a modification time in the file (e.g. edited by hand)
+        count as changed when the file was, unless changed here since.
+        
+        Returns:
+            Whether this instance has changes the file lacks
+        """
+        try:
+            settings, modified, _migrated = self._parse(raw)
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable config file contents: {e}")
+            return True
+        newer = False
+        with self._lock:
+            for key in set(settings) | set(modified) | set(self._config) | set(self._modified):
+                theirs, ours = modified.get(key, self._synced_at), self._modified.get(key, 0.0)
+                if ours > theirs:
+                    newer = newer or settings.get(key) != self._config.get(key)
+                    continue
+                if self._apply(key, settings.get(key), config_schema.SCHEMA.get(key)):
+                    logger.debug(f"Config {key} changed by another process")
+                if key in modified:
+                    self._modified[key] = theirs
+                else:
+                    self._modified.pop(key, None)
+        return newer
+    
+    @contextmanager
+    def _file_lock(self, directory: Path):
+        """Serialize the read-merge-write cycles of all Commando processes."""
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)  # Releases the lock
+    
     def _save(self):
-        """Save configuration to file."""
+        """Save configuration to file atomically, keeping changes other processes made meanwhile."""
         config_file = self._get_config_file()
+        tmp_file = config_file.with_name(config_file.name + ".tmp")
         try:
-            with open(config_file, "w") as f:
-                json.dump(self._config, f, indent=2)
+            with self._file_lock(config_file.parent):
+                try:
+                    raw = config_file.read_bytes()
+                except FileNotFoundError:
+                    raw = None
+                with self._lock:
+                    if raw is not None and _content_hash(raw) != self._file_hash:
+                        self._merge(raw)
+                    data = json.dumps({
+                        "version": config_schema.CONFIG_VERSION,
+                        "values": self._config,
+                        "modified": self._modified,
+                    }, indent=2).encode()
+                    # Our own write must not look like an outside change to the watcher
+                    self._file_hash = _content_hash(data)
+                    self._synced_at = time.time()
+                with open(tmp_file, "wb") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                # Readers see either the old or the new file, never a partial one
+                os.replace(tmp_file, config_file)
             logger.debug(f"Saved configuration to {config_file}")
         except Exception as e:
             logger.error(f"Failed to save config: {e}")
     
+    def reload(self) -> bool:
+        """
+        Merge changes other processes (or the user) made to the file.
+        
+        Subscribers are notified of the settings that changed.
+        
+        Returns:
+            Whether the file contents differed from what was last read or written
+        """
+        try:
+            raw = self._get_config_file().read_bytes()
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.warning(f"Failed to read config file: {e}")
+            return False
+        file_hash = _content_hash(raw)
+        with self._lock:
+            if file_hash == self._file_hash:
+                return False
+            newer = self._merge(raw)
+            self._file_hash = file_hash
+            self._synced_at = time.time()
+            if newer:
+                self._mark_dirty()  # Write back what the other writer lacks
+        logger.info("Reloaded configuration changed on disk")
+        return True
+    
+    def watch(self):
+        """Reload the file whenever it changes (needs a running GLib main loop)."""
+        from gi.repository import Gio
+        if self._monitor is not None:
+            return
+        try:
+            config_file = Gio.File.new_for_path(str(self._get_config_file()))
+            self._monitor = config_file.monitor_file(Gio.FileMonitorFlags.WATCH_MOVES, None)
+        except Exception as e:
+            logger.warning(f"Cannot watch config file: {e}")
+            return
+        self._monitor.connect("changed", self._on_file_changed)
+    
+    def unwatch(self):
+        """Stop watching the file."""
+        if self._monitor is not None:
+            self._monitor.cancel()
+            self._monitor = None
+    
+    def _on_file_changed(self, monitor, file, other_file, event_type):
+        """Handle a change of the config file."""
+        from gi.repository import Gio
+        # Atomic replacements arrive as renames; in-place edits end with a hint
+        if event_type in (
+            Gio.FileMonitorEvent.CHANGES_DONE_HINT,
+            Gio.FileMonitorEvent.CREATED,
+            Gio.FileMonitorEvent.RENAMED,
+            Gio.FileMonitorEvent.MOVED_IN,
+        ):
+            self.reload()
+    
+    def _schedule_save(self):
+        """Write changes once they stop coming in (debounced, on a background thread)."""
+        with self._lock:
+            if self._batch_depth:
+                return  # Saved when the outermost transaction ends
+            now = time.monotonic()
+            if self._dirty_since is None:
+                self._dirty_since = now
+                _unsaved.add(self)
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            delay = min(SAVE_DELAY_SECONDS, max(self._dirty_since + SAVE_MAX_DELAY_SECONDS - now, 0))
+            self._save_timer = threading.Timer(delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def flush(self):
+        """Write pending changes now."""
+        # Disk I/O and the file lock run without _lock, so set() never waits on them;
+        # _save_lock also makes a flush at shutdown wait for one running on the timer
+        with self._save_lock:
+            with self._lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                if self._dirty_since is None:
+                    return
+                self._dirty_since = None
+                _unsaved.discard(self)
+            self._save()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Batch several changes into one write.
+        
+        Example:
+            with config.transaction():
+                config.set("terminal.font", "Monospace 11")
+                config.set("terminal.scrollback_lines", 5000)
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    if self._dirty_since is not None:
+                        self._schedule_save()
+                    self._schedule_dispatch()
+    
+    def subscribe(self, key: str, callback: Callable[[Dict[str, Any]], None]) -> int:
+        """
+        Get notified when configuration values change.
+        
+        Changes are collected and delivered once per main loop iteration (or
+        at the end of a transaction), only for values that really changed.
+        
+        Args:
+            key: Key to watch, or a prefix like "terminal" for all keys below it ("" for all keys)
+            callback: Called with a dict of changed keys and their new values
+        
+        Returns:
+            Subscription id for unsubscribe()
+        """
+        subscription_id = next(self._subscription_ids)
+        self._subscribers[subscription_id] = (key, callback)
+        return subscription_id
+    
+    def unsubscribe(self, subscription_id: int):
+        """Stop a subscription."""
+        self._subscribers.pop(subscription_id, None)
+    
+    def _apply(self, key: str, value: Any, spec) -> bool:
+        """
+        Store a validated value and record the change for subscribers.
+        
+        Returns:
+            Whether the value changed
+        """
+        with self._lock:
+            if value is None or (spec is not None and value == spec.default):
+                # Only customized settings are saved, so default changes take effect
+                self._config.pop(key, None)
+                value = copy.deepcopy(spec.default) if spec is not None else None
+            else:
+                # Keep a copy so later changes by the caller are not silently shared
+                value = copy.deepcopy(value)
+                self._config[key] = value
+            old = self._values.get(key)
+            if old == value:
+                return False
+            if value is None:
+                self._values.pop(key, None)
+            else:
+                self._values[key] = value
+            self._notify(key, old, value)
+            return True
+    
+    def _mark_dirty(self):
+        """Arrange for the changes to be written."""
+        with self._lock:
+            if self._batch_depth:
+                # Written when the transaction ends
+                if self._dirty_since is None:
+                    self._dirty_since = time.monotonic()
+                    _unsaved.add(self)
+            else:
+                self._schedule_save()
+    
+    def _notify(self, key: str, old: Any, new: Any):
+        """Record a change for the next dispatch."""
+        with self._lock:
+            first_old, _current = self._pending_changes.get(key, (old, None))
+            self._pending_changes[key] = (first_old, new)
+            self._schedule_dispatch()
+    
+    def _schedule_dispatch(self):
+        """Arrange for pending changes to be delivered."""
+        with self._lock:
+            if self._batch_depth or self._dispatch_scheduled or not self._pending_changes:
+                return
+            self._dispatch_scheduled = True
+        self.dispatcher(self._dispatch)
+    
+    def _dispatch(self):
+        """Deliver pending changes to subscribers."""
+        with self._lock:
+            changes = {key: new for key, (old, new) in self._pending_changes.items() if old != new}
+            self._pending_changes = {}
+            self._dispatch_scheduled = False
+        if not changes:
+            return
+        for key, callback in list(self._subscribers.values()):
+            matching = {
+                changed: copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+                for changed, value in changes.items()
+                if not key or changed == key or changed.startswith(key + ".")
+            }
+            if matching:
+                try:
+                    callback(matching)
+                except Exception as e:
+                    logger.error(f"Config change subscriber for '{key}' failed: {e}", exc_info=True)
+    
     def _get_defaults(self) -> Dict[str, Any]:
         """Get default configuration."""
-        return {
-            "theme": "system",
-            "logging.level": "INFO",
-            "terminal.font": "Monospace 12",
-            "terminal.scrollback_lines": 10000,
-            "terminal.cursor_blink": True,
-            "terminal.cursor_shape": "block",
-            "terminal.background_color": None,
-            "terminal.foreground_color": None,
-            "terminal.palette": None,
-            "terminal.external_terminal": None,
-            "main_view.layout": "cards",
-            "main_view.sort_by": "number",
-            "main_view.sort_ascending": True,
-        }
+        return config_schema.defaults()
     
     def get(self, key: str, default: Any = None) -> Any:
         """
         Get configuration value.
         
         Args:
-            key: Configuration key (supports dot notation)
-            default: Default value if key not found
+            key: Full dotted configuration key, e.g. "terminal.font"
+            default: Value to use if the key is unset and has no schema default
         
         Returns:
-            Configuration value
-        """
-        keys = key.split(".")
-        value = self._config
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k)
-                if value is None:
-                    return default
-            else:
-                return default
-        return value if value is not None else default
+            Configuration value; dicts and lists are copies, change them with set()
+        """
+        value = self._values.get(key)
+        if value is None:
+            return default
+        if isinstance(value, (dict, list)):
+            # Changing the stored value in place would bypass set(): no timestamp, notification or save
+            return copy.deepcopy(value)
+        return value
     
     def set(self, key: str, value: Any):
         """
         Set configuration value.
         
+        The file is written shortly afterwards, together with any further
+        changes made meanwhile (see transaction() and flush()).
+        
+        Values of settings declared in the schema are type checked; invalid
+        values are logged and ignored.
+        
         Args:
-            key: Configuration key (supports dot notation)
-            value: Value to set
-        """
-        keys = key.split(".")
-        config = self._config
-        for k in keys[:-1]:
-            if k not in config:
-                config[k] = {}
-            config = config[k]
-        config[keys[-1]] = value
-        self._save()
+            key: Full dotted configuration key
+            value: Value to set (None resets the setting to its default)
+        """
+        spec = config_schema.SCHEMA.get(key)
+        if spec is not None:
+            try:
+                value = spec.validate(value)
+            except ValueError as e:
+                logger.error(f"Not setting config: {e}")
+                return
+        with self._lock:
+            if not self._apply(key, value, spec):
+                return  # Nothing to write or notify
+            self._modified[key] = time.time()
+            self._mark_dirty()
         logger.debug(f"Set config {key} = {value}")
 
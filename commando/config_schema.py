@@ -0,0 +1,165 @@
+"""
+Typed schema of the configuration.
+
+Every known setting is declared once with its type and default. Config
+keeps settings in a flat dict keyed by the full dotted name, so a lookup
+is a single dict access, and validates values against the schema when
+they are loaded or set. Settings not in the schema are stored untyped.
+"""
+
+import copy
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Version of the config.json layout written by this code
+CONFIG_VERSION = 2
+
+
+@dataclass(frozen=True)
+class ConfigKey:
+    """Declaration of a setting."""
+
+    key: str
+    type: type
+    default: Any = None
+    choices: Optional[tuple] = None
+    minimum: Optional[float] = None
+
+    def validate(self, value: Any) -> Any:
+        """
+        Check a value against the declaration.
+
+        Args:
+            value: Value to check (None resets the setting to its default)
+
+        Returns:
+            The value, converted where lossless (e.g. 5.0 to 5 for an int setting)
+
+        Raises:
+            ValueError: If the value has the wrong type or is out of range
+        """
+        if value is None:
+            return None
+        if self.type is int and isinstance(value, float) and value.is_integer():
+            value = int(value)
+        elif self.type is float and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        if not isinstance(value, self.type) or (self.type is not bool and isinstance(value, bool)):
+            raise ValueError(f"{self.key} expects {self.type.__name__}, got {type(value).__name__} {value!r}")
+        if self.choices is not None and value not in self.choices:
+            raise ValueError(f"{self.key} must be one of {', '.join(map(str, self.choices))}, got {value!r}")
+        if self.minimum is not None and value < self.minimum:
+            raise ValueError(f"{self.key} must be at least {self.minimum}, got {value!r}")
+        return value
+
+
+SCHEMA: dict[str, ConfigKey] = {spec.key: spec for spec in (
+    ConfigKey("theme", str, "system", choices=("system", "light", "dark")),
+    ConfigKey("logging.level", str, "INFO", choices=("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")),
+    ConfigKey("logging.max_file_mb", int, 10, minimum=1),
+    ConfigKey("logging.max_age_hours", int, 24, minimum=1),
+    ConfigKey("logging.max_total_mb", int, 100, minimum=1),
+    ConfigKey("general.show_default_cards", bool, True),
+    ConfigKey("terminal.font", str, "Monospace 12"),
+    ConfigKey("terminal.scrollback_lines", int, 10000, minimum=0),
+    ConfigKey("terminal.cursor_blink", bool, True),
+    ConfigKey("terminal.cursor_shape", str, "block", choices=("block", "ibeam", "underline")),
+    ConfigKey("terminal.background_color", str),
+    ConfigKey("terminal.foreground_color", str),
+    ConfigKey("terminal.palette", str),
+    ConfigKey("terminal.profiles", dict, {}),
+    ConfigKey("terminal.external_terminal", str),
+    ConfigKey("terminal.warm_pool_size", int, 1, minimum=0),
+    ConfigKey("terminal.shell_integration", bool, True),
+    ConfigKey("terminal.memory_budget_mb", int, 256, minimum=0),
+    ConfigKey("terminal.hibernate_after_seconds", int, 300, minimum=0),
+    ConfigKey("terminal.tab_reuse_policy", str, "idle", choices=("new", "idle", "per_card", "lru")),
+    ConfigKey("terminal.max_tabs", int, 10, minimum=0),
+    ConfigKey("terminal.shutdown_grace_seconds", float, 2.0, minimum=0),
+    ConfigKey("terminal.monitor_interval_seconds", int, 5, minimum=1),
+    ConfigKey("terminal.throttle_background", bool, False),
+    ConfigKey("terminal.flood_rows_per_second", int, 1000, minimum=1),
+    ConfigKey("terminal.background_output_percent", int, 20, minimum=0),
+    ConfigKey("terminal.restore_sessions", bool, True),
+    ConfigKey("events.enabled", bool, True),
+    ConfigKey("events.max_file_mb", int, 5, minimum=1),
+    ConfigKey("events.max_total_mb", int, 50, minimum=1),
+    ConfigKey("recording.enabled", bool, False),
+    ConfigKey("recording.max_segment_mb", int, 16, minimum=1),
+    ConfigKey("recording.max_total_mb", int, 512, minimum=1),
+    ConfigKey("main_view.layout", str, "cards"),
+    ConfigKey("main_view.sort_by", str, "number", choices=("number", "title", "tag", "category")),
+    ConfigKey("main_view.sort_ascending", bool, True),
+    ConfigKey("executor.use_systemd_run", bool, True),
+    ConfigKey("executor.kill_grace_seconds", int, 5, minimum=0),
+    ConfigKey("executor.max_concurrent_jobs", int, 2, minimum=1),
+    ConfigKey("scheduler.history_size", int, 200, minimum=0),
+    ConfigKey("scheduler.catchup_spread_seconds", int, 10, minimum=0),
+)}
+
+
+def defaults() -> dict[str, Any]:
+    """Default value of every declared setting."""
+    return {key: copy.deepcopy(spec.default) for key, spec in SCHEMA.items()}
+
+
+def validate(values: dict[str, Any]) -> dict[str, Any]:
+    """Drop (and log) values that do not match the schema."""
+    valid = {}
+    for key, value in values.items():
+        spec = SCHEMA.get(key)
+        if spec is not None:
+            try:
+                value = spec.validate(value)
+            except ValueError as e:
+                logger.warning(f"Ignoring invalid setting: {e}")
+                continue
+        if value is not None:
+            valid[key] = value
+    return valid
+
+
+def _flatten(data: dict, prefix: str, out: dict):
+    """Flatten nested dicts into dotted keys, stopping at dict-typed settings."""
+    for name, value in data.items():
+        key = f"{prefix}{name}"
+        spec = SCHEMA.get(key)
+        if isinstance(value, dict) and (spec is None or spec.type is not dict):
+            _flatten(value, key + ".", out)
+        else:
+            out[key] = value
+
+
+def migrate(data: dict) -> tuple[dict[str, Any], bool]:
+    """
+    Convert a loaded config.json to flat settings.
+
+    Version 1 files mix flat keys (the defaults written on first run) with
+    nested dicts (written by Config.set); nested values win. Values equal to
+    the default are dropped so later default changes take effect.
+
+    Args:
+        data: Parsed config.json
+
+    Returns:
+        Tuple of (flat settings, whether the file needs rewriting)
+    """
+    if data.get("version") == CONFIG_VERSION and isinstance(data.get("values"), dict):
+        return validate(data["values"]), False
+
+    flat, nested = {}, {}
+    for name, value in data.items():
+        if "." in name:
+            flat[name] = value
+        else:
+            _flatten({name: value}, "", nested)
+    merged = validate({**flat, **nested})
+    settings = {
+        key: value for key, value in merged.items()
+        if key not in SCHEMA or value != SCHEMA[key].default
+    }
+    logger.info(f"Migrated configuration to version {CONFIG_VERSION} ({len(settings)} customized settings)")
+    return settings, True
@@ -9,7 +9,9 @@ gi.require_version("Adw", "1")
 
 from gi.repository import Gtk, Adw, GLib
 
+from commando.config import Config
 from commando.models.command import Command
+from commando.scheduler import parse_schedule
 from commando.logger import get_logger
 
 logger = get_logger(__name__)
@@ -198,6 +200,26 @@ class CardEditorDialog(Adw.Window):
         run_mode_box.append(self.run_mode_combo)
         main_box.append(run_mode_box)
         
+        # Terminal profile
+        profile_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
+        profile_label = Gtk.Label(label="Terminal Profile:")
+        profile_label.set_halign(Gtk.Align.START)
+        profile_label.set_size_request(120, -1)
+        profile_box.append(profile_label)
+        
+        self.profile_combo = Gtk.ComboBoxText()
+        self.profile_combo.append("", "Default")
+        profile = getattr(command, 'profile', "") or ""
+        profile_names = list(Config().get("terminal.profiles", {}) or {})
+        if profile and profile not in profile_names:
+            profile_names.append(profile)  # Keep a profile removed from the settings selectable
+        for name in profile_names:
+            self.profile_combo.append(name, name)
+        self.profile_combo.set_active_id(profile)
+        self.profile_combo.set_tooltip_text("Font, colors, shell, environment and directory of the internal terminal")
+        profile_box.append(self.profile_combo)
+        main_box.append(profile_box)
+        
         # No terminal option
         no_terminal_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
         self.no_terminal_check = Gtk.CheckButton(label="No terminal")
@@ -207,6 +229,64 @@ class CardEditorDialog(Adw.Window):
         no_terminal_box.set_halign(Gtk.Align.START)
         main_box.append(no_terminal_box)
         
+        # Schedule
+        schedule_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
+        schedule_label = Gtk.Label(label="Schedule:")
+        schedule_label.set_halign(Gtk.Align.START)
+        schedule_label.set_size_request(120, -1)
+        schedule_box.append(schedule_label)
+        
+        self.schedule_entry = Gtk.Entry()
+        self.schedule_entry.set_text(getattr(command, 'schedule', "") or "")
+        self.schedule_entry.set_placeholder_text("e.g. */15 * * * * or @every 1h")
+        self.schedule_entry.set_tooltip_text(
+            "Run the command periodically in the background (cron expression or @every <duration>)"
+        )
+        self.schedule_entry.set_hexpand(True)
+        self.schedule_entry.connect("changed", lambda entry: entry.remove_css_class("error"))
+        schedule_box.append(self.schedule_entry)
+        main_box.append(schedule_box)
+        
+        # Resource limits (applied to commands run without terminal)
+        limits_expander = Gtk.Expander(label="Resource Limits")
+        limits_expander.set_tooltip_text("Limits applied when the command runs without a terminal")
+        limits_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
+        limits_box.set_margin_top(12)
+        
+        self.timeout_spin = self._create_limit_row(
+            limits_box, "Timeout (s):", getattr(command, 'timeout', 0), 86400,
+            "Terminate the command after this many seconds (0 = no limit)"
+        )
+        self.cpu_limit_spin = self._create_limit_row(
+            limits_box, "CPU Time (s):", getattr(command, 'cpu_limit', 0), 86400,
+            "Maximum CPU seconds the command may use (0 = no limit)"
+        )
+        self.memory_limit_spin = self._create_limit_row(
+            limits_box, "Memory (MiB):", getattr(command, 'memory_limit', 0), 1048576,
+            "Maximum memory the command may use (0 = no limit)"
+        )
+        self.nice_spin = self._create_limit_row(
+            limits_box, "Niceness:", getattr(command, 'nice', 0), 19,
+            "Lower the CPU priority of the command (0 = unchanged, 19 = lowest)"
+        )
+        
+        ionice_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
+        ionice_label = Gtk.Label(label="I/O Priority:")
+        ionice_label.set_halign(Gtk.Align.START)
+        ionice_label.set_size_request(120, -1)
+        ionice_box.append(ionice_label)
+        
+        self.ionice_combo = Gtk.ComboBoxText()
+        self.ionice_combo.append("", "Default")
+        self.ionice_combo.append("best-effort", "Best effort")
+        self.ionice_combo.append("idle", "Idle")
+        self.ionice_combo.set_active_id(getattr(command, 'ionice_class', "") or "")
+        ionice_box.append(self.ionice_combo)
+        limits_box.append(ionice_box)
+        
+        limits_expander.set_child(limits_box)
+        main_box.append(limits_expander)
+        
         # Button box
         button_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
         button_box.set_margin_start(24)
@@ -236,6 +316,22 @@ class CardEditorDialog(Adw.Window):
         # Set as window content
         self.set_content(main_container)
     
+    def _create_limit_row(self, box: Gtk.Box, label: str, value: int, upper: int, tooltip: str) -> Gtk.SpinButton:
+        """Append a labelled numeric limit row to box and return its spin button."""
+        row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
+        row_label = Gtk.Label(label=label)
+        row_label.set_halign(Gtk.Align.START)
+        row_label.set_size_request(120, -1)
+        row.append(row_label)
+        
+        spin = Gtk.SpinButton()
+        spin.set_adjustment(Gtk.Adjustment(value=value, lower=0, upper=upper, step_increment=1))
+        spin.set_numeric(True)
+        spin.set_tooltip_text(tooltip)
+        row.append(spin)
+        box.append(row)
+        return spin
+    
     def set_saved_callback(self, callback):
         """Set callback to be called when command is saved."""
         self.saved_callback = callback
@@ -265,6 +361,23 @@ class CardEditorDialog(Adw.Window):
         
         no_terminal = self.no_terminal_check.get_active()
         run_mode = int(self.run_mode_combo.get_active_id())
+        profile = self.profile_combo.get_active_id() or ""
+        
+        timeout = int(self.timeout_spin.get_value())
+        cpu_limit = int(self.cpu_limit_spin.get_value())
+        memory_limit = int(self.memory_limit_spin.get_value())
+        nice = int(self.nice_spin.get_value())
+        ionice_class = self.ionice_combo.get_active_id() or ""
+        
+        schedule = self.schedule_entry.get_text().strip()
+        if schedule:
+            try:
+                parse_schedule(schedule)
+            except ValueError as e:
+                logger.warning(f"Invalid schedule '{schedule}': {e}")
+                self.schedule_entry.add_css_class("error")
+                self.schedule_entry.grab_focus()
+                return
         
         # Update command
         self.command.number = number
@@ -277,6 +390,13 @@ class CardEditorDialog(Adw.Window):
         self.command.description = description
         self.command.no_terminal = no_terminal
         self.command.run_mode = run_mode
+        self.command.profile = profile
+        self.command.timeout = timeout
+        self.command.cpu_limit = cpu_limit
+        self.command.memory_limit = memory_limit
+        self.command.nice = nice
+        self.command.ionice_class = ionice_class
+        self.command.schedule = schedule
         
         # Call callback if set
         if self.saved_callback:
@@ -7,7 +7,7 @@ import gi
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
-from gi.repository import Gtk, Adw, GLib
+from gi.repository import Gtk, Adw
 
 from commando.logger import get_logger
 from commando.config import Config
@@ -46,7 +46,12 @@ class SettingsDialog(Adw.PreferencesWindow):
         font_row = Adw.ActionRow(title="Font")
         font_entry = Gtk.Entry()
         font_entry.set_text(self.config.get("terminal.font", "Monospace 12"))
-        font_entry.connect("changed", self._on_font_changed)
+        # Applied when done typing, not for every partial font name
+        font_entry.connect("activate", self._on_font_changed)
+        font_focus = Gtk.EventControllerFocus()
+        font_focus.connect("leave", lambda controller: self._on_font_changed(font_entry))
+        font_entry.add_controller(font_focus)
+        self.connect("close-request", self._on_close_request, font_entry)
         font_row.add_suffix(font_entry)
         group.add(font_row)
         
@@ -74,11 +79,108 @@ class SettingsDialog(Adw.PreferencesWindow):
         cursor_blink_row.add_suffix(cursor_blink_switch)
         group.add(cursor_blink_row)
         
+        # Shell integration
+        integration_row = Adw.ActionRow(
+            title="Shell Integration",
+            subtitle="Detect when commands finish in bash, zsh and fish (applies to new tabs)"
+        )
+        integration_switch = Gtk.Switch()
+        integration_switch.set_active(self.config.get("terminal.shell_integration", True))
+        integration_switch.connect("notify::active", self._on_shell_integration_changed)
+        integration_row.add_suffix(integration_switch)
+        group.add(integration_row)
+        
+        # Warm shell pool
+        warm_pool_row = Adw.ActionRow(
+            title="Pre-started Shells",
+            subtitle="Shells kept ready in the background so new tabs open instantly"
+        )
+        warm_pool_spin = Gtk.SpinButton()
+        warm_pool_spin.set_adjustment(
+            Gtk.Adjustment(
+                value=self.config.get("terminal.warm_pool_size", 1),
+                lower=0,
+                upper=4,
+                step_increment=1
+            )
+        )
+        warm_pool_spin.set_numeric(True)
+        warm_pool_spin.connect("value-changed", self._on_warm_pool_size_changed)
+        warm_pool_row.add_suffix(warm_pool_spin)
+        group.add(warm_pool_row)
+        
+        # Tab reuse
+        reuse_row = Adw.ActionRow(
+            title="Tab Reuse",
+            subtitle="Where card commands run in the internal terminal"
+        )
+        reuse_combo = Gtk.ComboBoxText()
+        reuse_combo.append("new", "New tab every run")
+        reuse_combo.append("idle", "Reuse an idle tab")
+        reuse_combo.append("per_card", "One tab per card")
+        reuse_combo.append("lru", "Recycle oldest tab at limit")
+        reuse_combo.set_active_id(self.config.get("terminal.tab_reuse_policy", "idle"))
+        reuse_combo.connect("changed", self._on_tab_reuse_policy_changed)
+        reuse_row.add_suffix(reuse_combo)
+        group.add(reuse_row)
+        
+        # Tab restore
+        restore_row = Adw.ActionRow(
+            title="Restore Tabs",
+            subtitle="Reopen terminal tabs with their directory and scrollback on the next launch"
+        )
+        restore_switch = Gtk.Switch()
+        restore_switch.set_active(self.config.get("terminal.restore_sessions", True))
+        restore_switch.connect("notify::active", self._on_restore_sessions_changed)
+        restore_row.add_suffix(restore_switch)
+        group.add(restore_row)
+        
+        # Session recording
+        recording_row = Adw.ActionRow(
+            title="Record Terminal Output",
+            subtitle="Save the output of new tabs as compressed logs in the state directory"
+        )
+        recording_switch = Gtk.Switch()
+        recording_switch.set_active(self.config.get("recording.enabled", False))
+        recording_switch.connect("notify::active", self._on_recording_changed)
+        recording_row.add_suffix(recording_switch)
+        group.add(recording_row)
+        
+        # Output throttling
+        throttle_row = Adw.ActionRow(
+            title="Throttle Background Output",
+            subtitle="Pause commands flooding background tabs part of the time; some output may be lost"
+        )
+        throttle_switch = Gtk.Switch()
+        throttle_switch.set_active(self.config.get("terminal.throttle_background", False))
+        throttle_switch.connect("notify::active", self._on_throttle_background_changed)
+        throttle_row.add_suffix(throttle_switch)
+        group.add(throttle_row)
+        
+        # Scrollback memory budget
+        memory_row = Adw.ActionRow(
+            title="Scrollback Memory Budget (MB)",
+            subtitle="Idle background tabs are moved to disk above this (0 to disable)"
+        )
+        memory_spin = Gtk.SpinButton()
+        memory_spin.set_adjustment(
+            Gtk.Adjustment(
+                value=self.config.get("terminal.memory_budget_mb", 256),
+                lower=0,
+                upper=8192,
+                step_increment=64
+            )
+        )
+        memory_spin.set_numeric(True)
+        memory_spin.connect("value-changed", self._on_memory_budget_changed)
+        memory_row.add_suffix(memory_spin)
+        group.add(memory_row)
+        
         # External terminal
         external_row = Adw.ActionRow(title="External Terminal")
         external_entry = Gtk.Entry()
         external_entry.set_text(self.config.get("terminal.external_terminal", "") or "")
-        external_entry.set_placeholder_text("e.g., gnome-terminal, xterm")
+        external_entry.set_placeholder_text("e.g., gnome-terminal, kitty, auto")
         external_entry.connect("changed", self._on_external_terminal_changed)
         external_row.add_suffix(external_entry)
         group.add(external_row)
@@ -142,12 +244,74 @@ class SettingsDialog(Adw.PreferencesWindow):
         log_level_row.add_suffix(log_level_combo)
         logging_group.add(log_level_row)
         
+        # Log file limits
+        log_size_row = Adw.ActionRow(
+            title="Log File Size",
+            subtitle="MB written before a new log file is started and the old one compressed"
+        )
+        log_size_spin = Gtk.SpinButton()
+        log_size_spin.set_adjustment(
+            Gtk.Adjustment(
+                value=self.config.get("logging.max_file_mb", 10),
+                lower=1,
+                upper=1000,
+                step_increment=1
+            )
+        )
+        log_size_spin.set_numeric(True)
+        log_size_spin.connect("value-changed", self._on_log_file_size_changed)
+        log_size_row.add_suffix(log_size_spin)
+        logging_group.add(log_size_row)
+        
+        log_age_row = Adw.ActionRow(
+            title="Log File Age",
+            subtitle="Hours before a new log file is started"
+        )
+        log_age_spin = Gtk.SpinButton()
+        log_age_spin.set_adjustment(
+            Gtk.Adjustment(
+                value=self.config.get("logging.max_age_hours", 24),
+                lower=1,
+                upper=720,
+                step_increment=1
+            )
+        )
+        log_age_spin.set_numeric(True)
+        log_age_spin.connect("value-changed", self._on_log_file_age_changed)
+        log_age_row.add_suffix(log_age_spin)
+        logging_group.add(log_age_row)
+        
+        log_space_row = Adw.ActionRow(
+            title="Log Disk Space",
+            subtitle="MB all log files may use; the oldest are deleted"
+        )
+        log_space_spin = Gtk.SpinButton()
+        log_space_spin.set_adjustment(
+            Gtk.Adjustment(
+                value=self.config.get("logging.max_total_mb", 100),
+                lower=1,
+                upper=10000,
+                step_increment=1
+            )
+        )
+        log_space_spin.set_numeric(True)
+        log_space_spin.connect("value-changed", self._on_log_disk_space_changed)
+        log_space_row.add_suffix(log_space_spin)
+        logging_group.add(log_space_row)
+        
         page.add(logging_group)
         self.add(page)
     
     def _on_font_changed(self, entry):
-        """Handle font change."""
-        self.config.set("terminal.font", entry.get_text())
+        """Handle font change once the entry is activated or left."""
+        font = entry.get_text().strip()
+        if font and font != self.config.get("terminal.font", "Monospace 12"):
+            self.config.set("terminal.font", font)
+    
+    def _on_close_request(self, window, font_entry) -> bool:
+        """Apply a font still being typed when the dialog closes."""
+        self._on_font_changed(font_entry)
+        return False  # Let the dialog close
     
     def _on_scrollback_changed(self, spin):
         """Handle scrollback change."""
@@ -157,6 +321,34 @@ class SettingsDialog(Adw.PreferencesWindow):
         """Handle cursor blink change."""
         self.config.set("terminal.cursor_blink", switch.get_active())
     
+    def _on_shell_integration_changed(self, switch, param):
+        """Handle shell integration change."""
+        self.config.set("terminal.shell_integration", switch.get_active())
+    
+    def _on_warm_pool_size_changed(self, spin):
+        """Handle warm shell pool size change."""
+        self.config.set("terminal.warm_pool_size", int(spin.get_value()))
+    
+    def _on_tab_reuse_policy_changed(self, combo):
+        """Handle tab reuse policy change."""
+        self.config.set("terminal.tab_reuse_policy", combo.get_active_id())
+    
+    def _on_restore_sessions_changed(self, switch, param):
+        """Handle tab restore change (applies after restart)."""
+        self.config.set("terminal.restore_sessions", switch.get_active())
+    
+    def _on_recording_changed(self, switch, param):
+        """Handle session recording change."""
+        self.config.set("recording.enabled", switch.get_active())
+    
+    def _on_throttle_background_changed(self, switch, param):
+        """Handle output throttling change."""
+        self.config.set("terminal.throttle_background", switch.get_active())
+    
+    def _on_memory_budget_changed(self, spin):
+        """Handle scrollback memory budget change."""
+        self.config.set("terminal.memory_budget_mb", int(spin.get_value()))
+    
     def _on_external_terminal_changed(self, entry):
         """Handle external terminal change."""
         text = entry.get_text().strip()
@@ -179,10 +371,18 @@ class SettingsDialog(Adw.PreferencesWindow):
         """Handle show default cards setting change."""
         show_defaults = switch.get_active()
         self.config.set("general.show_default_cards", show_defaults)
-        # Reload commands in main view
-        window = self.get_transient_for()
-        if window and hasattr(window, "main_view"):
-            GLib.idle_add(window.main_view._load_commands)
+    
+    def _on_log_file_size_changed(self, spin):
+        """Handle log file size limit change."""
+        self.config.set("logging.max_file_mb", int(spin.get_value()))
+    
+    def _on_log_file_age_changed(self, spin):
+        """Handle log file age limit change."""
+        self.config.set("logging.max_age_hours", int(spin.get_value()))
+    
+    def _on_log_disk_space_changed(self, spin):
+        """Handle log disk space limit change."""
+        self.config.set("logging.max_total_mb", int(spin.get_value()))
     
     def _on_log_level_changed(self, combo):
         """Handle log level change."""
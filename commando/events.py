@@ -0,0 +1,216 @@
+"""
+Structured event log of command runs.
+
+The executor emits one JSON object per line (NDJSON) to
+<state dir>/events/events.ndjson when a command starts and when it
+finishes. Lines are written on a background thread and the file is rotated
+and compressed like the log files (see commando.log_rotation), so the
+stream can be analyzed with jq or with the helpers below, which read it
+one line at a time:
+
+    python -m commando.events [--since DAYS]
+"""
+
+import gzip
+import json
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from commando.log_rotation import CompressedRotatingFileHandler, rotated_files
+from commando.logger import get_logger
+
+logger = get_logger(__name__)
+
+EVENTS_FILE = "events.ndjson"
+
+# Event types
+COMMAND_STARTED = "command_started"
+COMMAND_FINISHED = "command_finished"
+
+
+class EventLog:
+    """Appends events to the NDJSON file on a background thread."""
+
+    def __init__(self, directory: Path, max_file_bytes: int, max_total_bytes: int):
+        """
+        Initialize the event log; the file is opened on the first event.
+
+        Args:
+            directory: Directory holding the current and rotated event files
+            max_file_bytes: Size at which the current file is compressed and a new one started
+            max_total_bytes: Disk space of all event files
+        """
+        self.directory = directory
+        self.max_file_bytes = max_file_bytes
+        self.max_total_bytes = max_total_bytes
+        self._handler: Optional[CompressedRotatingFileHandler] = None
+        self._failed = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="commando-events")
+
+    def emit(self, event: str, **fields: Any):
+        """
+        Record an event.
+
+        Args:
+            event: Event type, e.g. COMMAND_FINISHED
+            **fields: JSON serializable details
+        """
+        if self._failed:
+            return
+        line = json.dumps({"event": event, "ts": time.time(), **fields}, separators=(",", ":"), default=str)
+        try:
+            self._executor.submit(self._write, line)
+        except RuntimeError:
+            pass  # Closed
+
+    def _write(self, line: str):
+        """Append a line (on the writer thread)."""
+        try:
+            if self._handler is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                # Events have no line timestamp to age by; size and disk cap only
+                self._handler = CompressedRotatingFileHandler(
+                    self.directory / EVENTS_FILE, self.max_file_bytes, math.inf, self.max_total_bytes
+                )
+            self._handler.handle(logging.makeLogRecord({"msg": line, "levelno": logging.INFO}))
+        except Exception as e:
+            logger.error(f"Failed to write event log, disabling it: {e}")
+            self._failed = True
+
+    def close(self):
+        """Write pending events and close the file."""
+        self._executor.shutdown(wait=True)
+        if self._handler is not None:
+            self._handler.close()
+
+
+def event_files(directory: Path) -> list[Path]:
+    """Event files, oldest first: the compressed ones, then the current one."""
+    files = rotated_files(directory / EVENTS_FILE)
+    current = directory / EVENTS_FILE
+    if current.exists():
+        files.append(current)
+    return files
+
+
+def iter_events(directory: Path, since: Optional[float] = None) -> Iterator[dict]:
+    """
+    Read events one at a time, oldest first.
+
+    Args:
+        directory: Event log directory
+        since: Skip events before this time (epoch seconds)
+
+    Yields:
+        Event dicts; unreadable lines are skipped
+    """
+    for path in event_files(directory):
+        opener = gzip.open if path.suffix == ".gz" else open
+        try:
+            with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue  # Cut off by a crash
+                    if not isinstance(event, dict):
+                        continue
+                    if since is not None and event.get("ts", 0) < since:
+                        continue
+                    yield event
+        except (OSError, EOFError) as e:
+            logger.warning(f"Failed to read events from {path}: {e}")
+
+
+@dataclass
+class CommandStats:
+    """Aggregated runs of one command."""
+
+    number: int
+    title: str = ""
+    started: int = 0
+    finished: int = 0  # Runs with a known end
+    failures: int = 0  # Finished with a non-zero status
+    timeouts: int = 0
+    total_duration: float = 0.0
+    max_duration: float = 0.0
+    terminal_output_lines: int = 0  # Of terminal runs only; runs without terminal discard their output
+
+    @property
+    def mean_duration(self) -> Optional[float]:
+        """Average run time of finished runs."""
+        return self.total_duration / self.finished if self.finished else None
+
+    @property
+    def failure_rate(self) -> Optional[float]:
+        """Share of finished runs that failed."""
+        return self.failures / self.finished if self.finished else None
+
+
+def command_stats(events: Iterable[dict]) -> dict[int, CommandStats]:
+    """
+    Aggregate command events, keeping only the totals in memory.
+
+    Args:
+        events: Events, e.g. from iter_events()
+
+    Returns:
+        Command number -> stats
+    """
+    stats: dict[int, CommandStats] = {}
+    for event in events:
+        number = event.get("number")
+        if not isinstance(number, int):
+            continue
+        entry = stats.get(number)
+        if entry is None:
+            entry = stats[number] = CommandStats(number)
+        entry.title = event.get("title") or entry.title
+        kind = event.get("event")
+        if kind == COMMAND_STARTED:
+            entry.started += 1
+        elif kind == COMMAND_FINISHED:
+            duration = event.get("duration")
+            if duration is None:
+                continue  # End unknown
+            entry.finished += 1
+            entry.total_duration += duration
+            entry.max_duration = max(entry.max_duration, duration)
+            if event.get("exit_status") not in (0, None):
+                entry.failures += 1
+            if event.get("timed_out"):
+                entry.timeouts += 1
+            entry.terminal_output_lines += event.get("output_lines") or 0
+    return stats
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Print per-command statistics from the event log."""
+    import argparse
+    from commando.config import Config
+
+    parser = argparse.ArgumentParser(description="Summarize Commando command runs")
+    parser.add_argument("--since", type=float, metavar="DAYS", help="only runs in the last DAYS days")
+    parser.add_argument("--dir", type=Path, help="event log directory")
+    args = parser.parse_args(argv)
+
+    directory = args.dir or Config().get_state_dir() / "events"
+    since = time.time() - args.since * 86400 if args.since else None
+    stats = command_stats(iter_events(directory, since))
+    print(f"{'#':>4}  {'runs':>5}  {'failed':>6}  {'mean s':>8}  {'max s':>8}  {'term lines':>10}  title")
+    for entry in sorted(stats.values(), key=lambda entry: entry.started, reverse=True):
+        mean = f"{entry.mean_duration:.1f}" if entry.mean_duration is not None else "-"
+        print(
+            f"{entry.number:>4}  {entry.started:>5}  {entry.failures:>6}  {mean:>8}  "
+            f"{entry.max_duration:>8.1f}  {entry.terminal_output_lines:>10}  {entry.title}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,15 +2,140 @@
 Command execution handler.
 """
 
+import itertools
+import os
+import resource
+import shutil
+import signal
 import subprocess
 import shlex
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable, Optional
 
 from commando.models.command import Command
 from commando.config import Config
-from commando.logger import get_logger
+from commando.events import COMMAND_FINISHED, COMMAND_STARTED, EventLog
+from commando.external_terminal import AUTO, build_terminal_argv
+from commando.storage.usage_metrics import UsageMetrics
+from commando.terminal.shell_integration import TerminalRun
+from commando.logger import get_lazy_logger, lazy
 
-logger = get_logger(__name__)
+logger = get_lazy_logger(__name__)
+
+# ionice(1) scheduling classes accepted in Command.ionice_class
+IONICE_CLASSES = {
+    "best-effort": 2,
+    "idle": 3,
+}
+
+
+@dataclass
+class Job:
+    """A command run tracked by the executor."""
+    
+    job_id: int
+    command: Command
+    mode: str  # "direct", "internal" or "external"
+    pid: Optional[int] = None
+    started_at: float = 0.0
+    ended_at: Optional[float] = None
+    exit_status: Optional[int] = None
+    timed_out: bool = False
+    callbacks: list[Callable[["Job"], None]] = field(default_factory=list, repr=False)
+    # Kept until exit: a dropped Popen is polled by subprocess, which could reap the
+    # child before GLib's child watch sees its status
+    process: Optional[subprocess.Popen] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def running(self) -> bool:
+        """Whether the job has started and not yet finished."""
+        return self.pid is not None and self.ended_at is None
+    
+    def add_done_callback(self, callback: Callable[["Job"], None]):
+        """Call callback with this job once it has finished."""
+        self.callbacks.append(callback)
+    
+    def _finish(self):
+        """Run completion callbacks."""
+        for callback in self.callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.error("Job completion callback failed: %s", e, exc_info=True)
+
+
+@lru_cache(maxsize=1)
+def systemd_scope_available() -> bool:
+    """
+    Check whether transient systemd user scopes can be created.
+    
+    Requires systemd-run and a running user manager. The result is cached
+    for the lifetime of the process.
+    """
+    if not shutil.which("systemd-run"):
+        return False
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir:
+        return False
+    return (Path(runtime_dir) / "systemd" / "private").exists()
+
+
+def has_resource_limits(command: Command) -> bool:
+    """Check whether a command has any resource limits configured."""
+    return bool(
+        getattr(command, 'cpu_limit', 0)
+        or getattr(command, 'memory_limit', 0)
+        or getattr(command, 'nice', 0)
+        or getattr(command, 'ionice_class', "")
+    )
+
+
+def make_preexec_fn(cpu_limit: int = 0, memory_limit: int = 0, nice: int = 0) -> Optional[Callable[[], None]]:
+    """
+    Build a preexec_fn applying rlimits and niceness in the child process.
+    
+    Args:
+        cpu_limit: CPU time limit in seconds (0 = no limit)
+        memory_limit: Address space limit in MiB (0 = no limit)
+        nice: Niceness increment (0 = unchanged)
+    
+    Returns:
+        Callable for subprocess.Popen(preexec_fn=...), or None if nothing to apply
+    """
+    if not (cpu_limit or memory_limit or nice):
+        return None
+    
+    def preexec():
+        if cpu_limit:
+            # Soft limit delivers SIGXCPU, hard limit one second later SIGKILL
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit, cpu_limit + 1))
+        if memory_limit:
+            limit = memory_limit * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        if nice:
+            os.nice(nice)
+    
+    return preexec
+
+
+def _group_members(pgid: int, proc_root: Path = Path("/proc")) -> list[int]:
+    """Pids of the processes in a process group."""
+    members = []
+    for entry in proc_root.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            # Fields after the command name: state, ppid, pgrp, ...
+            fields = (entry / "stat").read_bytes().rsplit(b")", 1)[1].split()
+        except (OSError, IndexError):
+            continue  # Exited meanwhile
+        if int(fields[2]) == pgid:
+            members.append(int(entry.name))
+    return members
 
 
 class CommandExecutor:
@@ -20,6 +145,40 @@ class CommandExecutor:
         """Initialize executor."""
         self.config = Config()
         self.terminal_view = None
+        self.jobs: dict[int, Job] = {}
+        self._job_ids = itertools.count(1)
+        self._queue: deque[Job] = deque()
+        self.metrics = UsageMetrics(self.config.get_state_dir() / "usage.json")
+        self.events = None
+        if self.config.get("events.enabled", True):
+            self.events = EventLog(
+                self.config.get_state_dir() / "events",
+                max_file_bytes=self.config.get("events.max_file_mb", 5) * 1024 * 1024,
+                max_total_bytes=self.config.get("events.max_total_mb", 50) * 1024 * 1024,
+            )
+    
+    def _emit_started(self, job: Job):
+        """Record the start of a run in the event log."""
+        if self.events is not None:
+            self.events.emit(
+                COMMAND_STARTED, job_id=job.job_id, number=job.command.number, title=job.command.title,
+                mode=job.mode, started_at=job.started_at,
+            )
+    
+    def _emit_finished(self, job: Job, output_lines: Optional[int] = None):
+        """Record the end of a run in the event log."""
+        if self.events is not None:
+            duration = job.ended_at - job.started_at if job.ended_at is not None else None
+            self.events.emit(
+                COMMAND_FINISHED, job_id=job.job_id, number=job.command.number, title=job.command.title,
+                mode=job.mode, started_at=job.started_at, ended_at=job.ended_at, duration=duration,
+                exit_status=job.exit_status, timed_out=job.timed_out, output_lines=output_lines,
+            )
+    
+    def close(self):
+        """Write pending events."""
+        if self.events is not None:
+            self.events.close()
     
     def set_terminal_view(self, terminal_view):
         """Set the terminal view for internal execution."""
@@ -43,6 +202,9 @@ class CommandExecutor:
             self._execute_direct(command)
             return
         
+        if has_resource_limits(command) or getattr(command, 'timeout', 0):
+            logger.debug("Resource limits of command #%s only apply to runs without terminal", command.number)
+        
         # Mode 2: Type command without executing
         if run_mode == 2:
             if self.terminal_view:
@@ -67,10 +229,17 @@ class CommandExecutor:
     
     def _execute_internal(self, command: Command):
         """Execute command in internal terminal."""
-        logger.info(f"Executing command in internal terminal: {command.command}")
+        logger.info("Executing command in internal terminal: %s", command.command)
         if self.terminal_view:
             # Switch to terminal view and execute
-            self.terminal_view.execute_command(command.command)
+            job = Job(job_id=next(self._job_ids), command=command, mode="internal", started_at=time.time())
+            self._emit_started(job)
+            run = self.terminal_view.execute_command(
+                command.command, card_key=command.number, profile=command.profile or None
+            )
+            if isinstance(run, TerminalRun):
+                # Completes only when the shell reports back via shell integration
+                run.add_done_callback(lambda run: self._on_terminal_run_finished(job, run))
             # Focus the terminal after executing command
             # Use GLib.idle_add to ensure focus happens after command is sent
             from gi.repository import GLib
@@ -81,51 +250,264 @@ class CommandExecutor:
     
     def _execute_external(self, command: Command):
         """Execute command in external terminal."""
-        external_terminal = self.config.get("terminal.external_terminal")
-        if not external_terminal:
-            logger.error("External terminal not configured")
-            return
+        # Without a configured terminal, use the first installed one
+        external_terminal = self.config.get("terminal.external_terminal") or AUTO
         
-        # Parse terminal command
-        # Common patterns: gnome-terminal -e "command", xterm -e "command", etc.
         try:
-            # Try to detect terminal type
-            terminal_cmd = self._get_terminal_command(external_terminal, command.command)
+            terminal_argv = self._get_terminal_command(external_terminal, command.command)
             
-            logger.info(f"Executing in external terminal: {terminal_cmd}")
-            subprocess.Popen(terminal_cmd, shell=True)
+            logger.info("Executing in external terminal: %s", lazy(lambda: shlex.join(terminal_argv)))
+            subprocess.Popen(terminal_argv, start_new_session=True)
+            # The terminal reports nothing back, so only the start is known
+            job = Job(job_id=next(self._job_ids), command=command, mode="external", started_at=time.time())
+            self._emit_started(job)
         except Exception as e:
-            logger.error(f"Failed to execute in external terminal: {e}")
+            logger.error("Failed to execute in external terminal: %s", e)
+    
+    def enqueue(self, command: Command) -> Job:
+        """
+        Queue a command for a background run without terminal.
+        
+        At most `executor.max_concurrent_jobs` background jobs run at once;
+        the rest wait in FIFO order.
+        
+        Args:
+            command: Command to run
+        
+        Returns:
+            The queued job (use add_done_callback to observe completion)
+        """
+        job = Job(job_id=next(self._job_ids), command=command, mode="direct")
+        self._queue.append(job)
+        self._drain_queue()
+        return job
+    
+    def _drain_queue(self):
+        """Start queued jobs while background slots are free."""
+        max_jobs = self.config.get("executor.max_concurrent_jobs", 2)
+        while self._queue:
+            running = sum(1 for job in self.jobs.values() if job.mode == "direct")
+            if running >= max_jobs:
+                break
+            job = self._queue.popleft()
+            if self._execute_direct(job.command, job) is None:
+                job.ended_at = time.time()
+                job._finish()
     
-    def _execute_direct(self, command: Command):
+    def _execute_direct(self, command: Command, job: Optional[Job] = None) -> Optional[Job]:
         """Execute command directly without terminal."""
-        logger.info(f"Executing command directly (no terminal): {command.command}")
+        logger.info("Executing command directly (no terminal): %s", command.command)
+        if job is None:
+            job = Job(job_id=next(self._job_ids), command=command, mode="direct")
+        use_scope = bool(getattr(command, 'memory_limit', 0)) and self._use_systemd_scope()
         try:
-            # Use shell=True to allow shell features, but run in background
+            # Run through /bin/sh to allow shell features, but in background
             # This runs the command directly without opening a terminal
-            subprocess.Popen(
-                command.command,
-                shell=True,
+            process = subprocess.Popen(
+                self._build_direct_argv(command, use_scope),
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
-                start_new_session=True  # Detach from parent process
+                start_new_session=True,  # Own process group, detached from parent
+                preexec_fn=make_preexec_fn(
+                    cpu_limit=getattr(command, 'cpu_limit', 0),
+                    # Memory is capped by the scope's cgroup instead when available
+                    memory_limit=0 if use_scope else getattr(command, 'memory_limit', 0),
+                    nice=getattr(command, 'nice', 0),
+                ),
             )
-            logger.debug(f"Command started in background: {command.command}")
+            logger.debug("Command started in background: %s", command.command)
         except Exception as e:
-            logger.error(f"Failed to execute command directly: {e}")
-    
-    def _get_terminal_command(self, terminal: str, command: str) -> str:
-        """Get the command to launch terminal with command."""
-        # Common terminal patterns
-        if "gnome-terminal" in terminal:
-            return f'gnome-terminal -- bash -c "{command}; exec bash"'
-        elif "xterm" in terminal:
-            return f'xterm -e bash -c "{command}; exec bash"'
-        elif "konsole" in terminal:
-            return f'konsole -e bash -c "{command}; exec bash"'
-        elif "alacritty" in terminal:
-            return f'alacritty -e bash -c "{command}; exec bash"'
+            logger.error("Failed to execute command directly: %s", e)
+            return None
+        
+        job.pid = process.pid
+        job.process = process
+        job.started_at = time.time()
+        self.jobs[job.job_id] = job
+        self._emit_started(job)
+        self._watch_job(job)
+        return job
+    
+    def _use_systemd_scope(self) -> bool:
+        """Whether limits should be enforced through a systemd user scope."""
+        if not self.config.get("executor.use_systemd_run", True):
+            return False
+        return systemd_scope_available()
+    
+    def _build_direct_argv(self, command: Command, use_scope: bool = False) -> list[str]:
+        """
+        Build the argv for a direct run, wrapped for I/O priority and cgroup limits.
+        
+        Args:
+            command: Command to run
+            use_scope: Whether to run inside a transient systemd scope
+        
+        Returns:
+            Argument vector for subprocess.Popen
+        """
+        argv = ["/bin/sh", "-c", command.command]
+        
+        ionice_class = IONICE_CLASSES.get(getattr(command, 'ionice_class', ""))
+        if ionice_class is not None:
+            if shutil.which("ionice"):
+                argv = ["ionice", "-c", str(ionice_class)] + argv
+            else:
+                logger.warning("ionice not found, ignoring I/O class for command #%s", command.number)
+        
+        if use_scope:
+            argv = [
+                "systemd-run", "--user", "--scope", "--quiet", "--collect",
+                "-p", f"MemoryMax={command.memory_limit}M",
+                "-p", "MemorySwapMax=0",
+            ] + argv
+        
+        return argv
+    
+    def _watch_job(self, job: Job):
+        """Reap the job when it exits and arm its wall-clock timeout."""
+        from gi.repository import GLib
+        GLib.child_watch_add(GLib.PRIORITY_DEFAULT, job.pid, self._on_job_exited, job.job_id)
+        
+        timeout = getattr(job.command, 'timeout', 0)
+        if timeout:
+            GLib.timeout_add_seconds(timeout, self._on_job_timeout, job.job_id)
+    
+    def _on_job_exited(self, pid: int, status: int, job_id: int):
+        """Handle child exit reported by GLib."""
+        job = self.jobs.pop(job_id, None)
+        if job is None:
+            return
+        job.ended_at = time.time()
+        try:
+            job.exit_status = os.waitstatus_to_exitcode(status)
+        except ValueError:
+            job.exit_status = status
+        if job.process is not None:
+            # Reaped by GLib; keep subprocess from waiting for it again
+            job.process.returncode = job.exit_status
+            job.process = None
+        duration = job.ended_at - job.started_at
+        logger.info(
+            "Command #%s (pid %s) exited with status %s after %.1fs%s",
+            job.command.number, pid, job.exit_status, duration, " (timed out)" if job.timed_out else "",
+        )
+        self.metrics.record(job.command.number, job.started_at, job.ended_at, job.exit_status)
+        # Output of runs without terminal goes to /dev/null and is not measured
+        self._emit_finished(job)
+        job._finish()
+        self._drain_queue()
+    
+    def _on_terminal_run_finished(self, job: Job, run: TerminalRun):
+        """Complete an internal terminal job from its shell integration run."""
+        job.started_at = run.started_at or run.submitted_at
+        job.ended_at = run.ended_at
+        job.exit_status = run.exit_status
+        if run.exit_status is None:
+            logger.debug("Command #%s ended without reporting a status", job.command.number)
         else:
-            # Generic fallback
-            return f'{terminal} -e bash -c "{command}; exec bash"'
-
+            logger.info(
+                "Command #%s finished in terminal with status %s after %.1fs",
+                job.command.number, run.exit_status, run.duration,
+            )
+        self.metrics.record(job.command.number, job.started_at, job.ended_at, job.exit_status)
+        self._emit_finished(job, output_lines=run.output_rows)
+        job._finish()
+    
+    def _on_job_timeout(self, job_id: int) -> bool:
+        """Terminate a job that exceeded its wall-clock timeout."""
+        job = self.jobs.get(job_id)
+        if job is not None and job.running:
+            logger.warning(
+                "Command #%s exceeded timeout of %ss, terminating", job.command.number, job.command.timeout
+            )
+            job.timed_out = True
+            self.terminate_job(job_id)
+        return False  # Don't repeat
+    
+    def terminate_job(self, job_id: int) -> bool:
+        """
+        Terminate a running job's process group.
+        
+        Sends SIGTERM first and escalates to SIGKILL if the group is still
+        alive after the configured grace period.
+        
+        Args:
+            job_id: ID of the job to terminate
+        
+        Returns:
+            True if the job was signalled
+        """
+        job = self.jobs.get(job_id)
+        if job is None or not job.running:
+            return False
+        
+        # start_new_session makes the child a process group leader
+        if not self._signal_job(job, signal.SIGTERM):
+            return False
+        
+        from gi.repository import GLib
+        grace = self.config.get("executor.kill_grace_seconds", 5)
+        # By process group, not job: the leader may exit while other members ignore SIGTERM
+        GLib.timeout_add_seconds(grace, self._kill_group, job.pid, job.command.number)
+        return True
+    
+    def _kill_group(self, pgid: int, number: int) -> bool:
+        """
+        Force kill what is left of a job's process group after the grace period.
+        
+        The group id is the leader's pid. Until the leader is reaped no other
+        group can have that id, so the whole group is killed at once. Once it
+        is reaped the id may have been reused, so only processes still in the
+        group are killed, one by one through pidfds.
+        """
+        try:
+            # Does not reap: the child watch still gets the exit status
+            os.waitid(os.P_PID, pgid, os.WEXITED | os.WNOHANG | os.WNOWAIT)
+        except ChildProcessError:
+            self._kill_members(pgid, number)
+            return False  # Don't repeat
+        try:
+            os.killpg(pgid, signal.SIGKILL)
+            logger.warning("Command #%s ignored SIGTERM, sent SIGKILL to process group %s", number, pgid)
+        except ProcessLookupError:
+            pass  # Whole group exited
+        except Exception as e:
+            logger.warning("Error killing process group %s: %s", pgid, e)
+        return False  # Don't repeat
+    
+    def _kill_members(self, pgid: int, number: int):
+        """Force kill the processes left in a reaped leader's process group."""
+        members = _group_members(pgid)
+        if pgid in members:
+            # The leader is gone, so this is a new process: the group id was reused
+            return
+        for pid in members:
+            try:
+                pidfd = os.pidfd_open(pid)
+            except OSError:
+                continue  # Exited meanwhile
+            try:
+                # The pidfd refers to the process checked here, even if pid is reused later
+                if os.getpgid(pid) == pgid:
+                    signal.pidfd_send_signal(pidfd, signal.SIGKILL)
+                    logger.warning("Command #%s ignored SIGTERM, sent SIGKILL to process %s", number, pid)
+            except OSError:
+                pass  # Exited meanwhile
+            finally:
+                os.close(pidfd)
+    
+    def _signal_job(self, job: Job, sig: int) -> bool:
+        """Send a signal to a job's process group."""
+        try:
+            os.killpg(job.pid, sig)
+            logger.debug("Sent %s to process group %s", lazy(lambda: signal.Signals(sig).name), job.pid)
+            return True
+        except ProcessLookupError:
+            logger.debug("Process group %s already terminated", job.pid)
+        except Exception as e:
+            logger.warning("Error signalling process group %s: %s", job.pid, e)
+        return False
+    
+    def _get_terminal_command(self, terminal: str, command: str) -> list[str]:
+        """Get the argv to launch terminal with command."""
+        return build_terminal_argv(terminal, command)
@@ -0,0 +1,125 @@
+"""
+External terminal emulator registry.
+
+Builds argument vectors for launching a command in an external terminal
+emulator, so no intermediate /bin/sh is needed and commands containing
+quotes are passed through unchanged.
+"""
+
+import os
+import shlex
+import shutil
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from commando.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class ExternalTerminal:
+    """How to pass a command to a terminal emulator."""
+
+    name: str
+    exec_args: tuple[str, ...]  # Arguments placed before the command argv
+
+
+# Registry of known terminal emulators, in auto-detection preference order
+EXTERNAL_TERMINALS: dict[str, ExternalTerminal] = {
+    terminal.name: terminal for terminal in (
+        ExternalTerminal("gnome-terminal", ("--",)),
+        ExternalTerminal("konsole", ("-e",)),
+        ExternalTerminal("kitty", ()),
+        ExternalTerminal("alacritty", ("-e",)),
+        ExternalTerminal("foot", ()),
+        ExternalTerminal("wezterm", ("start", "--")),
+        ExternalTerminal("xterm", ("-e",)),
+    )
+}
+
+# Used for terminals not in the registry (xterm-compatible "-e")
+GENERIC_TERMINAL = ExternalTerminal("generic", ("-e",))
+
+# Setting value that selects the first installed terminal
+AUTO = "auto"
+
+
+def register_terminal(terminal: ExternalTerminal):
+    """Add or replace a terminal emulator in the registry."""
+    EXTERNAL_TERMINALS[terminal.name] = terminal
+    resolve_terminal.cache_clear()
+    detect_terminal.cache_clear()
+
+
+@lru_cache(maxsize=8)
+def resolve_terminal(setting: str) -> tuple[tuple[str, ...], ExternalTerminal]:
+    """
+    Resolve a configured terminal to its base argv and registry entry.
+
+    The setting may include options, e.g. "kitty --single-instance".
+    Results are cached per setting.
+
+    Args:
+        setting: Configured terminal command
+
+    Returns:
+        Tuple of (base argv, ExternalTerminal)
+    """
+    if setting == AUTO:
+        detected = detect_terminal()
+        if detected is None:
+            raise ValueError("No supported terminal emulator found")
+        setting = detected
+
+    base = tuple(shlex.split(setting))
+    if not base:
+        raise ValueError("Empty terminal command")
+
+    name = os.path.basename(base[0])
+    terminal = EXTERNAL_TERMINALS.get(name, GENERIC_TERMINAL)
+    if shutil.which(base[0]) is None:
+        logger.warning(f"Terminal '{base[0]}' not found in PATH")
+    logger.debug(f"Resolved external terminal '{setting}' as {terminal.name}")
+    return base, terminal
+
+
+@lru_cache(maxsize=1)
+def detect_terminal() -> Optional[str]:
+    """
+    Find an installed terminal emulator.
+
+    Honours $TERMINAL, then tries the registry in order. The result is
+    cached for the lifetime of the process.
+
+    Returns:
+        Terminal executable name, or None if none is installed
+    """
+    preferred = os.environ.get("TERMINAL")
+    if preferred and shutil.which(shlex.split(preferred)[0]):
+        return preferred
+    for name in EXTERNAL_TERMINALS:
+        if shutil.which(name):
+            return name
+    return None
+
+
+def build_terminal_argv(setting: str, command: str, shell: str = "bash") -> list[str]:
+    """
+    Build the argv that opens a terminal running command.
+
+    The command runs in shell, which then stays open for interaction.
+
+    Args:
+        setting: Configured terminal command (or "auto")
+        command: Shell command line to run
+        shell: Shell used to interpret the command
+
+    Returns:
+        Argument vector for subprocess.Popen (no shell needed)
+    """
+    base, terminal = resolve_terminal(setting)
+    # A newline, not ";", so a trailing "&" or "# comment" in command cannot break the exec
+    script = f"{command}\nexec {shlex.quote(shell)}"
+    return [*base, *terminal.exec_args, shell, "-c", script]
@@ -0,0 +1,120 @@
+"""
+Size and age limited log files.
+
+commando.log is started anew when it reaches logging.max_file_mb or is
+older than logging.max_age_hours. The finished file is compressed to
+commando.log.<start time>.gz, and the oldest compressed files are deleted
+once all log files together exceed logging.max_total_mb. Rotation runs on
+the log writer thread, so it never delays the main loop.
+"""
+
+import gzip
+import os
+import shutil
+import time
+from logging.handlers import BaseRotatingHandler
+from pathlib import Path
+
+# Format of the start time in the names of rotated files (sorts chronologically)
+ROTATED_TIME_FORMAT = "%Y%m%d-%H%M%S"
+# Start of each line written by the file formatter ("%(asctime)s")
+LINE_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def rotated_files(base: Path) -> list[Path]:
+    """Compressed files rotated from base, oldest first."""
+    def order(path: Path):
+        # <base>.<start time>[.<n>].gz, n telling apart files started in the same second
+        stamp, _, count = path.name[len(base.name) + 1:-len(".gz")].partition(".")
+        return stamp, int(count) if count.isdigit() else 0
+    return sorted(base.parent.glob(base.name + ".*.gz"), key=order)
+
+
+class CompressedRotatingFileHandler(BaseRotatingHandler):
+    """File handler rotating by size and age into gzip files, within a total disk cap."""
+
+    def __init__(self, filename: Path, max_bytes: int, max_age_seconds: float, max_total_bytes: int):
+        """
+        Initialize the handler.
+
+        Args:
+            filename: Current log file
+            max_bytes: Size at which the file is rotated
+            max_age_seconds: Age (since its first line) at which the file is rotated
+            max_total_bytes: Disk space of all log files, current one included
+        """
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.max_total_bytes = max_total_bytes
+        super().__init__(str(filename), "a", encoding="utf-8")
+        self._started = self._read_start_time()
+        self.prune()
+
+    def _read_start_time(self) -> float:
+        """Time of the first line of the current file (now if it is empty)."""
+        try:
+            with open(self.baseFilename, "r", encoding="utf-8", errors="replace") as f:
+                first_line = f.readline()
+        except OSError:
+            return time.time()
+        if not first_line:
+            return time.time()
+        try:
+            return time.mktime(time.strptime(first_line[:19], LINE_TIME_FORMAT))
+        except ValueError:
+            return os.path.getmtime(self.baseFilename)
+
+    def shouldRollover(self, record) -> bool:
+        """Whether the file is full or too old."""
+        if self.stream is None:
+            self.stream = self._open()
+        if self.stream.tell() == 0:
+            return False  # Never rotate an empty file
+        if time.time() - self._started >= self.max_age_seconds:
+            return True
+        return self.stream.tell() + len(self.format(record)) + 1 > self.max_bytes
+
+    def doRollover(self):
+        """Compress the current file and start a new one."""
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        stamp = time.strftime(ROTATED_TIME_FORMAT, time.localtime(self._started))
+        target = Path(f"{self.baseFilename}.{stamp}.gz")
+        suffix = 1
+        while target.exists():
+            target = Path(f"{self.baseFilename}.{stamp}.{suffix}.gz")
+            suffix += 1
+        if os.path.exists(self.baseFilename):
+            tmp = target.with_name(target.name + ".tmp")
+            with open(self.baseFilename, "rb") as src, gzip.open(tmp, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(tmp, target)
+            os.remove(self.baseFilename)
+        self.stream = self._open()
+        self._started = time.time()
+        self.prune()
+
+    def rotated_files(self) -> list[Path]:
+        """Compressed log files, oldest first."""
+        return rotated_files(Path(self.baseFilename))
+
+    def prune(self):
+        """Delete the oldest compressed files beyond the disk cap."""
+        rotated = []
+        for path in self.rotated_files():
+            try:
+                rotated.append((path, path.stat().st_size))
+            except OSError:
+                continue
+        # Leave room for the current file to grow to its full size
+        total = max(self.max_bytes, self.stream.tell() if self.stream else 0)
+        total += sum(size for _path, size in rotated)
+        for path, size in rotated:
+            if total <= self.max_total_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
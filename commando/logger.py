@@ -2,12 +2,20 @@
 Logging configuration and utilities.
 """
 
+import atexit
+import itertools
 import logging
+import queue
 import sys
+import weakref
+from collections import deque
 from enum import Enum
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable
 from pathlib import Path
 
 from commando.config import Config
+from commando.log_rotation import CompressedRotatingFileHandler
 
 
 class LogLevel(Enum):
@@ -20,6 +28,107 @@ class LogLevel(Enum):
 
 
 _loggers = {}
+_lazy_loggers: "weakref.WeakValueDictionary[str, LazyLogger]" = weakref.WeakValueDictionary()
+
+# Records waiting for the writer thread; further records are dropped rather than blocking
+LOG_QUEUE_SIZE = 10000
+
+_console_handler = None
+_file_handler = None
+_config_subscription = None
+_queue_handler = None
+_listener = None
+_ring_buffer = None
+
+# Recent log lines kept in memory for the log panel
+LOG_BUFFER_SIZE = 10000
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Hands records to the log writer thread without ever blocking.
+    
+    When the writer falls behind and the queue is full, records are counted
+    and dropped; the count is logged as soon as the queue has room again.
+    """
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0  # Total records dropped
+        self._unreported = 0  # Dropped records not logged yet
+    
+    def enqueue(self, record: logging.LogRecord):
+        """Queue a record, dropping it if the queue is full."""
+        # Called with the handler lock held, so the counters need no lock of their own
+        try:
+            if self._unreported:
+                notice = logging.LogRecord(
+                    __name__, logging.WARNING, __file__, 0,
+                    f"Log queue full, dropped {self._unreported} messages", None, None,
+                )
+                self.queue.put_nowait(notice)
+                self._unreported = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self._unreported += 1
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Keeps the most recent formatted log lines in memory.
+    
+    Runs on the log writer thread like the other handlers; readers on the
+    main thread fetch only the lines added since their last read.
+    """
+    
+    def __init__(self, capacity: int = LOG_BUFFER_SIZE):
+        super().__init__()
+        self.capacity = capacity
+        self._lines: deque[tuple[int, int, str]] = deque(maxlen=capacity)  # (sequence number, level, line)
+        self._sequence = itertools.count(1)
+    
+    def emit(self, record: logging.LogRecord):
+        """Store a record."""
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        # Called with the handler lock held
+        self._lines.append((next(self._sequence), record.levelno, line))
+    
+    def lines_since(self, sequence: int = 0) -> list[tuple[int, int, str]]:
+        """
+        Get the lines added after a sequence number, oldest first.
+        
+        Args:
+            sequence: Sequence number of the last line already read (0 for all lines)
+        
+        Returns:
+            List of (sequence number, level, line)
+        """
+        with self.lock:
+            newer = []
+            for entry in reversed(self._lines):
+                if entry[0] <= sequence:
+                    break
+                newer.append(entry)
+        newer.reverse()
+        return newer
+
+
+def get_log_buffer():
+    """The in-memory RingBufferHandler, or None before setup_logging()."""
+    return _ring_buffer
+
+
+def _stop_listener():
+    """Write out queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 
 def setup_logging(level: LogLevel = None):
@@ -29,6 +138,7 @@ def setup_logging(level: LogLevel = None):
     Args:
         level: Logging level. If None, reads from config.
     """
+    global _console_handler, _file_handler, _queue_handler, _listener, _config_subscription, _ring_buffer
     config = Config()
     if level is None:
         level_name = config.get("logging.level", "INFO")
@@ -42,6 +152,10 @@ def setup_logging(level: LogLevel = None):
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(level.value)
+    _clear_level_caches()
+    if _queue_handler is not None:
+        root_logger.removeHandler(_queue_handler)
+    _stop_listener()
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -50,21 +164,62 @@ def setup_logging(level: LogLevel = None):
         "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
     console_handler.setFormatter(console_format)
-    root_logger.addHandler(console_handler)
     
-    # File handler
+    # File handler, rotated and compressed within the configured limits
     log_file = log_dir / "commando.log"
-    file_handler = logging.FileHandler(log_file)
+    file_handler = CompressedRotatingFileHandler(
+        log_file,
+        max_bytes=config.get("logging.max_file_mb", 10) * 1024 * 1024,
+        max_age_seconds=config.get("logging.max_age_hours", 24) * 3600,
+        max_total_bytes=config.get("logging.max_total_mb", 100) * 1024 * 1024,
+    )
     file_handler.setLevel(logging.DEBUG)  # Always log everything to file
     file_format = logging.Formatter(
         "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s"
     )
     file_handler.setFormatter(file_format)
-    root_logger.addHandler(file_handler)
+    
+    # Recent lines for the log panel, kept across re-setup
+    if _ring_buffer is None:
+        _ring_buffer = RingBufferHandler()
+        _ring_buffer.setFormatter(logging.Formatter("%(asctime)s %(levelname)-8s %(name)s: %(message)s"))
+    
+    # Handlers run on a writer thread so logging never blocks the main loop
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    _queue_handler = DroppingQueueHandler(log_queue)
+    _listener = QueueListener(log_queue, console_handler, file_handler, _ring_buffer, respect_handler_level=True)
+    _listener.start()
+    _console_handler = console_handler
+    _file_handler = file_handler
+    root_logger.addHandler(_queue_handler)
+    if _config_subscription is None:
+        _config_subscription = config.subscribe("logging", _on_config_changed)
     
     logging.info(f"Logging initialized at level {level.name}")
 
 
+def _on_config_changed(changes: dict):
+    """Apply changed log file limits."""
+    handler = _file_handler
+    if handler is None or not {"logging.max_file_mb", "logging.max_age_hours", "logging.max_total_mb"} & changes.keys():
+        return
+    config = Config()
+    # Plain attributes, picked up by the writer thread with the next record
+    handler.max_bytes = config.get("logging.max_file_mb", 10) * 1024 * 1024
+    handler.max_age_seconds = config.get("logging.max_age_hours", 24) * 3600
+    handler.max_total_bytes = config.get("logging.max_total_mb", 100) * 1024 * 1024
+    logging.info("Log file limits changed")
+
+
+def dropped_log_records() -> int:
+    """Number of log records dropped because the writer thread fell behind."""
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+# Runs before logging's own shutdown (registered earlier), so queued records are written
+atexit.register(_stop_listener)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance.
@@ -80,6 +235,116 @@ def get_logger(name: str) -> logging.Logger:
     return _loggers[name]
 
 
+class lazy:
+    """
+    Log argument computed only if the message is emitted.
+    
+    Example:
+        logger.debug("Available cards: %s", lazy(lambda: sorted(self.cards)))
+    """
+    
+    __slots__ = ("function",)
+    
+    def __init__(self, function: Callable[[], Any]):
+        self.function = function
+    
+    def __str__(self) -> str:
+        return str(self.function())
+    
+    def __repr__(self) -> str:
+        return repr(self.function())
+
+
+class LazyLogger:
+    """
+    Logger facade that does no work for messages below the level.
+    
+    Takes %-style messages and arguments like logging.Logger, so formatting
+    only happens for emitted messages; the message may also be a callable
+    returning it. Whether a level is enabled is cached per facade and reset
+    by setup_logging() and set_log_level().
+    """
+    
+    __slots__ = ("logger", "_enabled", "__weakref__")
+    
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self._enabled: dict[int, bool] = {}
+    
+    @property
+    def name(self) -> str:
+        return self.logger.name
+    
+    def isEnabledFor(self, level: int) -> bool:
+        """Whether messages of a level are emitted."""
+        try:
+            return self._enabled[level]
+        except KeyError:
+            enabled = self._enabled[level] = self.logger.isEnabledFor(level)
+            return enabled
+    
+    def clear_cache(self):
+        """Forget which levels are enabled, after a level change."""
+        self._enabled.clear()
+    
+    def _log(self, level: int, msg, args, kwargs):
+        if callable(msg):
+            msg = msg()
+        # Report the caller of debug() etc., not this facade, as the record's origin
+        kwargs["stacklevel"] = kwargs.get("stacklevel", 1) + 2
+        self.logger.log(level, msg, *args, **kwargs)
+    
+    def debug(self, msg, *args, **kwargs):
+        if self.isEnabledFor(logging.DEBUG):
+            self._log(logging.DEBUG, msg, args, kwargs)
+    
+    def info(self, msg, *args, **kwargs):
+        if self.isEnabledFor(logging.INFO):
+            self._log(logging.INFO, msg, args, kwargs)
+    
+    def warning(self, msg, *args, **kwargs):
+        if self.isEnabledFor(logging.WARNING):
+            self._log(logging.WARNING, msg, args, kwargs)
+    
+    def error(self, msg, *args, **kwargs):
+        if self.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, msg, args, kwargs)
+    
+    def exception(self, msg, *args, exc_info=True, **kwargs):
+        if self.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, msg, args, dict(kwargs, exc_info=exc_info))
+    
+    def critical(self, msg, *args, **kwargs):
+        if self.isEnabledFor(logging.CRITICAL):
+            self._log(logging.CRITICAL, msg, args, kwargs)
+    
+    def log(self, level: int, msg, *args, **kwargs):
+        if self.isEnabledFor(level):
+            self._log(level, msg, args, kwargs)
+
+
+def get_lazy_logger(name: str) -> LazyLogger:
+    """
+    Get a logger facade for hot paths (see LazyLogger).
+    
+    Args:
+        name: Logger name (typically __name__)
+    
+    Returns:
+        LazyLogger wrapping the standard logger of that name
+    """
+    facade = _lazy_loggers.get(name)
+    if facade is None:
+        facade = _lazy_loggers[name] = LazyLogger(get_logger(name))
+    return facade
+
+
+def _clear_level_caches():
+    """Reset the cached enabled levels of all facades."""
+    for facade in list(_lazy_loggers.values()):
+        facade.clear_cache()
+
+
 def set_log_level(level: LogLevel):
     """
     Change the logging level at runtime.
@@ -89,8 +354,8 @@ def set_log_level(level: LogLevel):
     """
     root_logger = logging.getLogger()
     root_logger.setLevel(level.value)
-    for handler in root_logger.handlers:
-        if isinstance(handler, logging.StreamHandler) and handler.stream == sys.stdout:
-            handler.setLevel(level.value)
+    if _console_handler is not None:
+        _console_handler.setLevel(level.value)
+    _clear_level_caches()
     logging.info(f"Log level changed to {level.name}")
 
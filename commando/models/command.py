@@ -1,17 +1,27 @@
 """
 Command model representing a saved command card.
+
+Commands are slotted (no per-instance __dict__) and share one string object
+per distinct value of the fields that repeat across cards (icon, color,
+tag, ...), so large libraries cost little more than their titles and
+command lines. See commando.models.command_table for a column-wise store
+and commando.models.memory_benchmark for measurements.
 """
 
 from dataclasses import dataclass, asdict
 from typing import Optional
 import json
+import sys
 
 from commando.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Fields with few distinct values across cards; their strings are interned
+INTERNED_FIELDS = ("icon", "color", "tag", "category", "ionice_class", "profile")
+
 
-@dataclass
+@dataclass(slots=True)
 class Command:
     """Represents a command card."""
     
@@ -25,6 +35,30 @@ class Command:
     description: str = ""
     no_terminal: bool = False  # If True, run command directly without terminal
     run_mode: int = 1  # 1 = execute command, 2 = type command in terminal without executing
+    timeout: int = 0  # Wall-clock timeout in seconds for direct runs (0 = no limit)
+    cpu_limit: int = 0  # CPU time limit in seconds for direct runs (0 = no limit)
+    memory_limit: int = 0  # Address space limit in MiB for direct runs (0 = no limit)
+    nice: int = 0  # Niceness increment for direct runs (0-19)
+    ionice_class: str = ""  # I/O scheduling class for direct runs ("", "best-effort", "idle")
+    schedule: str = ""  # Cron expression or "@every <duration>" for periodic background runs
+    profile: str = ""  # Terminal profile for internal terminal runs ("" = default profile)
+    
+    def __post_init__(self):
+        """Share the strings of low-cardinality fields between commands."""
+        self.intern_fields()
+    
+    def intern_fields(self):
+        """
+        Intern the low-cardinality fields again after they were assigned.
+        
+        Done on creation; cards edited in place are interned when saved
+        (CommandStorage.update), which keeps creation free of a per-field
+        __setattr__ hook.
+        """
+        for name in INTERNED_FIELDS:
+            value = getattr(self, name)
+            if type(value) is str:
+                setattr(self, name, sys.intern(value))
     
     def to_dict(self) -> dict:
         """Convert to dictionary."""
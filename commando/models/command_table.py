@@ -0,0 +1,110 @@
+"""
+Column-wise store for large command libraries.
+
+CommandTable keeps each Command field in its own column instead of one
+object per command: numbers and flags in typed arrays, low-cardinality
+strings (INTERNED_FIELDS) as array indexes into a list of distinct
+values, and the remaining strings in plain lists. Commands are created on
+access, so the table suits bulk libraries that are scanned or filtered by
+column far more often than edited.
+"""
+
+from array import array
+from dataclasses import fields
+from typing import Iterable, Iterator
+
+from commando.models.command import Command, INTERNED_FIELDS
+
+# array type codes of the non-string field types
+_TYPE_CODES = {int: "q", bool: "b"}
+
+
+class CommandTable:
+    """Commands stored column by column."""
+
+    def __init__(self, commands: Iterable[Command] = ()):
+        """
+        Initialize the table.
+
+        Args:
+            commands: Commands to add
+        """
+        self._names = tuple(field.name for field in fields(Command))
+        self._bools = {field.name for field in fields(Command) if field.type is bool}  # Stored as 0/1
+        self._columns: dict[str, object] = {}
+        self._distinct: dict[str, list[str]] = {}  # Field -> distinct values, indexed by code
+        self._codes: dict[str, dict[str, int]] = {}  # Field -> value -> code
+        for field in fields(Command):
+            if field.name in INTERNED_FIELDS:
+                self._columns[field.name] = array("I")
+                self._distinct[field.name] = []
+                self._codes[field.name] = {}
+            elif field.type in _TYPE_CODES:
+                self._columns[field.name] = array(_TYPE_CODES[field.type])
+            else:
+                self._columns[field.name] = []
+        self.extend(commands)
+
+    def append(self, command: Command):
+        """
+        Add a command.
+
+        Raises:
+            TypeError: If a numeric field holds a non-number
+        """
+        for name in self._names:
+            value = getattr(command, name)
+            codes = self._codes.get(name)
+            if codes is not None:
+                code = codes.get(value)
+                if code is None:
+                    code = codes[value] = len(self._distinct[name])
+                    self._distinct[name].append(value)
+                value = code
+            self._columns[name].append(value)
+
+    def extend(self, commands: Iterable[Command]):
+        """Add several commands."""
+        for command in commands:
+            self.append(command)
+
+    def __len__(self) -> int:
+        return len(self._columns["number"])
+
+    def __getitem__(self, index: int) -> Command:
+        """Create the command at a position."""
+        values = {}
+        for name in self._names:
+            value = self._columns[name][index]
+            distinct = self._distinct.get(name)
+            if distinct is not None:
+                value = distinct[value]
+            elif name in self._bools:
+                value = bool(value)
+            values[name] = value
+        return Command(**values)
+
+    def __iter__(self) -> Iterator[Command]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def column(self, name: str) -> list:
+        """
+        Get the values of one field for all commands, without creating commands.
+
+        Args:
+            name: Field name, e.g. "category"
+
+        Returns:
+            Values in table order
+        """
+        distinct = self._distinct.get(name)
+        if distinct is not None:
+            return [distinct[code] for code in self._columns[name]]
+        if name in self._bools:
+            return [bool(value) for value in self._columns[name]]
+        return list(self._columns[name])
+
+    def distinct(self, name: str) -> list[str]:
+        """Distinct values of a low-cardinality field, in order of first use."""
+        return list(self._distinct[name])
@@ -0,0 +1,105 @@
+"""
+Memory used per command by the command representations.
+
+Generates a library of cards with realistic repetition (a few dozen icons,
+colors, tags and categories; unique titles and command lines), loads it
+from JSON the way CommandStorage does, and reports the bytes held per
+command once the parsed JSON is released:
+
+    python -m commando.models.memory_benchmark [--count 100000]
+
+"dict" is Command as a plain dataclass with an instance __dict__ and
+unshared strings, "slots" is the slotted, interned Command, and "table" is
+CommandTable.
+"""
+
+import gc
+import json
+import tracemalloc
+from dataclasses import fields, make_dataclass
+from typing import Callable, Optional
+
+from commando.models.command import Command
+from commando.models.command_table import CommandTable
+
+DEFAULT_COUNT = 100_000
+
+# Command as it was before slots and interning
+DictCommand = make_dataclass("DictCommand", [(field.name, field.type, field) for field in fields(Command)])
+
+_ICONS = ("terminal-symbolic", "system-run-symbolic", "network-wired-symbolic", "drive-harddisk-symbolic",
+          "utilities-system-monitor-symbolic", "folder-symbolic", "software-update-available-symbolic")
+_COLORS = ("blue", "green", "yellow", "orange", "red", "purple", "brown", "gray")
+
+
+def library_json(count: int) -> str:
+    """JSON of a generated command library, as stored in commands.json."""
+    return json.dumps([
+        {
+            "number": number,
+            "title": f"Command {number}",
+            "command": f"systemctl status service-{number}.service",
+            "icon": _ICONS[number % len(_ICONS)],
+            "color": _COLORS[number % len(_COLORS)],
+            "tag": f"tag-{number % 40}",
+            "category": f"Category {number % 15}",
+            "description": f"Show the status of service {number}" if number % 3 == 0 else "",
+            "schedule": "@every 1h" if number % 50 == 0 else "",
+        }
+        for number in range(1, count + 1)
+    ])
+
+
+def measure(text: str, build: Callable[[list[dict]], object]) -> int:
+    """Bytes still allocated by what build() creates from the parsed JSON, once the JSON is released."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        data = json.loads(text)
+        result = build(data)
+        del data
+        gc.collect()
+        size, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def run(count: int = DEFAULT_COUNT) -> dict[str, float]:
+    """
+    Measure the representations.
+
+    Args:
+        count: Number of commands
+
+    Returns:
+        Representation name -> bytes per command
+    """
+    text = library_json(count)
+    builds = {
+        "dict": lambda data: [DictCommand(**item) for item in data],
+        "slots": lambda data: [Command.from_dict(item) for item in data],
+        "table": lambda data: CommandTable(Command.from_dict(item) for item in data),
+    }
+    return {name: measure(text, build) / count for name, build in builds.items()}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Print the memory used per command."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure memory used per command")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT, help="number of commands")
+    args = parser.parse_args(argv)
+
+    results = run(args.count)
+    baseline = results["dict"]
+    print(f"{args.count} commands")
+    for name, per_command in results.items():
+        print(f"{name:>6}  {per_command:8.0f} bytes/command  {per_command / baseline:6.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
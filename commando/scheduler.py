@@ -0,0 +1,397 @@
+"""
+Scheduled and periodic command execution.
+"""
+
+import heapq
+import itertools
+import json
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional
+
+from commando.models.command import Command
+from commando.config import Config
+from commando.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Longest time the timer sleeps before re-checking the wall clock.
+# GLib timeouts use the monotonic clock, which stops while the machine is
+# suspended, so a long sleep would otherwise oversleep after resume.
+MAX_SLEEP_SECONDS = 60
+
+# A run that is this late is treated as a catch-up run (e.g. after suspend)
+CATCHUP_THRESHOLD_SECONDS = 60
+
+_DURATION_RE = re.compile(r"(\d+)([smhd])")
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+_CRON_ALIASES = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+_MONTH_NAMES = {name: i for i, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+)}
+_DAY_NAMES = {name: i for i, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+
+
+def parse_duration(text: str) -> int:
+    """
+    Parse a duration such as "90s", "15m" or "1h30m" into seconds.
+
+    Raises:
+        ValueError: If the duration is malformed or zero
+    """
+    text = text.strip().lower()
+    if text.isdigit():
+        seconds = int(text)
+    else:
+        parts = _DURATION_RE.findall(text)
+        if not parts or "".join(n + u for n, u in parts) != text:
+            raise ValueError(f"Invalid duration: {text!r}")
+        seconds = sum(int(n) * _DURATION_UNITS[u] for n, u in parts)
+    if seconds <= 0:
+        raise ValueError(f"Duration must be positive: {text!r}")
+    return seconds
+
+
+class IntervalSchedule:
+    """Runs every fixed number of seconds."""
+
+    def __init__(self, seconds: int):
+        self.seconds = seconds
+
+    def next_after(self, ts: float) -> float:
+        """Get the first run time strictly after ts."""
+        return ts + self.seconds
+
+
+class CronSchedule:
+    """Runs at times matching a five-field cron expression (local time)."""
+
+    # Give up looking for a matching time this many years ahead
+    _SEARCH_YEARS = 5
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        self.minutes = self._parse_field(fields[0], 0, 59)
+        self.hours = self._parse_field(fields[1], 0, 23)
+        self.days = self._parse_field(fields[2], 1, 31)
+        self.months = self._parse_field(fields[3], 1, 12, _MONTH_NAMES)
+        weekdays = self._parse_field(fields[4], 0, 7, _DAY_NAMES)
+        # Both 0 and 7 mean Sunday
+        self.weekdays = {0 if d == 7 else d for d in weekdays}
+        # Standard cron: if both day fields are restricted, either may match
+        self._days_restricted = fields[2] != "*"
+        self._weekdays_restricted = fields[4] != "*"
+
+    @staticmethod
+    def _parse_field(text: str, lower: int, upper: int, names: Optional[dict] = None) -> set[int]:
+        """Parse one cron field into the set of matching values."""
+
+        def value(token: str) -> int:
+            token = token.lower()
+            if names and token in names:
+                return names[token]
+            if not token.isdigit():
+                raise ValueError(f"Invalid cron value: {token!r}")
+            number = int(token)
+            if not lower <= number <= upper:
+                raise ValueError(f"Cron value {number} out of range {lower}-{upper}")
+            return number
+
+        values = set()
+        for part in text.split(","):
+            step = 1
+            if "/" in part:
+                part, step_text = part.split("/", 1)
+                if not step_text.isdigit() or int(step_text) == 0:
+                    raise ValueError(f"Invalid cron step: {step_text!r}")
+                step = int(step_text)
+            if part == "*":
+                start, end = lower, upper
+            elif "-" in part:
+                start_text, end_text = part.split("-", 1)
+                start, end = value(start_text), value(end_text)
+            else:
+                start = value(part)
+                # "5/10" means every 10 starting at 5
+                end = upper if step > 1 else start
+            if start > end:
+                raise ValueError(f"Invalid cron range: {part!r}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, dt: datetime) -> bool:
+        """Check the day-of-month and day-of-week fields."""
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.weekday() + 1) % 7 in self.weekdays
+        if self._days_restricted and self._weekdays_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, ts: float) -> float:
+        """Get the first matching run time strictly after ts."""
+        dt = datetime.fromtimestamp(ts).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit_year = dt.year + self._SEARCH_YEARS
+        while dt.year <= limit_year:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+            elif dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+            elif dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+            else:
+                return dt.timestamp()
+        raise ValueError("Cron expression never matches")
+
+
+def parse_schedule(expression: str):
+    """
+    Parse a schedule expression.
+
+    Supports "@every <duration>" intervals, cron aliases such as "@hourly"
+    and five-field cron expressions.
+
+    Args:
+        expression: Schedule expression
+
+    Returns:
+        IntervalSchedule or CronSchedule
+
+    Raises:
+        ValueError: If the expression is invalid
+    """
+    expression = expression.strip()
+    if expression.startswith("@every"):
+        return IntervalSchedule(parse_duration(expression[len("@every"):]))
+    expression = _CRON_ALIASES.get(expression.lower(), expression)
+    return CronSchedule(expression)
+
+
+@dataclass(order=True)
+class _Entry:
+    """Heap entry for a scheduled command."""
+
+    due: float
+    seq: int
+    number: int = field(compare=False)
+    schedule: object = field(compare=False)
+    expression: str = field(compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+class ScheduleHistory:
+    """Bounded, persisted history of scheduled runs."""
+
+    def __init__(self, path, max_entries: int = 200):
+        self.path = path
+        self.entries: deque[dict] = deque(maxlen=max_entries)
+        self._load()
+
+    def _load(self):
+        """Load history from file."""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r") as f:
+                self.entries.extend(json.load(f))
+        except Exception as e:
+            logger.error(f"Failed to load schedule history: {e}")
+
+    def _save(self):
+        """Save history to file."""
+        try:
+            with open(self.path, "w") as f:
+                json.dump(list(self.entries), f, indent=2)
+        except Exception as e:
+            logger.error(f"Failed to save schedule history: {e}")
+
+    def record(self, entry: dict):
+        """Append a run record, dropping the oldest beyond the bound."""
+        self.entries.append(entry)
+        self._save()
+
+    def for_command(self, number: int) -> list[dict]:
+        """Get the recorded runs of a command, oldest first."""
+        return [e for e in self.entries if e.get("number") == number]
+
+
+class Scheduler:
+    """
+    Runs commands with a schedule through the executor's job queue.
+
+    All schedules share a single heap ordered by next run time and a single
+    GLib timeout armed for the earliest one.
+    """
+
+    def __init__(self, executor):
+        """
+        Initialize scheduler.
+
+        Args:
+            executor: CommandExecutor used to run due commands
+        """
+        self.config = Config()
+        self.executor = executor
+        self._heap: list[_Entry] = []
+        self._entries: dict[int, _Entry] = {}
+        self._commands: dict[int, Command] = {}
+        self._seq = itertools.count()
+        self._timeout_id = None
+        history_file = self.config.get_state_dir() / "schedule_history.json"
+        self.history = ScheduleHistory(history_file, self.config.get("scheduler.history_size", 200))
+
+    def sync(self, commands: list[Command], now: Optional[float] = None):
+        """
+        Update schedules from the current command list.
+
+        Commands whose schedule is unchanged keep their next run time.
+
+        Args:
+            commands: All commands
+            now: Current time (defaults to time.time())
+        """
+        now = time.time() if now is None else now
+        wanted = {}
+        for command in commands:
+            expression = getattr(command, 'schedule', "")
+            if expression:
+                wanted[command.number] = command
+
+        for number in list(self._entries):
+            entry = self._entries[number]
+            command = wanted.get(number)
+            if command is None or command.schedule != entry.expression:
+                entry.cancelled = True
+                del self._entries[number]
+
+        self._commands = wanted
+        for number, command in wanted.items():
+            if number in self._entries:
+                continue
+            try:
+                schedule = parse_schedule(command.schedule)
+                due = schedule.next_after(now)
+            except ValueError as e:
+                logger.warning(f"Ignoring invalid schedule for command #{number}: {e}")
+                continue
+            self._push(number, schedule, command.schedule, due)
+            logger.info(f"Scheduled command #{number} ({command.schedule}) next at {datetime.fromtimestamp(due)}")
+
+        self._arm(now)
+
+    def _push(self, number: int, schedule, expression: str, due: float):
+        """Add a heap entry."""
+        entry = _Entry(due, next(self._seq), number, schedule, expression)
+        self._entries[number] = entry
+        heapq.heappush(self._heap, entry)
+
+    def next_due(self) -> Optional[float]:
+        """Get the earliest pending run time."""
+        while self._heap and self._heap[0].cancelled:
+            heapq.heappop(self._heap)
+        return self._heap[0].due if self._heap else None
+
+    def pop_due(self, now: float) -> list[tuple[int, float, bool]]:
+        """
+        Remove due entries and reschedule them.
+
+        Missed occurrences (e.g. while suspended) are coalesced into a single
+        run, and the next run is computed from now rather than replayed.
+
+        Args:
+            now: Current time
+
+        Returns:
+            List of (command number, scheduled time, is catch-up) tuples
+        """
+        due = []
+        while self._heap and self._heap[0].due <= now:
+            entry = heapq.heappop(self._heap)
+            if entry.cancelled:
+                continue
+            catchup = now - entry.due > CATCHUP_THRESHOLD_SECONDS
+            due.append((entry.number, entry.due, catchup))
+            self._push(entry.number, entry.schedule, entry.expression, entry.schedule.next_after(now))
+        return due
+
+    def _arm(self, now: float):
+        """(Re)arm the single timer for the earliest due entry."""
+        from gi.repository import GLib
+        if self._timeout_id is not None:
+            GLib.source_remove(self._timeout_id)
+            self._timeout_id = None
+        next_due = self.next_due()
+        if next_due is None:
+            return
+        delay = min(max(next_due - now, 0), MAX_SLEEP_SECONDS)
+        self._timeout_id = GLib.timeout_add(int(delay * 1000), self._on_timeout)
+
+    def _on_timeout(self) -> bool:
+        """Run due commands and re-arm the timer."""
+        self._timeout_id = None
+        now = time.time()
+        due = self.pop_due(now)
+
+        # Spread catch-up runs so a resume does not start everything at once
+        spread = self.config.get("scheduler.catchup_spread_seconds", 10)
+        catchup_index = 0
+        for number, scheduled_for, catchup in due:
+            if catchup:
+                delay = catchup_index * spread
+                catchup_index += 1
+                if delay:
+                    from gi.repository import GLib
+                    GLib.timeout_add_seconds(delay, self._run, number, scheduled_for, catchup)
+                    continue
+            self._run(number, scheduled_for, catchup)
+
+        self._arm(now)
+        return False  # Don't repeat, re-armed above
+
+    def _run(self, number: int, scheduled_for: float, catchup: bool) -> bool:
+        """Submit a scheduled command to the executor's job queue."""
+        command = self._commands.get(number)
+        if command is None:
+            return False
+        logger.info(f"Running scheduled command #{number}{' (catch-up)' if catchup else ''}")
+        job = self.executor.enqueue(command)
+        job.add_done_callback(
+            lambda job: self._on_run_complete(job, scheduled_for, catchup)
+        )
+        return False  # Don't repeat
+
+    def _on_run_complete(self, job, scheduled_for: float, catchup: bool):
+        """Record a finished scheduled run in the history."""
+        self.history.record({
+            "number": job.command.number,
+            "title": job.command.title,
+            "scheduled_for": scheduled_for,
+            "started_at": job.started_at or None,
+            "ended_at": job.ended_at,
+            "exit_status": job.exit_status,
+            "timed_out": job.timed_out,
+            "catchup": catchup,
+        })
+
+    def stop(self):
+        """Cancel the timer."""
+        if self._timeout_id is not None:
+            from gi.repository import GLib
+            GLib.source_remove(self._timeout_id)
+            self._timeout_id = None
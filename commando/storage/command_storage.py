@@ -105,6 +105,7 @@ class CommandStorage:
         """Update an existing command."""
         for i, cmd in enumerate(self._commands):
             if cmd.number == command.number:
+                command.intern_fields()  # Edited in place, e.g. by the card editor
                 self._commands[i] = command
                 self._save()
                 logger.info(f"Updated command: {command.title} (#{command.number})")
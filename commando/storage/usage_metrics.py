@@ -0,0 +1,146 @@
+"""
+Per-command usage metrics.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Optional
+
+from commando.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Runs are written once no further run finished for this long...
+SAVE_DELAY_SECONDS = 2.0
+# ...but no later than this after the first unsaved run
+SAVE_MAX_DELAY_SECONDS = 30.0
+
+# Instances with runs not written yet, flushed before loading and at exit
+_unsaved: "weakref.WeakSet[UsageMetrics]" = weakref.WeakSet()
+
+
+def _flush_all():
+    """Write pending runs of all instances."""
+    for metrics in list(_unsaved):
+        metrics.flush()
+
+
+atexit.register(_flush_all)
+
+
+class UsageMetrics:
+    """Run counts, failures and durations per command number, persisted as JSON."""
+    
+    def __init__(self, storage_file: Path):
+        """
+        Initialize metrics.
+        
+        Args:
+            storage_file: JSON file to persist metrics in
+        """
+        self.storage_file = storage_file
+        self._stats: dict[int, dict] = {}
+        self._lock = threading.Lock()  # Runs are recorded on the main thread, saved on a timer thread
+        self._save_lock = threading.Lock()  # Serializes writes; taken before _lock, never inside it
+        self._save_timer: Optional[threading.Timer] = None
+        self._dirty_since: Optional[float] = None
+        self._load()
+    
+    def _load(self):
+        """Load metrics from storage."""
+        _flush_all()  # A previous instance may not have written its runs yet
+        if not self.storage_file.exists():
+            return
+        try:
+            with open(self.storage_file, "r") as f:
+                data = json.load(f)
+            self._stats = {int(number): stats for number, stats in data.items()}
+            logger.debug(f"Loaded usage metrics for {len(self._stats)} commands")
+        except Exception as e:
+            logger.error(f"Failed to load usage metrics: {e}")
+            self._stats = {}
+    
+    def _save(self):
+        """Save metrics to storage atomically."""
+        with self._lock:
+            data = json.dumps({str(number): stats for number, stats in self._stats.items()}, indent=2)
+        tmp_file = self.storage_file.with_name(self.storage_file.name + ".tmp")
+        try:
+            with open(tmp_file, "w") as f:
+                f.write(data)
+            os.replace(tmp_file, self.storage_file)
+        except Exception as e:
+            logger.error(f"Failed to save usage metrics: {e}")
+    
+    def _schedule_save(self):
+        """Write runs once they stop coming in (debounced, on a background thread)."""
+        with self._lock:
+            now = time.monotonic()
+            if self._dirty_since is None:
+                self._dirty_since = now
+                _unsaved.add(self)
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            delay = min(SAVE_DELAY_SECONDS, max(self._dirty_since + SAVE_MAX_DELAY_SECONDS - now, 0))
+            self._save_timer = threading.Timer(delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def flush(self):
+        """Write pending runs now."""
+        with self._save_lock:
+            with self._lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                if self._dirty_since is None:
+                    return
+                self._dirty_since = None
+                _unsaved.discard(self)
+            self._save()
+    
+    def record(self, number: int, started_at: float, ended_at: Optional[float], exit_status: Optional[int]):
+        """
+        Record a finished run.
+        
+        Args:
+            number: Command number
+            started_at: Start time (epoch seconds)
+            ended_at: End time, or None if unknown
+            exit_status: Exit status, or None if unknown
+        """
+        with self._lock:
+            stats = self._stats.setdefault(number, {
+                "runs": 0,
+                "failures": 0,
+                "total_duration": 0.0,
+                "last_run": None,
+                "last_exit_status": None,
+            })
+            stats["runs"] += 1
+            if exit_status not in (0, None):
+                stats["failures"] += 1
+            if ended_at is not None:
+                stats["total_duration"] += max(ended_at - started_at, 0.0)
+            stats["last_run"] = started_at
+            stats["last_exit_status"] = exit_status
+        self._schedule_save()
+    
+    def get(self, number: int) -> Optional[dict]:
+        """Get the metrics of a command, or None if it never ran."""
+        with self._lock:
+            stats = self._stats.get(number)
+            return dict(stats) if stats else None
+    
+    def average_duration(self, number: int) -> Optional[float]:
+        """Get the mean run duration of a command in seconds."""
+        with self._lock:
+            stats = self._stats.get(number)
+            if not stats or not stats["runs"]:
+                return None
+            return stats["total_duration"] / stats["runs"]
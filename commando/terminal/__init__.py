@@ -0,0 +1 @@
+"""Terminal support for Commando application."""
@@ -0,0 +1,70 @@
+"""
+Broadcasting input to a group of terminal tabs.
+"""
+
+import time
+from typing import Callable, Hashable, Optional
+
+from commando.logger import get_logger
+from commando.terminal.shell_integration import TerminalRun
+
+logger = get_logger(__name__)
+
+
+class BroadcastRun(TerminalRun):
+    """
+    A command sent to several tabs at once.
+
+    Completes when the run of every tab has completed. The exit status is 0
+    when all tabs succeeded, otherwise the first failure's status (None if
+    a tab could not report one).
+    """
+
+    def __init__(self, command: str, members: list[Hashable]):
+        """
+        Initialize the run.
+
+        Args:
+            command: Command line sent to every tab
+            members: Tabs the command is sent to
+        """
+        super().__init__(command)
+        self.runs: dict[Hashable, TerminalRun] = {member: TerminalRun(command) for member in members}
+        self._tab_callbacks: list[Callable[[Hashable, TerminalRun], None]] = []
+        for member, run in self.runs.items():
+            run.add_done_callback(lambda run, member=member: self._on_tab_finished(member, run))
+        if not self.runs:
+            self._finish(0, time.time())
+
+    def add_tab_done_callback(self, callback: Callable[[Hashable, TerminalRun], None]):
+        """Call callback(tab, run) as each tab's run finishes."""
+        self._tab_callbacks.append(callback)
+        for member, run in self.runs.items():
+            if run.finished:
+                callback(member, run)
+
+    @property
+    def pending(self) -> list[Hashable]:
+        """Tabs whose run has not finished yet."""
+        return [member for member, run in self.runs.items() if not run.finished]
+
+    def _on_tab_finished(self, member: Hashable, run: TerminalRun):
+        """Record one tab's completion and finish once all are done."""
+        for callback in self._tab_callbacks:
+            try:
+                callback(member, run)
+            except Exception as e:
+                logger.error(f"Broadcast tab callback failed: {e}", exc_info=True)
+        if self.pending or self.finished:
+            return
+        runs = list(self.runs.values())
+        self.started_at = min((run.started_at for run in runs if run.started_at is not None), default=None)
+        self._finish(self._combined_status(runs), max(run.ended_at for run in runs))
+
+    @staticmethod
+    def _combined_status(runs: list[TerminalRun]) -> Optional[int]:
+        """0 if every run succeeded, else the first failure."""
+        for run in runs:
+            if run.exit_status != 0:
+                return run.exit_status
+        return 0
@@ -0,0 +1,154 @@
+"""
+Memory budget and hibernation of idle terminal tabs.
+
+Every terminal keeps up to terminal.scrollback_lines of history. When the
+estimated cost of all tabs exceeds the budget, the least recently used idle
+tabs are hibernated: their contents are written to a compressed file in the
+cache dir and their scrollback is dropped. The contents are fed back into
+the terminal as plain text (without colors) when the tab is selected again.
+"""
+
+import gzip
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Hashable, Optional
+
+from commando.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Rough in-memory size of one terminal cell (character, attributes, colors)
+BYTES_PER_CELL = 16
+
+
+def estimate_cost(lines: int, columns: int) -> int:
+    """
+    Estimate the memory used by a terminal's buffer.
+
+    Args:
+        lines: Rows in the buffer (scrollback plus screen)
+        columns: Terminal width
+
+    Returns:
+        Estimated size in bytes
+    """
+    return max(lines, 0) * max(columns, 0) * BYTES_PER_CELL
+
+
+@dataclass
+class HibernatedTab:
+    """Where a hibernated tab's contents are and how to put them back."""
+
+    path: Path
+    cursor_column: int = 0
+
+
+class TerminalMemoryBudget:
+    """
+    Tracks per-tab buffer cost and picks tabs to hibernate.
+
+    Tabs are kept in least recently used order; touch() moves a tab to the
+    end when it is selected.
+    """
+
+    def __init__(self, budget_bytes: int, idle_seconds: float = 300):
+        """
+        Initialize the budget.
+
+        Args:
+            budget_bytes: Total estimated cost to stay under (0 disables hibernation)
+            idle_seconds: Minimum time since a tab was last used before it may be hibernated
+        """
+        self.budget_bytes = budget_bytes
+        self.idle_seconds = idle_seconds
+        self._costs: OrderedDict[Hashable, int] = OrderedDict()
+        self._last_used: dict[Hashable, float] = {}
+
+    @property
+    def total(self) -> int:
+        """Estimated cost of all tracked tabs."""
+        return sum(self._costs.values())
+
+    def touch(self, key: Hashable, now: Optional[float] = None):
+        """Mark a tab as just used."""
+        self._costs.setdefault(key, 0)
+        self._costs.move_to_end(key)
+        self._last_used[key] = time.time() if now is None else now
+
+    def set_cost(self, key: Hashable, cost: int):
+        """Update a tab's estimated cost without changing its recency."""
+        if key not in self._costs:
+            self.touch(key)
+        self._costs[key] = cost
+
+    def remove(self, key: Hashable):
+        """Stop tracking a closed tab."""
+        self._costs.pop(key, None)
+        self._last_used.pop(key, None)
+
+    def select_victims(self, can_hibernate: Callable[[Hashable], bool],
+                       now: Optional[float] = None) -> list:
+        """
+        Pick tabs to hibernate until the total fits the budget.
+
+        Args:
+            can_hibernate: Whether a tab may be hibernated (idle, not selected, ...)
+            now: Current time (defaults to now)
+
+        Returns:
+            Tabs to hibernate, least recently used first
+        """
+        if self.budget_bytes <= 0:
+            return []
+        now = time.time() if now is None else now
+        excess = self.total - self.budget_bytes
+        victims = []
+        for key, cost in self._costs.items():
+            if excess <= 0:
+                break
+            if cost <= 0 or now - self._last_used.get(key, now) < self.idle_seconds:
+                continue
+            if not can_hibernate(key):
+                continue
+            victims.append(key)
+            excess -= cost
+        return victims
+
+
+def save_contents(path: Path, data: bytes):
+    """Write terminal contents to a gzip file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "wb", compresslevel=6) as f:
+        f.write(data)
+
+
+def load_contents(path: Path) -> bytes:
+    """Read terminal contents written by save_contents()."""
+    with gzip.open(path, "rb") as f:
+        return f.read()
+
+
+def restore_sequence(data: bytes, cursor_column: int = 0) -> bytes:
+    """
+    Build the bytes to feed a terminal to show saved contents again.
+
+    The screen is cleared and then the scrollback is erased: VTE moves a
+    cleared screen into the scrollback, which would otherwise show its last
+    lines twice. The saved lines are then replayed, so the older lines
+    scroll into the scrollback and the last lines (the shell's prompt) end
+    up on screen with the cursor where it was. Only plain text is saved, so
+    colors and other attributes are not restored.
+
+    Args:
+        data: Plain text contents of the terminal
+        cursor_column: Zero-based cursor column at hibernation time
+
+    Returns:
+        Bytes for Vte.Terminal.feed()
+    """
+    # Blank screen lines below the prompt are not replayed
+    text = data.replace(b"\r\n", b"\n").rstrip(b" \n")
+    body = text.replace(b"\n", b"\r\n")
+    return b"\x1b[H\x1b[2J\x1b[3J" + body + f"\x1b[{cursor_column + 1}G".encode()
@@ -0,0 +1,169 @@
+"""
+Per-tab process resource monitor.
+
+Samples CPU, memory and I/O of every tab's shell and all its descendants.
+Each sample scans /proc once for all tabs (building the process tree from
+the parent pids), so the cost depends on the number of processes on the
+machine, not on the number of tabs.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Hashable, Optional
+
+from commando.logger import get_logger
+
+logger = get_logger(__name__)
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+@dataclass
+class TabUsage:
+    """Resource usage of one tab's process tree."""
+
+    cpu_percent: float = 0.0  # 100 = one core busy
+    rss_bytes: int = 0
+    read_bytes: int = 0  # Cumulative storage I/O of live processes
+    write_bytes: int = 0
+    read_rate: float = 0.0  # Bytes per second since the previous sample
+    write_rate: float = 0.0
+    process_count: int = 0
+    top_command: Optional[str] = None  # Process using the most CPU
+
+    def summary(self) -> str:
+        """Short human readable form."""
+        text = f"CPU {self.cpu_percent:.0f}% · {format_bytes(self.rss_bytes)}"
+        if self.read_rate or self.write_rate:
+            text += f" · I/O {format_bytes(self.read_rate)}/s read, {format_bytes(self.write_rate)}/s written"
+        return text
+
+
+def format_bytes(size: float) -> str:
+    """Format a byte count with a binary unit."""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(size) < 1024 or unit == "GiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class ResourceMonitor:
+    """Samples resource usage of process trees rooted at tab shells."""
+
+    def __init__(self, proc_root: Path = Path("/proc")):
+        """
+        Initialize the monitor.
+
+        Args:
+            proc_root: Mount point of procfs
+        """
+        self.proc_root = proc_root
+        self._last_time: Optional[float] = None
+        self._last_ticks: dict[int, int] = {}  # pid -> CPU ticks at the previous sample
+        self._last_io: dict[Hashable, tuple[int, int]] = {}
+
+    def _scan(self) -> dict[int, tuple[int, int, int]]:
+        """Read pid -> (ppid, CPU ticks, rss pages) of all processes."""
+        processes = {}
+        try:
+            entries = os.listdir(self.proc_root)
+        except OSError as e:
+            logger.warning(f"Cannot list {self.proc_root}: {e}")
+            return processes
+        for entry in entries:
+            if not entry.isdigit():
+                continue
+            try:
+                with open(self.proc_root / entry / "stat", "rb") as f:
+                    fields = f.read().rsplit(b")", 1)[1].split()
+            except (OSError, IndexError):
+                continue  # Exited during the scan
+            try:
+                processes[int(entry)] = (int(fields[1]), int(fields[11]) + int(fields[12]), int(fields[21]))
+            except (IndexError, ValueError):
+                continue
+        return processes
+
+    def _read_io(self, pid: int) -> tuple[int, int]:
+        """Read storage bytes read and written by a process."""
+        read_bytes = write_bytes = 0
+        try:
+            with open(self.proc_root / str(pid) / "io", "r") as f:
+                for line in f:
+                    key, _, value = line.partition(":")
+                    if key == "read_bytes":
+                        read_bytes = int(value)
+                    elif key == "write_bytes":
+                        write_bytes = int(value)
+        except (OSError, ValueError):
+            pass
+        return read_bytes, write_bytes
+
+    def _read_comm(self, pid: int) -> Optional[str]:
+        """Read a process's command name."""
+        try:
+            with open(self.proc_root / str(pid) / "comm", "r") as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def sample(self, shells: dict[Hashable, int], now: Optional[float] = None) -> dict[Hashable, TabUsage]:
+        """
+        Measure every tab's process tree.
+
+        Args:
+            shells: Tab -> shell pid
+            now: Sample time (defaults to now)
+
+        Returns:
+            Tab -> usage; CPU% and I/O rates are averages since the previous sample
+        """
+        now = time.monotonic() if now is None else now
+        elapsed = None if self._last_time is None else max(now - self._last_time, 1e-6)
+        processes = self._scan()
+        children: dict[int, list[int]] = {}
+        for pid, (ppid, _ticks, _rss) in processes.items():
+            children.setdefault(ppid, []).append(pid)
+
+        usage = {}
+        ticks_now = {}
+        for key, shell_pid in shells.items():
+            if shell_pid not in processes:
+                usage[key] = TabUsage()
+                continue
+            tab = TabUsage()
+            busiest, busiest_delta = None, -1
+            stack = [shell_pid]
+            while stack:
+                pid = stack.pop()
+                stack.extend(children.get(pid, ()))
+                _ppid, ticks, rss = processes[pid]
+                ticks_now[pid] = ticks
+                # New processes started after the previous sample: all their ticks are recent
+                delta = max(ticks - self._last_ticks.get(pid, 0), 0)
+                if elapsed is not None:
+                    tab.cpu_percent += delta / CLOCK_TICKS / elapsed * 100
+                if delta > busiest_delta and pid != shell_pid:
+                    busiest, busiest_delta = pid, delta
+                tab.rss_bytes += rss * PAGE_SIZE
+                read_bytes, write_bytes = self._read_io(pid)
+                tab.read_bytes += read_bytes
+                tab.write_bytes += write_bytes
+                tab.process_count += 1
+            if elapsed is not None and key in self._last_io:
+                last_read, last_write = self._last_io[key]
+                tab.read_rate = max(tab.read_bytes - last_read, 0) / elapsed
+                tab.write_rate = max(tab.write_bytes - last_write, 0) / elapsed
+            self._last_io[key] = (tab.read_bytes, tab.write_bytes)
+            tab.top_command = self._read_comm(busiest if busiest is not None else shell_pid)
+            usage[key] = tab
+
+        for key in list(self._last_io):
+            if key not in shells:
+                del self._last_io[key]
+        self._last_ticks = ticks_now
+        self._last_time = now
+        return usage
@@ -0,0 +1,181 @@
+"""
+Persistence of terminal tabs across restarts.
+
+Each tab has a snapshot in <state dir>/tabs/: <id>.json with its title,
+working directory and recent commands, and <id>.txt.gz with its
+scrollback. tabs.json keeps the tab order. Snapshots are written while the
+app runs (only tabs that changed) so a crash loses little; scrollback is
+compressed and written on a background thread.
+"""
+
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from commando.logger import get_logger
+from commando.terminal.hibernation import load_contents, save_contents
+from commando.terminal.profiles import DEFAULT_PROFILE
+
+logger = get_logger(__name__)
+
+# Commands remembered per tab
+MAX_COMMANDS = 20
+
+
+def new_tab_id() -> str:
+    """Create an id for a tab snapshot."""
+    return uuid.uuid4().hex
+
+
+@dataclass
+class TabSnapshot:
+    """Saved state of a terminal tab."""
+
+    tab_id: str
+    title: str = "Terminal"
+    cwd: Optional[str] = None
+    commands: list[str] = field(default_factory=list)
+    updated_at: float = 0.0
+    profile: str = DEFAULT_PROFILE
+
+    def add_command(self, command: str):
+        """Remember a command run in the tab."""
+        self.commands.append(command)
+        del self.commands[:-MAX_COMMANDS]
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TabSnapshot":
+        """Create from dictionary, ignoring unknown keys."""
+        known = {key: data[key] for key in cls.__dataclass_fields__ if key in data}
+        return cls(**known)
+
+
+def _write_json(path: Path, data):
+    """Write JSON atomically."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+class TabSessionStore:
+    """Reads and writes tab snapshots."""
+
+    def __init__(self, directory: Path):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory holding the snapshots
+        """
+        self.directory = directory
+        directory.mkdir(parents=True, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="commando-tabs")
+
+    def _meta_path(self, tab_id: str) -> Path:
+        return self.directory / f"{tab_id}.json"
+
+    def _scrollback_path(self, tab_id: str) -> Path:
+        return self.directory / f"{tab_id}.txt.gz"
+
+    def save_snapshot(self, snapshot: TabSnapshot):
+        """Write a tab's metadata."""
+        snapshot.updated_at = time.time()
+        try:
+            _write_json(self._meta_path(snapshot.tab_id), snapshot.to_dict())
+        except OSError as e:
+            logger.warning(f"Failed to save tab snapshot {snapshot.tab_id}: {e}")
+
+    def save_scrollback(self, tab_id: str, data: Union[bytes, Callable[[], bytes]], wait: bool = False):
+        """
+        Compress and write a tab's scrollback on the background thread.
+
+        Args:
+            tab_id: Tab the contents belong to
+            data: Plain text contents of the terminal, or a function reading
+                them (called on the background thread, e.g. to load a hibernated tab)
+            wait: Block until written (used at shutdown)
+        """
+        path = self._scrollback_path(tab_id)
+
+        def write():
+            tmp = path.with_name(path.name + ".tmp")
+            try:
+                save_contents(tmp, data() if callable(data) else data)
+                os.replace(tmp, path)
+            except (OSError, EOFError) as e:
+                logger.warning(f"Failed to save scrollback of tab {tab_id}: {e}")
+
+        future = self._executor.submit(write)
+        if wait:
+            future.result()
+
+    def load_scrollback(self, tab_id: str) -> bytes:
+        """Read a tab's saved scrollback (empty if there is none)."""
+        try:
+            return load_contents(self._scrollback_path(tab_id))
+        except FileNotFoundError:
+            return b""
+        except (OSError, EOFError) as e:
+            logger.warning(f"Failed to read scrollback of tab {tab_id}: {e}")
+            return b""
+
+    def save_order(self, tab_ids: list[str], selected: Optional[str] = None):
+        """Write the tab order and the selected tab."""
+        try:
+            _write_json(self.directory / "tabs.json", {"tabs": tab_ids, "selected": selected})
+        except OSError as e:
+            logger.warning(f"Failed to save tab order: {e}")
+
+    def load(self) -> tuple[list[TabSnapshot], Optional[str]]:
+        """
+        Read the saved tabs.
+
+        Returns:
+            Tuple of (snapshots in tab order, id of the selected tab)
+        """
+        try:
+            with open(self.directory / "tabs.json", "r") as f:
+                order = json.load(f)
+        except FileNotFoundError:
+            return [], None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read tab order: {e}")
+            return [], None
+
+        snapshots = []
+        for tab_id in order.get("tabs", []):
+            try:
+                with open(self._meta_path(tab_id), "r") as f:
+                    snapshots.append(TabSnapshot.from_dict(json.load(f)))
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"Skipping unreadable tab snapshot {tab_id}: {e}")
+        return snapshots, order.get("selected")
+
+    def remove(self, tab_id: str):
+        """Delete a closed tab's snapshot."""
+        # Queued behind pending scrollback writes of the same tab
+        def remove():
+            for path in (self._meta_path(tab_id), self._scrollback_path(tab_id)):
+                path.unlink(missing_ok=True)
+        self._executor.submit(remove)
+
+    def prune(self, keep: set[str]):
+        """Delete snapshot files of tabs not in keep."""
+        for path in self.directory.iterdir():
+            tab_id = path.name.split(".", 1)[0]
+            if tab_id != "tabs" and tab_id not in keep:
+                path.unlink(missing_ok=True)
+
+    def close(self):
+        """Finish pending writes."""
+        self._executor.shutdown(wait=True)
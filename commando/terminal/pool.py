@@ -0,0 +1,150 @@
+"""
+Pool of pre-spawned shells for the internal terminal.
+"""
+
+from collections import deque
+from typing import Callable, Optional
+
+from gi.repository import GLib
+
+from commando.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class WarmTerminalPool:
+    """
+    Keeps a number of terminals with an already started shell ready.
+
+    Login shell startup (.bashrc, .zshrc, frameworks) often takes hundreds
+    of milliseconds. Terminals taken from the pool skip that wait; the pool
+    is refilled in the background at low priority.
+    """
+
+    def __init__(self, spawn: Callable[[Callable], object], size: int = 1,
+                 discard: Optional[Callable[[object], None]] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            spawn: Creates a terminal and starts its shell. Called with a
+                callback(terminal, success) to invoke once the shell is running;
+                returns the terminal.
+            size: Number of terminals to keep ready
+            discard: Called with terminals the pool gives up on (failed spawns and
+                spawns completing after resize() or drain() left no room); it
+                terminates their shells
+        """
+        self._spawn = spawn
+        self._discard = discard
+        self.size = size
+        self._ready: deque = deque()
+        self._pending = 0
+        self._refill_id = None
+
+    @property
+    def ready_count(self) -> int:
+        """Number of terminals ready for adoption."""
+        return len(self._ready)
+
+    def acquire(self) -> Optional[object]:
+        """
+        Take a ready terminal out of the pool.
+
+        Returns:
+            A terminal with a running shell, or None if none is ready
+        """
+        terminal = self._ready.popleft() if self._ready else None
+        self.schedule_refill()
+        if terminal is not None:
+            terminal.disconnect_by_func(self._on_child_exited)
+            logger.debug(f"Adopted warm terminal, {len(self._ready)} left in pool")
+        return terminal
+
+    def schedule_refill(self, delay_ms: int = 0):
+        """Refill the pool once the main loop is idle."""
+        if self._refill_id is not None or self.size <= 0:
+            return
+        if delay_ms:
+            self._refill_id = GLib.timeout_add(delay_ms, self._refill, priority=GLib.PRIORITY_LOW)
+        else:
+            self._refill_id = GLib.idle_add(self._refill, priority=GLib.PRIORITY_LOW)
+
+    def _refill(self) -> bool:
+        """Spawn one shell if the pool is below its size."""
+        self._refill_id = None
+        if len(self._ready) + self._pending >= self.size:
+            return False
+        self._pending += 1
+        try:
+            self._spawn(self._on_spawned)
+        except Exception as e:
+            self._pending -= 1
+            logger.error(f"Failed to pre-spawn terminal: {e}", exc_info=True)
+            return False
+        # Spawn one at a time so startup work does not pile up
+        return False
+
+    def _on_spawned(self, terminal, success: bool):
+        """Add a freshly spawned terminal to the pool."""
+        self._pending -= 1
+        if success and len(self._ready) >= self.size:
+            # Started before resize() or drain() shrank the pool
+            logger.debug("Warm terminal no longer needed, discarding it")
+            self._call_discard(terminal)
+        elif success:
+            terminal.connect("child-exited", self._on_child_exited)
+            self._ready.append(terminal)
+            logger.debug(f"Warm terminal ready, pool has {len(self._ready)}/{self.size}")
+            self.schedule_refill()
+        else:
+            self._call_discard(terminal)
+            # Back off instead of retrying a failing spawn in a tight loop
+            self.schedule_refill(delay_ms=5000)
+
+    def _call_discard(self, terminal):
+        """Hand a terminal the pool does not keep to the discard callback."""
+        if self._discard is None:
+            return
+        try:
+            self._discard(terminal)
+        except Exception as e:
+            logger.error(f"Failed to discard warm terminal: {e}", exc_info=True)
+
+    def _on_child_exited(self, terminal, status):
+        """Drop a pooled terminal whose shell exited."""
+        if terminal in self._ready:
+            self._ready.remove(terminal)
+            logger.debug("Warm terminal shell exited, dropped from pool")
+            self.schedule_refill()
+
+    def resize(self, size: int) -> list:
+        """
+        Change the pool size.
+
+        Returns:
+            Surplus terminals removed from the pool (their shells need to be terminated)
+        """
+        self.size = size
+        surplus = []
+        while len(self._ready) > max(size, 0):
+            terminal = self._ready.pop()
+            terminal.disconnect_by_func(self._on_child_exited)
+            surplus.append(terminal)
+        self.schedule_refill()
+        return surplus
+
+    def drain(self) -> list:
+        """
+        Stop refilling and hand back all ready terminals.
+
+        Returns:
+            Terminals still in the pool (their shells need to be terminated)
+        """
+        if self._refill_id is not None:
+            GLib.source_remove(self._refill_id)
+            self._refill_id = None
+        self.size = 0
+        terminals = list(self._ready)
+        self._ready.clear()
+        return terminals
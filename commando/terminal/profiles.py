@@ -0,0 +1,183 @@
+"""
+Named terminal profiles.
+
+The default profile is made of the terminal.* settings; named profiles in
+terminal.profiles override any of its fields and can be assigned to cards.
+Fonts and colors are parsed once per profile and cached until the profile
+changes, and reload() reports which fields of which profiles changed so
+open terminals can be updated in place.
+"""
+
+import os
+import shlex
+from dataclasses import dataclass, field, fields, replace
+from typing import Optional
+
+from gi.repository import Gdk, Pango
+
+from commando.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_PROFILE = "default"
+DEFAULT_FONT = "Monospace 12"
+
+# Settings the profiles are built from
+PROFILE_KEYS = (
+    "terminal.font", "terminal.background_color", "terminal.foreground_color", "terminal.palette",
+    "terminal.scrollback_lines", "terminal.cursor_blink", "terminal.cursor_shape", "terminal.profiles",
+)
+
+# Fields that can be changed on a running terminal
+APPEARANCE_FIELDS = (
+    "font", "background_color", "foreground_color", "palette", "scrollback_lines", "cursor_blink", "cursor_shape",
+)
+
+
+@dataclass
+class TerminalProfile:
+    """Settings of terminals using a profile."""
+
+    name: str = DEFAULT_PROFILE
+    font: str = DEFAULT_FONT
+    background_color: Optional[str] = None
+    foreground_color: Optional[str] = None
+    palette: Optional[str] = None  # Up to 16 colors separated by ":"
+    scrollback_lines: int = 10000
+    cursor_blink: bool = True
+    cursor_shape: str = "block"
+    shell: Optional[str] = None  # Command line of the shell (None: the user's shell)
+    env: dict[str, str] = field(default_factory=dict)  # Added to the shell's environment
+    cwd: Optional[str] = None  # Starting directory (None: the current directory)
+
+    def changed_fields(self, other: "TerminalProfile") -> set[str]:
+        """Appearance fields that differ from other."""
+        return {name for name in APPEARANCE_FIELDS if getattr(self, name) != getattr(other, name)}
+
+    def shell_args(self) -> Optional[list[str]]:
+        """The profile's shell as argv, or None for the user's shell."""
+        return shlex.split(self.shell) if self.shell else None
+
+    def working_directory(self) -> Optional[str]:
+        """The profile's starting directory with ~ and variables expanded."""
+        return os.path.expandvars(os.path.expanduser(self.cwd)) if self.cwd else None
+
+
+@dataclass
+class ProfileAppearance:
+    """Parsed fonts and colors of a profile."""
+
+    font: Pango.FontDescription
+    background: Optional[Gdk.RGBA]
+    foreground: Optional[Gdk.RGBA]
+    palette: Optional[list[Gdk.RGBA]]
+
+
+def _parse_color(spec: Optional[str]) -> Optional[Gdk.RGBA]:
+    """Parse a color, None if unset or invalid."""
+    if not spec:
+        return None
+    color = Gdk.RGBA()
+    if not color.parse(spec):
+        logger.warning(f"Invalid terminal color '{spec}'")
+        return None
+    return color
+
+
+def parse_appearance(profile: TerminalProfile) -> ProfileAppearance:
+    """Parse a profile's font and colors."""
+    try:
+        font = Pango.FontDescription.from_string(profile.font)
+    except Exception as e:
+        logger.warning(f"Failed to parse font '{profile.font}': {e}")
+        font = Pango.FontDescription.from_string(DEFAULT_FONT)
+
+    palette = None
+    if profile.palette:
+        palette = [Gdk.RGBA() for _ in range(16)]
+        for i, color_str in enumerate(profile.palette.split(":")[:16]):
+            if color_str:
+                palette[i].parse(color_str)
+    return ProfileAppearance(
+        font, _parse_color(profile.background_color), _parse_color(profile.foreground_color), palette
+    )
+
+
+class TerminalProfiles:
+    """Resolves profiles from the configuration and caches their parsed appearance."""
+
+    def __init__(self, config):
+        """
+        Initialize and load the profiles.
+
+        Args:
+            config: Config to read terminal.* settings and terminal.profiles from
+        """
+        self.config = config
+        self._profiles: dict[str, TerminalProfile] = {}
+        self._appearance: dict[str, ProfileAppearance] = {}
+        self.reload()
+
+    def _load(self) -> dict[str, TerminalProfile]:
+        """Build all profiles from the current configuration."""
+        base = TerminalProfile(
+            font=self.config.get("terminal.font", DEFAULT_FONT),
+            background_color=self.config.get("terminal.background_color"),
+            foreground_color=self.config.get("terminal.foreground_color"),
+            palette=self.config.get("terminal.palette"),
+            scrollback_lines=self.config.get("terminal.scrollback_lines", 10000),
+            cursor_blink=self.config.get("terminal.cursor_blink", True),
+            cursor_shape=self.config.get("terminal.cursor_shape", "block"),
+        )
+        profiles = {DEFAULT_PROFILE: base}
+        known = {f.name for f in fields(TerminalProfile)} - {"name"}
+        for name, overrides in (self.config.get("terminal.profiles", {}) or {}).items():
+            if name == DEFAULT_PROFILE or not isinstance(overrides, dict):
+                logger.warning(f"Ignoring invalid terminal profile '{name}'")
+                continue
+            unknown = set(overrides) - known
+            if unknown:
+                logger.warning(f"Terminal profile '{name}' has unknown settings: {', '.join(sorted(unknown))}")
+            profiles[name] = replace(base, name=name, **{k: v for k, v in overrides.items() if k in known})
+        return profiles
+
+    def reload(self) -> dict[str, set[str]]:
+        """
+        Re-read the profiles from the configuration.
+
+        Returns:
+            Profile name -> appearance fields that changed, for profiles that
+            still exist; profiles whose appearance is unchanged are left out
+        """
+        profiles = self._load()
+        changes = {}
+        for name, profile in profiles.items():
+            old = self._profiles.get(name)
+            if old is None:
+                continue
+            changed = old.changed_fields(profile)
+            if changed:
+                changes[name] = changed
+        for name in set(self._appearance) - (set(profiles) - set(changes)):
+            del self._appearance[name]  # Re-parse on next use
+        self._profiles = profiles
+        return changes
+
+    def names(self) -> list[str]:
+        """Names of all profiles, the default first."""
+        return list(self._profiles)
+
+    def get(self, name: Optional[str] = None) -> TerminalProfile:
+        """Get a profile, falling back to the default for unknown names."""
+        profile = self._profiles.get(name or DEFAULT_PROFILE)
+        if profile is None:
+            logger.warning(f"Unknown terminal profile '{name}', using the default")
+            profile = self._profiles[DEFAULT_PROFILE]
+        return profile
+
+    def appearance(self, profile: TerminalProfile) -> ProfileAppearance:
+        """Get a profile's parsed fonts and colors."""
+        appearance = self._appearance.get(profile.name)
+        if appearance is None:
+            appearance = self._appearance[profile.name] = parse_appearance(profile)
+        return appearance
@@ -0,0 +1,302 @@
+"""
+Recording of terminal output to disk.
+
+Each terminal tab is a session. Its output is appended to gzip-compressed
+segment files under <state dir>/sessions/<session id>/, rotated when a
+segment reaches recording.max_segment_mb; the oldest segments of all
+sessions are removed once recording.max_total_mb is exceeded (checked at
+startup, when a session opens or closes and when a segment rotates).
+
+All file work happens on one background thread that writes in batches, so
+heavy output never blocks the GTK main loop.
+"""
+
+import gzip
+import itertools
+import os
+import queue
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from commando.logger import get_logger
+
+logger = get_logger(__name__)
+
+SEGMENT_SUFFIX = ".log.gz"
+
+
+@dataclass
+class TabRecording:
+    """Recording state of one terminal tab (used on the main thread)."""
+
+    session_id: str
+    next_row: int = 0  # First buffer row not yet recorded
+    flush_id: Optional[int] = None  # Pending capture timeout
+    skip_to_cursor: bool = False  # Don't record rows fed back by a restore
+
+
+class RecordingListener:
+    """Receives recording events on the writer thread; override what you need."""
+
+    def session_opened(self, session_id: str, title: str, started_at: float):
+        """A session was started."""
+
+    def output_written(self, session_id: str, path: Path, text: str, first_row: Optional[int]):
+        """
+        Output was appended to a session.
+
+        Args:
+            session_id: Session the output belongs to
+            path: Segment the text was written to
+            text: Complete lines written
+            first_row: Terminal buffer row of the first line (None for the header)
+        """
+
+    def segment_removed(self, session_id: str, path: Path):
+        """An old segment was deleted to stay within the size limit."""
+
+
+class _SessionFile:
+    """The open segment of a session (used on the writer thread)."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.index = 0
+        self.size = 0
+        self.file = None
+
+    @property
+    def path(self) -> Path:
+        """Path of the current segment."""
+        return self.directory / f"{self.index:06d}{SEGMENT_SUFFIX}"
+
+    def open_next(self):
+        """Close the current segment and start a new one."""
+        self.close()
+        self.index += 1
+        self.size = 0
+        self.file = gzip.open(self.path, "ab", compresslevel=6)
+
+    def close(self):
+        """Close the current segment."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class SessionRecorder:
+    """Streams terminal output of all sessions to rotating gzip files."""
+
+    def __init__(self, directory: Path, max_segment_bytes: int = 16 * 1024 * 1024,
+                 max_total_bytes: int = 512 * 1024 * 1024, flush_interval: float = 1.0):
+        """
+        Initialize the recorder and start its writer thread.
+
+        Args:
+            directory: Directory holding one subdirectory per session
+            max_segment_bytes: Uncompressed size at which a segment is rotated
+            max_total_bytes: Compressed size of all sessions before the oldest segments are removed
+            flush_interval: Seconds between flushes of buffered output
+        """
+        self.directory = directory
+        self.max_segment_bytes = max(max_segment_bytes, 1)
+        self.max_total_bytes = max_total_bytes
+        self.flush_interval = flush_interval
+        self.listeners: list[RecordingListener] = []
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._sessions: dict[str, _SessionFile] = {}
+        self._notifications: list[tuple] = []  # Listener calls delivered after the batch is flushed
+        self._ids = itertools.count(1)
+        self._thread = threading.Thread(target=self._run, name="commando-recorder", daemon=True)
+        self._thread.start()
+
+    def open_session(self, title: str = "Terminal") -> str:
+        """
+        Start recording a new session.
+
+        Args:
+            title: Description written to the session header
+
+        Returns:
+            Session id (also the name of its directory)
+        """
+        started_at = time.time()
+        session_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(self._ids)}"
+        self._queue.put(("open", session_id, (title, started_at)))
+        return session_id
+
+    def write(self, session_id: str, text: str, first_row: Optional[int] = None):
+        """
+        Queue output of a session for writing (never blocks).
+
+        Args:
+            session_id: Session from open_session()
+            text: Complete lines of output
+            first_row: Terminal buffer row of the first line, passed on to listeners
+        """
+        if text:
+            self._queue.put(("write", session_id, (text, first_row)))
+
+    def close_session(self, session_id: str):
+        """Finish a session's current segment."""
+        self._queue.put(("close", session_id, None))
+
+    def stop(self, timeout: float = 5.0):
+        """Write everything queued, close all sessions and stop the thread."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        """Writer thread: collect queued items and write them in batches."""
+        try:
+            self._prune()  # Recordings left by earlier runs
+        except Exception as e:
+            logger.error(f"Failed to prune session recordings: {e}", exc_info=True)
+        running = True
+        while running:
+            try:
+                items = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            # Drain everything else that arrived meanwhile into the same batch
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in items:
+                running = False
+                items = items[:items.index(None)]
+            try:
+                self._process(items)
+            except Exception as e:
+                logger.error(f"Failed to write session recording: {e}", exc_info=True)
+        for session in self._sessions.values():
+            session.close()
+        self._sessions.clear()
+
+    def _process(self, items: list):
+        """Apply a batch of queued items, flushing each session once."""
+        written = set()
+        for action, session_id, data in items:
+            if action == "open":
+                self._open(session_id, *data)
+                written.add(session_id)
+            elif action == "write":
+                self._write(session_id, *data)
+                written.add(session_id)
+            elif action == "close":
+                session = self._sessions.pop(session_id, None)
+                if session is not None:
+                    session.close()
+                    self._prune()  # Short sessions never rotate, so enforce the limit here too
+                written.discard(session_id)
+        for session_id in written:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.file.flush()  # Sync flush: the segment stays readable if we crash
+        # Listeners only hear about output once it can be read back
+        notifications, self._notifications = self._notifications, []
+        for name, args in notifications:
+            for listener in self.listeners:
+                self._call(getattr(listener, name), *args)
+
+    def _open(self, session_id: str, title: str, started_at: float):
+        """Create a session's directory and first segment."""
+        directory = self.directory / session_id
+        directory.mkdir(parents=True, exist_ok=True)
+        session = _SessionFile(directory)
+        session.open_next()
+        self._sessions[session_id] = session
+        self._notifications.append(("session_opened", (session_id, title, started_at)))
+        started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(started_at))
+        self._write(session_id, f"# Commando session {session_id} ({title}) started {started}\n", None)
+        self._prune()
+
+    def _write(self, session_id: str, text: str, first_row: Optional[int]):
+        """Append text to a session, rotating segments as they fill up."""
+        session = self._sessions.get(session_id)
+        if session is None or not text:
+            return
+        data = text.encode("utf-8", "replace")
+        while data:
+            chunk = data[:max(self.max_segment_bytes - session.size, 0)]
+            if len(chunk) < len(data):
+                # Keep lines whole unless a single line is larger than a segment
+                cut = chunk.rfind(b"\n") + 1
+                if cut:
+                    chunk = chunk[:cut]
+                elif session.size:
+                    chunk = b""
+            if chunk:
+                session.file.write(chunk)
+                session.size += len(chunk)
+                if self.listeners:
+                    text = chunk.decode("utf-8", "replace")
+                    self._notifications.append(("output_written", (session_id, session.path, text, first_row)))
+                if first_row is not None:
+                    first_row += chunk.count(b"\n")
+                data = data[len(chunk):]
+            if data:
+                session.open_next()
+                self._prune()
+
+    @staticmethod
+    def _call(method, *args):
+        """Call a listener method, keeping the writer thread alive if it fails."""
+        try:
+            method(*args)
+        except Exception as e:
+            logger.error(f"Recording listener failed: {e}", exc_info=True)
+
+    def _prune(self):
+        """Remove the oldest segments while the total size is over the limit."""
+        open_paths = {session.path for session in self._sessions.values()}
+        segments = []
+        for path in self.directory.glob(f"*/*{SEGMENT_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            segments.append((stat.st_mtime, path, stat.st_size))
+        total = sum(size for _mtime, _path, size in segments)
+        for _mtime, path, size in sorted(segments):
+            if total <= self.max_total_bytes:
+                break
+            if path in open_paths:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            logger.debug(f"Removed old session segment {path}")
+            self._notifications.append(("segment_removed", (path.parent.name, path)))
+            try:
+                path.parent.rmdir()  # Only succeeds once the session is empty
+            except OSError:
+                pass
+
+
+def read_segment(path: Path) -> str:
+    """
+    Read a segment, including one that is still being written.
+
+    gzip.open() refuses streams without an end marker; the recorder's sync
+    flushes make everything written so far decompressible.
+    """
+    data = path.read_bytes()
+    parts = []
+    while data:
+        decompressor = zlib.decompressobj(wbits=31)  # gzip header
+        parts.append(decompressor.decompress(data))
+        if not decompressor.eof:
+            break
+        data = decompressor.unused_data  # Next gzip member, if any
+    return b"".join(parts).decode("utf-8", "replace")
+
+
+def read_session(directory: Path) -> str:
+    """Read all segments of a recorded session in order."""
+    return "".join(read_segment(path) for path in sorted(directory.glob(f"*{SEGMENT_SUFFIX}")))
@@ -0,0 +1,116 @@
+"""
+Reuse of terminal tabs for card runs.
+
+Instead of opening a new tab (and shell) for every run, a policy picks an
+existing tab whose shell is back at its prompt:
+
+- "new": always open a new tab
+- "idle": reuse an idle tab, preferring the one the card ran in last
+- "per_card": one dedicated tab per card, reused while it is idle
+- "lru": open new tabs up to terminal.max_tabs, then recycle the least
+  recently used tab
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, Optional
+
+from commando.logger import get_logger
+
+logger = get_logger(__name__)
+
+POLICY_NEW = "new"
+POLICY_IDLE = "idle"
+POLICY_PER_CARD = "per_card"
+POLICY_LRU = "lru"
+
+REUSE_POLICIES = (POLICY_NEW, POLICY_IDLE, POLICY_PER_CARD, POLICY_LRU)
+
+
+@dataclass
+class TabChoice:
+    """Where to run a command."""
+
+    terminal: Optional[Hashable] = None  # Existing tab to run in
+    evict: Optional[Hashable] = None  # Tab to close before opening a new one
+
+    @property
+    def new_tab(self) -> bool:
+        """Whether a new tab has to be opened."""
+        return self.terminal is None
+
+
+class TabReuseEngine:
+    """Tracks tab usage and picks the tab for each run."""
+
+    def __init__(self, policy: str = POLICY_IDLE, max_tabs: int = 10):
+        """
+        Initialize the engine.
+
+        Args:
+            policy: One of REUSE_POLICIES (unknown values behave like "new")
+            max_tabs: Tab limit for the "lru" policy
+        """
+        self.policy = policy
+        self.max_tabs = max_tabs
+        self._tabs: OrderedDict[Hashable, None] = OrderedDict()  # Least recently used first
+        self._card_tabs: dict[Hashable, Hashable] = {}
+
+    @property
+    def tab_count(self) -> int:
+        """Number of tracked tabs."""
+        return len(self._tabs)
+
+    def touch(self, terminal: Hashable):
+        """Mark a tab as just used."""
+        self._tabs[terminal] = None
+        self._tabs.move_to_end(terminal)
+
+    def assign(self, card_key: Optional[Hashable], terminal: Hashable):
+        """Record that a card ran in a tab."""
+        self.touch(terminal)
+        if card_key is not None:
+            self._card_tabs[card_key] = terminal
+
+    def remove(self, terminal: Hashable):
+        """Stop tracking a closed tab."""
+        self._tabs.pop(terminal, None)
+        for card_key in [key for key, tab in self._card_tabs.items() if tab is terminal]:
+            del self._card_tabs[card_key]
+
+    def choose(self, card_key: Optional[Hashable], is_idle: Callable[[Hashable], bool]) -> TabChoice:
+        """
+        Pick the tab for a run.
+
+        Args:
+            card_key: Identifies the card being run (None for ad-hoc commands)
+            is_idle: Whether a tab's shell is at its prompt with nothing running
+
+        Returns:
+            The choice; the caller reports the tab it used via assign()
+        """
+        card_tab = self._card_tabs.get(card_key) if card_key is not None else None
+
+        if self.policy == POLICY_PER_CARD:
+            if card_tab is not None and is_idle(card_tab):
+                return TabChoice(terminal=card_tab)
+            return TabChoice()
+
+        if self.policy == POLICY_IDLE:
+            if card_tab is not None and is_idle(card_tab):
+                return TabChoice(terminal=card_tab)
+            for terminal in reversed(self._tabs):
+                if is_idle(terminal):
+                    return TabChoice(terminal=terminal)
+            return TabChoice()
+
+        if self.policy == POLICY_LRU:
+            if self.max_tabs <= 0 or len(self._tabs) < self.max_tabs:
+                return TabChoice()
+            for terminal in self._tabs:
+                if is_idle(terminal):
+                    return TabChoice(terminal=terminal)
+            # Every tab is busy: replace the least recently used one
+            return TabChoice(evict=next(iter(self._tabs)))
+
+        return TabChoice()
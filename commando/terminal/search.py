@@ -0,0 +1,237 @@
+"""
+Full-text search over recorded terminal output.
+
+OutputIndex listens to the SessionRecorder and indexes every recorded line
+in an SQLite database next to the sessions, using FTS5 where SQLite has it
+(a plain table searched with LIKE otherwise). FTS5 matches words that start
+with each query word, LIKE matches the query words anywhere in the line, so
+without FTS5 a search can also find words in the middle of longer ones
+(e.g. "rror" finds "error"). A hit names the session, its
+line number in the recording and, for tabs that are still open, the
+terminal buffer row it was recorded at, so the view can jump to it. Rows
+shift when a tab's contents are replayed (e.g. waking a hibernated tab), so
+the view checks them with locate_row() before jumping.
+"""
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from commando.logger import get_logger
+from commando.terminal.recording import RecordingListener
+
+logger = get_logger(__name__)
+
+# Bumped when the tables change; the index is rebuilt from new recordings then
+SCHEMA_VERSION = 2
+
+
+@dataclass
+class SearchHit:
+    """A recorded line matching a search."""
+
+    session_id: str
+    title: str
+    started_at: float
+    line_no: int  # Line in the session recording, 0 is the header
+    row: Optional[int]  # Terminal buffer row while the tab was open
+    text: str
+
+
+def locate_row(lines: list[str], first_row: int, text: str, row: int) -> Optional[int]:
+    """
+    Find the current row of a hit's line in a terminal.
+
+    Args:
+        lines: Terminal text from first_row on, one line per row
+        first_row: Row of lines[0]
+        text: The hit's line
+        row: Row the line was recorded at
+
+    Returns:
+        row if the line is still there, else the row of the matching line
+        closest to it, or None if the line is gone
+    """
+    wanted = text.rstrip()
+    if 0 <= row - first_row < len(lines) and lines[row - first_row].rstrip() == wanted:
+        return row
+    matches = [first_row + index for index, line in enumerate(lines) if line.rstrip() == wanted]
+    return min(matches, key=lambda match: abs(match - row), default=None)
+
+
+def fts5_available() -> bool:
+    """Whether the SQLite library supports FTS5."""
+    try:
+        with sqlite3.connect(":memory:") as connection:
+            connection.execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _fts_query(query: str) -> str:
+    """Turn user input into an FTS5 query matching words starting with each word literally."""
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in query.split())
+
+
+class OutputIndex(RecordingListener):
+    """Incrementally built full-text index of recorded sessions."""
+
+    def __init__(self, db_path: Path):
+        """
+        Open (and create if needed) the index.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Written from the recorder thread
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self.use_fts = fts5_available()
+        self._next_line: dict[str, int] = {}
+        self._create_tables()
+        # Searched from the main thread with a read-only connection of its own,
+        # so in WAL mode a search never waits for the writer
+        self._read_lock = threading.Lock()
+        self._reader = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+
+    def _create_tables(self):
+        """
+        Create the schema.
+
+        Line positions are in the lines table, indexed by session and
+        segment; their text is in line_text under the same rowid.
+        """
+        with self._lock, self._connection:
+            version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                for table in ("line_text", "lines", "sessions"):
+                    self._connection.execute(f"DROP TABLE IF EXISTS {table}")
+                self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, title TEXT, started_at REAL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS lines "
+                "(id INTEGER PRIMARY KEY, session_id TEXT, segment TEXT, line_no INTEGER, row INTEGER)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS lines_segment ON lines (session_id, segment)")
+            if self.use_fts:
+                self._connection.execute("CREATE VIRTUAL TABLE IF NOT EXISTS line_text USING fts5(text)")
+            else:
+                logger.info("SQLite has no FTS5, output search falls back to LIKE")
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS line_text (rowid INTEGER PRIMARY KEY, text TEXT)"
+                )
+
+    def session_opened(self, session_id: str, title: str, started_at: float):
+        """Register a new session."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sessions (id, title, started_at) VALUES (?, ?, ?)",
+                (session_id, title, started_at),
+            )
+        self._next_line[session_id] = 0
+
+    def output_written(self, session_id: str, path: Path, text: str, first_row: Optional[int]):
+        """Index recorded lines."""
+        line_no = self._next_line.get(session_id)
+        if line_no is None:
+            line_no = self._last_line(session_id) + 1
+        lines = []
+        for offset, line in enumerate(text.splitlines()):
+            if line.strip():
+                row = None if first_row is None else first_row + offset
+                lines.append((line, line_no + offset, row))
+        self._next_line[session_id] = line_no + len(text.splitlines())
+        if lines:
+            with self._lock, self._connection:
+                # Only this connection writes, so the next ids are known up front
+                first_id = self._connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM lines").fetchone()[0]
+                self._connection.executemany(
+                    "INSERT INTO lines (id, session_id, segment, line_no, row) VALUES (?, ?, ?, ?, ?)",
+                    [(first_id + index, session_id, path.name, number, row)
+                     for index, (_line, number, row) in enumerate(lines)],
+                )
+                self._connection.executemany(
+                    "INSERT INTO line_text (rowid, text) VALUES (?, ?)",
+                    [(first_id + index, line) for index, (line, _number, _row) in enumerate(lines)],
+                )
+
+    def segment_removed(self, session_id: str, path: Path):
+        """Drop lines of a deleted segment."""
+        with self._lock, self._connection:
+            # FTS rows are deleted by rowid, found through the lines index
+            self._connection.execute(
+                "DELETE FROM line_text WHERE rowid IN (SELECT id FROM lines WHERE session_id = ? AND segment = ?)",
+                (session_id, path.name),
+            )
+            self._connection.execute(
+                "DELETE FROM lines WHERE session_id = ? AND segment = ?", (session_id, path.name)
+            )
+            self._connection.execute(
+                "DELETE FROM sessions WHERE id = ? AND NOT EXISTS "
+                "(SELECT 1 FROM lines WHERE session_id = ?)",
+                (session_id, session_id),
+            )
+
+    def _last_line(self, session_id: str) -> int:
+        """Last indexed line number of a session (-1 if none)."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT MAX(line_no) FROM lines WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return -1 if row[0] is None else row[0]
+
+    def search(self, query: str, limit: int = 100) -> list[SearchHit]:
+        """
+        Find recorded lines containing all words of query.
+
+        Args:
+            query: Words to look for, matched literally and case-insensitively at
+                the start of words with FTS5, anywhere in the line without it
+            limit: Maximum number of hits
+
+        Returns:
+            Hits, newest session first, in line order within a session
+        """
+        words = query.split()
+        if not words:
+            return []
+        start = time.perf_counter()
+        if self.use_fts:
+            condition = "line_text MATCH ?"
+            params = (_fts_query(query), limit)
+        else:
+            condition = " AND ".join("t.text LIKE ? ESCAPE '\\'" for _ in words)
+            escaped = [
+                "%" + word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%" for word in words
+            ]
+            params = (*escaped, limit)
+        sql = (
+            "SELECT l.session_id, s.title, s.started_at, l.line_no, l.row, t.text "
+            "FROM line_text t JOIN lines l ON l.id = t.rowid JOIN sessions s ON s.id = l.session_id "
+            f"WHERE {condition} "
+            "ORDER BY s.started_at DESC, l.line_no LIMIT ?"
+        )
+        with self._read_lock:
+            rows = self._reader.execute(sql, params).fetchall()
+        logger.debug(f"Output search for {query!r}: {len(rows)} hits in {time.perf_counter() - start:.3f}s")
+        return [
+            SearchHit(session_id, title, started_at, int(line_no), None if row is None else int(row), text)
+            for session_id, title, started_at, line_no, row, text in rows
+        ]
+
+    def close(self):
+        """Close the database."""
+        with self._read_lock:
+            self._reader.close()
+        with self._lock:
+            self._connection.close()
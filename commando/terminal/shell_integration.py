@@ -0,0 +1,376 @@
+"""
+Shell integration for the internal terminal.
+
+The integration scripts make bash, zsh and fish emit OSC 133 semantic
+prompt markers (A: prompt start, B: command input start, C: command
+output start, D;<exit>: command finished) and OSC 7 working directory
+reports. The markers go to the terminal as usual and are also written to a
+per-tab FIFO named by $COMMANDO_SHELL_EVENTS, because VTE does not expose
+arbitrary escape sequences to the application. TerminalView reads the FIFO,
+parses the markers and tracks when card runs start and finish.
+"""
+
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.parse import unquote, urlparse
+
+from commando.logger import get_logger
+
+logger = get_logger(__name__)
+
+EVENTS_ENV = "COMMANDO_SHELL_EVENTS"
+
+_OSC_FUNCTION_POSIX = r'''
+__commando_osc() {
+    printf '\033]%s\007' "$1"
+    if [ -p "$COMMANDO_SHELL_EVENTS" ]; then
+        printf '\033]%s\007' "$1" >> "$COMMANDO_SHELL_EVENTS"
+    fi
+}
+'''
+
+BASH_SCRIPT = r'''# Commando shell integration for bash
+# Emulate a login shell: --init-file replaces the usual startup files
+if [ -r /etc/profile ]; then . /etc/profile; fi
+for __commando_rc in ~/.bash_profile ~/.bash_login ~/.profile; do
+    if [ -r "$__commando_rc" ]; then . "$__commando_rc"; break; fi
+done
+unset __commando_rc
+''' + _OSC_FUNCTION_POSIX + r'''
+__commando_precmd() {
+    local ret=$?
+    __commando_osc "133;D;$ret"
+    __commando_osc "7;file://${HOSTNAME}${PWD}"
+    __commando_osc "133;A"
+    return $ret
+}
+if [[ "$(declare -p PROMPT_COMMAND 2>/dev/null)" == "declare -a"* ]]; then
+    PROMPT_COMMAND=(__commando_precmd "${PROMPT_COMMAND[@]}")
+else
+    PROMPT_COMMAND="__commando_precmd${PROMPT_COMMAND:+; $PROMPT_COMMAND}"
+fi
+PS1="${PS1}\[\033]133;B\007\]"
+PS0='$(__commando_osc "133;C")'"${PS0}"
+'''
+
+ZSH_ENV_SCRIPT = r'''# Commando shell integration for zsh
+# Restore the user's ZDOTDIR so the remaining startup files are theirs
+if [[ -n "$COMMANDO_ORIG_ZDOTDIR" ]]; then
+    ZDOTDIR="$COMMANDO_ORIG_ZDOTDIR"
+else
+    unset ZDOTDIR
+fi
+unset COMMANDO_ORIG_ZDOTDIR
+[[ -r "${ZDOTDIR:-$HOME}/.zshenv" ]] && source "${ZDOTDIR:-$HOME}/.zshenv"
+''' + _OSC_FUNCTION_POSIX + r'''
+__commando_precmd() {
+    local ret=$?
+    __commando_osc "133;D;$ret"
+    __commando_osc "7;file://${HOST}${PWD}"
+    __commando_osc "133;A"
+}
+__commando_preexec() {
+    __commando_osc "133;C"
+}
+autoload -Uz add-zsh-hook
+add-zsh-hook precmd __commando_precmd
+add-zsh-hook preexec __commando_preexec
+# Keep our precmd first so it sees the command's exit status
+precmd_functions=(__commando_precmd ${precmd_functions:#__commando_precmd})
+'''
+
+FISH_SCRIPT = r'''# Commando shell integration for fish
+function __commando_osc
+    printf '\e]%s\a' $argv[1]
+    if test -p "$COMMANDO_SHELL_EVENTS"
+        printf '\e]%s\a' $argv[1] >> "$COMMANDO_SHELL_EVENTS"
+    end
+end
+function __commando_prompt --on-event fish_prompt
+    __commando_osc "7;file://"(hostname)"$PWD"
+    __commando_osc "133;A"
+end
+function __commando_preexec --on-event fish_preexec
+    __commando_osc "133;C"
+end
+function __commando_postexec --on-event fish_postexec
+    __commando_osc "133;D;$status"
+end
+'''
+
+SUPPORTED_SHELLS = ("bash", "zsh", "fish")
+
+
+def install_scripts(directory: Path) -> Path:
+    """
+    Write the integration scripts to directory if they are missing or stale.
+
+    Args:
+        directory: Target directory (created if needed)
+
+    Returns:
+        The directory
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "zsh").mkdir(exist_ok=True)
+    for path, content in (
+        (directory / "bash-integration.bash", BASH_SCRIPT),
+        (directory / "zsh" / ".zshenv", ZSH_ENV_SCRIPT),
+        (directory / "fish-integration.fish", FISH_SCRIPT),
+    ):
+        try:
+            if not path.exists() or path.read_text() != content:
+                path.write_text(content)
+        except OSError as e:
+            logger.warning(f"Failed to write shell integration script {path}: {e}")
+    return directory
+
+
+def integrate_shell(shell_args: list[str], env: dict[str, str], script_dir: Path) -> list[str]:
+    """
+    Adjust a shell's argv and environment to load the integration.
+
+    Args:
+        shell_args: Shell argv, e.g. ["/bin/bash", "-l"]
+        env: Environment for the shell, modified in place
+        script_dir: Directory populated by install_scripts()
+
+    Returns:
+        New argv (unchanged for unsupported shells)
+    """
+    shell = shell_args[0]
+    name = os.path.basename(shell)
+    if name == "bash":
+        # --init-file only applies to non-login shells; the script emulates login
+        return [shell, "--init-file", str(script_dir / "bash-integration.bash"), "-i"]
+    if name == "zsh":
+        if "ZDOTDIR" in env:
+            env["COMMANDO_ORIG_ZDOTDIR"] = env["ZDOTDIR"]
+        env["ZDOTDIR"] = str(script_dir / "zsh")
+        return shell_args
+    if name == "fish":
+        return shell_args + ["--init-command", f"source {script_dir / 'fish-integration.fish'}"]
+    return shell_args
+
+
+@dataclass
+class ShellEvent:
+    """A shell integration marker."""
+
+    kind: str  # "A", "B", "C", "D" (OSC 133) or "cwd" (OSC 7)
+    args: list[str] = field(default_factory=list)
+
+    @property
+    def exit_status(self) -> Optional[int]:
+        """Exit status carried by a D marker."""
+        if self.kind == "D" and self.args and self.args[0].lstrip("-").isdigit():
+            return int(self.args[0])
+        return None
+
+
+class ShellEventParser:
+    """Incremental parser for OSC 133 and OSC 7 sequences."""
+
+    _OSC_RE = re.compile(rb"\x1b\](.*?)(?:\x07|\x1b\\)", re.DOTALL)
+
+    # Discard an unterminated sequence that grows beyond this
+    _MAX_PENDING = 4096
+
+    def __init__(self):
+        self._buffer = b""
+
+    def feed(self, data: bytes) -> list[ShellEvent]:
+        """
+        Parse bytes, keeping incomplete sequences for the next call.
+
+        Args:
+            data: Raw bytes read from the event channel
+
+        Returns:
+            Complete events found so far
+        """
+        self._buffer += data
+        events = []
+        end = 0
+        for match in self._OSC_RE.finditer(self._buffer):
+            end = match.end()
+            event = self._parse_payload(match.group(1).decode("utf-8", "replace"))
+            if event is not None:
+                events.append(event)
+        rest = self._buffer[end:]
+        start = rest.rfind(b"\x1b]")
+        self._buffer = rest[start:] if start != -1 and len(rest) - start < self._MAX_PENDING else b""
+        return events
+
+    @staticmethod
+    def _parse_payload(payload: str) -> Optional[ShellEvent]:
+        """Turn an OSC payload into an event."""
+        number, _, rest = payload.partition(";")
+        if number == "133" and rest:
+            kind, *args = rest.split(";")
+            return ShellEvent(kind, args)
+        if number == "7" and rest:
+            return ShellEvent("cwd", [unquote(urlparse(rest).path)])
+        return None
+
+
+class TerminalRun:
+    """A command run in a terminal tab, completed via shell integration."""
+
+    def __init__(self, command: str):
+        self.command = command
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.ended_at: Optional[float] = None
+        self.exit_status: Optional[int] = None
+        self.start_row: Optional[int] = None  # Terminal cursor row when the command started
+        self.output_rows: Optional[int] = None  # Rows the command's output took up
+        self._callbacks: list[Callable[["TerminalRun"], None]] = []
+
+    @property
+    def finished(self) -> bool:
+        """Whether the run has completed."""
+        return self.ended_at is not None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Run time in seconds, from command start to completion."""
+        if self.ended_at is None:
+            return None
+        return self.ended_at - (self.started_at or self.submitted_at)
+
+    def add_done_callback(self, callback: Callable[["TerminalRun"], None]):
+        """Call callback with this run once it finishes (immediately if it already has)."""
+        if self.finished:
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+    def _finish(self, exit_status: Optional[int], when: float):
+        """Mark the run finished and notify callbacks."""
+        self.ended_at = when
+        self.exit_status = exit_status
+        for callback in self._callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.error(f"Terminal run callback failed: {e}", exc_info=True)
+        self._callbacks.clear()
+
+
+class ShellState:
+    """Tracks prompt state and command runs of one terminal's shell."""
+
+    UNKNOWN = "unknown"  # No markers seen (no integration)
+    PROMPT = "prompt"  # Waiting for input
+    RUNNING = "running"  # A command is running
+
+    def __init__(self):
+        self.state = self.UNKNOWN
+        self.cwd: Optional[str] = None
+        self.current_run: Optional[TerminalRun] = None
+        self._pending: list[TerminalRun] = []
+
+    @property
+    def integrated(self) -> bool:
+        """Whether the shell has reported any markers."""
+        return self.state != self.UNKNOWN
+
+    @property
+    def idle(self) -> bool:
+        """Whether the shell is at its prompt with nothing queued."""
+        return self.state == self.PROMPT and not self._pending and self.current_run is None
+
+    def submit(self, run: TerminalRun):
+        """Register a run whose command line was fed to the shell."""
+        self._pending.append(run)
+
+    def handle(self, event: ShellEvent, when: Optional[float] = None):
+        """
+        Update state from a marker.
+
+        Args:
+            event: Parsed marker
+            when: Event time (defaults to now)
+        """
+        when = time.time() if when is None else when
+        if event.kind == "cwd":
+            self.cwd = event.args[0] if event.args else None
+        elif event.kind in ("A", "B"):
+            if self.state != self.RUNNING:
+                self.state = self.PROMPT
+        elif event.kind == "C":
+            self.state = self.RUNNING
+            if self._pending:
+                self.current_run = self._pending.pop(0)
+                self.current_run.started_at = when
+        elif event.kind == "D":
+            self.state = self.PROMPT
+            if self.current_run is not None:
+                run, self.current_run = self.current_run, None
+                run._finish(event.exit_status, when)
+
+    def abandon(self):
+        """Finish outstanding runs without a status (e.g. the shell exited)."""
+        now = time.time()
+        runs = ([self.current_run] if self.current_run else []) + self._pending
+        self.current_run = None
+        self._pending = []
+        for run in runs:
+            run._finish(None, now)
+
+
+def runtime_dir() -> Path:
+    """Get a private per-user directory for event FIFOs."""
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    directory = Path(base) / "commando"
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    return directory
+
+
+class ShellEventChannel:
+    """
+    FIFO the shell writes its markers to.
+
+    The read end is non-blocking; a dummy write end is held open so the
+    FIFO never reports EOF between shell writes.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        if path.exists():
+            path.unlink()
+        os.mkfifo(path, 0o600)
+        self.read_fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+        self._keepalive_fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+        self.parser = ShellEventParser()
+
+    def read_events(self) -> list[ShellEvent]:
+        """Read and parse everything currently available."""
+        events = []
+        while True:
+            try:
+                data = os.read(self.read_fd, 65536)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            events.extend(self.parser.feed(data))
+        return events
+
+    def close(self):
+        """Close the FIFO and remove it."""
+        for fd in (self.read_fd, self._keepalive_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,245 @@
+"""
+Bounded, parallel termination of terminal shells on shutdown.
+
+All process groups get SIGHUP at once, like a terminal emulator closing:
+shells save their history and pass the hangup on to their jobs. The
+shells are then waited for together until a shared deadline, and only the
+groups still alive after it are killed. Shutdown takes at most the grace
+period, however many tabs are open.
+
+start() waits from the GLib main loop (a watch per pidfd and a deadline
+timeout), so the UI keeps running; run() waits in a single poll, for use
+once the main loop has stopped, and also completes a wait start() began.
+"""
+
+import os
+import select
+import signal
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from gi.repository import GLib
+
+from commando.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Poll interval when pidfds are not available
+FALLBACK_POLL_SECONDS = 0.05
+
+
+@dataclass
+class ShutdownResult:
+    """What happened to each shell."""
+
+    exited: list[int] = field(default_factory=list)  # Shells that exited within the grace period
+    killed: list[int] = field(default_factory=list)  # Shells still running at the deadline
+    elapsed: float = 0.0
+
+
+def _pid_alive(pid: int) -> bool:
+    """Whether a process is still running (zombies count as exited)."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            # The state follows the parenthesised command name
+            return f.read().rsplit(b")", 1)[1].split()[0] != b"Z"
+    except FileNotFoundError:
+        return False
+    except OSError:
+        pass
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+def _signal_group(pgid: int, sig: int) -> bool:
+    """Signal a process group, returning False if it no longer exists."""
+    try:
+        os.killpg(pgid, sig)
+        return True
+    except ProcessLookupError:
+        return False
+    except OSError as e:
+        logger.warning(f"Failed to send {signal.Signals(sig).name} to process group {pgid}: {e}")
+        return False
+
+
+class ShutdownCoordinator:
+    """Terminates a set of shells and their process groups concurrently."""
+
+    def __init__(self, grace_seconds: float = 2.0, first_signal: int = signal.SIGHUP):
+        """
+        Initialize the coordinator.
+
+        Args:
+            grace_seconds: How long shells get to exit before SIGKILL
+            first_signal: Signal sent to every group first
+        """
+        self.grace_seconds = grace_seconds
+        self.first_signal = first_signal
+        self.result: Optional[ShutdownResult] = None  # Set once finished
+        self._shells: dict[int, set[int]] = {}  # Shell pid -> process groups to signal
+        self._started: Optional[float] = None
+        self._remaining: set[int] = set()  # Shells not known to have exited
+        self._pidfds: dict[int, int] = {}  # pidfd -> shell pid
+        self._sources: dict[object, int] = {}  # GLib sources of an asynchronous wait (pidfd, "poll", "deadline")
+        self._on_done: Optional[Callable[[ShutdownResult], None]] = None
+
+    def add(self, pid: int, *pgids: int):
+        """
+        Register a shell.
+
+        Args:
+            pid: Shell process (leader of its own process group)
+            pgids: Further process groups to signal, e.g. the terminal's foreground job
+        """
+        self._shells.setdefault(pid, {pid}).update(pgid for pgid in pgids if pgid and pgid > 0)
+
+    @property
+    def done(self) -> bool:
+        """Whether all shells are gone (exited or killed)."""
+        return self.result is not None
+
+    def start(self, on_done: Optional[Callable[[ShutdownResult], None]] = None):
+        """
+        Signal all groups and wait for the shells from the main loop.
+
+        Args:
+            on_done: Called with the result once the shells are gone
+        """
+        self._on_done = on_done
+        self._hang_up()
+        if not self._remaining:
+            self._finish()
+            return
+        for fd, pid in self._pidfds.items():
+            self._sources[fd] = GLib.unix_fd_add_full(
+                GLib.PRIORITY_DEFAULT, fd, GLib.IOCondition.IN, self._on_pidfd, pid
+            )
+        if len(self._pidfds) < len(self._remaining):
+            self._sources["poll"] = GLib.timeout_add(int(FALLBACK_POLL_SECONDS * 1000), self._on_poll)
+        self._sources["deadline"] = GLib.timeout_add(max(int(self.grace_seconds * 1000), 1), self._on_deadline)
+
+    def run(self) -> ShutdownResult:
+        """
+        Signal all groups (unless start() did), wait for the shells and kill what is left.
+
+        Blocks for up to the grace period.
+
+        Returns:
+            Which shells exited and which had to be killed
+        """
+        if self.result is not None:
+            return self.result
+        if self._started is None:
+            self._hang_up()
+        self._remove_sources()
+        self._wait(self._started + self.grace_seconds)
+        self._finish()
+        return self.result
+
+    def _hang_up(self):
+        """Send the first signal to every group and note the shells still running."""
+        self._started = time.monotonic()
+        if not self._shells:
+            return
+        groups = set().union(*self._shells.values())
+        for pgid in groups:
+            _signal_group(pgid, self.first_signal)
+            _signal_group(pgid, signal.SIGCONT)  # Stopped jobs must run to see the hangup
+        logger.info(f"Sent {signal.Signals(self.first_signal).name} to {len(groups)} process group(s)")
+        self._remaining = {pid for pid in self._shells if _pid_alive(pid)}
+        if hasattr(os, "pidfd_open"):
+            for pid in self._remaining:
+                try:
+                    self._pidfds[os.pidfd_open(pid)] = pid
+                except OSError:
+                    pass  # Exited meanwhile or not supported; checked by polling
+
+    def _exited(self, fd: int):
+        """Forget a shell whose pidfd became readable."""
+        self._remaining.discard(self._pidfds.pop(fd))
+        os.close(fd)
+
+    def _on_pidfd(self, fd: int, condition, pid: int) -> bool:
+        """A shell exited (main loop)."""
+        self._sources.pop(fd, None)  # Removed by returning False
+        if fd in self._pidfds:
+            self._exited(fd)
+        if not self._remaining:
+            self._finish()
+        return False  # Remove source
+
+    def _on_poll(self) -> bool:
+        """Check shells without pidfd (main loop)."""
+        polled = set(self._pidfds.values())
+        self._remaining = {pid for pid in self._remaining if pid in polled or _pid_alive(pid)}
+        if len(polled) < len(self._remaining):
+            return True  # Keep polling
+        self._sources.pop("poll", None)
+        if not self._remaining:
+            self._finish()
+        return False
+
+    def _on_deadline(self) -> bool:
+        """Grace period over (main loop)."""
+        self._sources.pop("deadline", None)
+        self._finish()
+        return False
+
+    def _remove_sources(self):
+        """Stop an asynchronous wait."""
+        for source_id in self._sources.values():
+            GLib.source_remove(source_id)
+        self._sources.clear()
+
+    def _wait(self, deadline: float):
+        """Wait until the shells exit or the deadline passes."""
+        poller = select.poll()
+        for fd in self._pidfds:
+            poller.register(fd, select.POLLIN)
+        while self._remaining:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            polled = len(self._pidfds) == len(self._remaining)
+            wait = timeout if polled else min(timeout, FALLBACK_POLL_SECONDS)
+            for fd, _event in poller.poll(wait * 1000):
+                poller.unregister(fd)
+                self._exited(fd)
+            if not polled:
+                alive = set(self._pidfds.values())
+                self._remaining = {pid for pid in self._remaining if pid in alive or _pid_alive(pid)}
+
+    def _finish(self):
+        """Kill what is left and report the result."""
+        if self.result is not None:
+            return
+        self._remove_sources()
+        for fd in self._pidfds:
+            os.close(fd)
+        self._pidfds.clear()
+        result = ShutdownResult()
+        result.exited = [pid for pid in self._shells if pid not in self._remaining]
+        result.killed = sorted(self._remaining)
+        # Escalate for shells that ignored the hangup and for jobs left behind by exited shells
+        for pgid in set().union(*self._shells.values()):
+            if _signal_group(pgid, signal.SIGKILL) and pgid in self._remaining:
+                logger.warning(f"Killed process group {pgid} after {self.grace_seconds}s grace period")
+        result.elapsed = time.monotonic() - self._started
+        if self._shells:
+            logger.info(
+                f"Terminated {len(self._shells)} shell(s) in {result.elapsed:.2f}s "
+                f"({len(result.killed)} killed)"
+            )
+        self.result = result
+        if self._on_done is not None:
+            try:
+                self._on_done(result)
+            except Exception as e:
+                logger.error(f"Shutdown callback failed: {e}", exc_info=True)
@@ -0,0 +1,111 @@
+"""
+Output rate governor for terminal tabs.
+
+VTE reads a tab's pty and parses its output on the main loop, so a tab
+flooded by e.g. `journalctl -f` can starve the rest of the UI. The
+governor decides, on each tick, whether a tab may read output: the tab the
+user is looking at always may, a background tab producing more than a
+threshold of lines per second only gets a share of the time.
+
+VTE cannot stop reading a pty it is attached to, so a tab that may not read
+is detached from its pty. This pauses the job itself, not just its display:
+once the pty buffer fills, the command blocks on writing and runs at the
+governor's duty cycle. Detaching also makes VTE discard output it has read
+but not yet parsed, so a few bytes can be lost at each pause. Throttling is
+therefore opt-in (terminal.throttle_background).
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Hashable, Optional
+
+from commando.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _TabFlow:
+    """Output state of one tab."""
+
+    row: int  # Cursor row at the last tick
+    last: float  # Time of the last tick
+    flowing: bool = True  # Whether the tab read output since the last tick
+    flooding: bool = False
+    credit: float = 0.0  # Seconds of reading time earned while flooding
+
+
+class OutputGovernor:
+    """Limits how much of the time flooding background tabs read output."""
+
+    def __init__(self, flood_rows_per_second: float = 1000, duty_cycle: float = 0.2):
+        """
+        Initialize the governor.
+
+        Args:
+            flood_rows_per_second: Output rate above which a background tab is throttled
+            duty_cycle: Share of the time a throttled tab reads output (0 to 1)
+        """
+        self.flood_rows_per_second = flood_rows_per_second
+        self.duty_cycle = min(max(duty_cycle, 0.0), 1.0)
+        self._tabs: dict[Hashable, _TabFlow] = {}
+
+    def update(self, key: Hashable, row: int, foreground: bool, now: Optional[float] = None) -> bool:
+        """
+        Measure a tab's output since the last tick and decide whether it may read.
+
+        Args:
+            key: Tab
+            row: Current cursor row in the terminal buffer (grows with output)
+            foreground: Whether the user is looking at the tab
+            now: Tick time (defaults to now)
+
+        Returns:
+            Whether the tab should read output until the next tick
+        """
+        now = time.monotonic() if now is None else now
+        state = self._tabs.get(key)
+        if state is None:
+            self._tabs[key] = _TabFlow(row, now)
+            return True
+
+        elapsed = max(now - state.last, 1e-6)
+        if state.flowing:
+            # Only ticks spent reading say anything about the output rate
+            rate = max(row - state.row, 0) / elapsed
+            if rate > self.flood_rows_per_second:
+                if not state.flooding:
+                    logger.debug(f"Tab output flood detected ({rate:.0f} lines/s)")
+                state.flooding = True
+            elif rate < self.flood_rows_per_second / 2:
+                state.flooding = False
+                state.credit = 0.0
+        state.row = row
+        state.last = now
+
+        if foreground or not state.flooding:
+            state.flowing = True
+        else:
+            # Read for one tick whenever enough time has been earned
+            state.credit = min(state.credit + self.duty_cycle * elapsed, 1.0)
+            state.flowing = state.credit >= elapsed
+            if state.flowing:
+                state.credit -= elapsed
+        return state.flowing
+
+    def throttled(self, key: Hashable) -> bool:
+        """Whether a tab is being throttled."""
+        state = self._tabs.get(key)
+        return state is not None and state.flooding
+
+    def reset(self, key: Hashable):
+        """Let a tab read freely again, e.g. after input was sent to it."""
+        state = self._tabs.get(key)
+        if state is not None:
+            state.flowing = True
+            state.flooding = False
+            state.credit = 0.0
+
+    def remove(self, key: Hashable):
+        """Forget a closed tab."""
+        self._tabs.pop(key, None)
@@ -0,0 +1,209 @@
+"""
+Log panel showing recent log lines from memory.
+
+Lines come from the RingBufferHandler in commando.logger and are shown in
+a Gtk.ListView over a Gtk.StringList, so only the visible rows have
+widgets and new lines are added with one model update per poll. Filtering
+by level and text rebuilds the model in a single splice.
+"""
+
+import logging
+from collections import deque
+
+import gi
+
+gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
+
+from gi.repository import Gtk, Adw, GLib
+
+from commando.logger import LOG_BUFFER_SIZE, get_log_buffer, get_logger
+
+logger = get_logger(__name__)
+
+# How often new lines are fetched while the panel is shown
+POLL_INTERVAL_MS = 500
+
+# (name, label) of the levels offered by the level filter
+LEVELS = (
+    ("DEBUG", "Debug"),
+    ("INFO", "Info"),
+    ("WARNING", "Warning"),
+    ("ERROR", "Error"),
+)
+
+# Position and width of the level name in the buffer's lines ("<asctime> <levelname:8> ...")
+LEVEL_COLUMN = slice(24, 32)
+
+# Style of lines by level name
+LEVEL_CSS_CLASSES = {"WARNING": "warning", "ERROR": "error", "CRITICAL": "error"}
+
+
+class LogFilter:
+    """Decides which log lines are shown."""
+
+    def __init__(self, level: int = logging.DEBUG, text: str = ""):
+        """
+        Initialize the filter.
+
+        Args:
+            level: Minimum level shown
+            text: Text lines must contain (case-insensitive, empty for all)
+        """
+        self.level = level
+        self.text = text.lower()
+
+    def matches(self, level: int, line: str) -> bool:
+        """Whether a line is shown."""
+        return level >= self.level and (not self.text or self.text in line.lower())
+
+    def apply(self, lines) -> list[str]:
+        """Lines shown out of (level, line) pairs."""
+        return [line for level, line in lines if self.matches(level, line)]
+
+
+class LogView(Adw.Bin):
+    """Panel listing recent log lines with level filter and search."""
+
+    def __init__(self, buffer=None):
+        """
+        Initialize the log panel.
+
+        Args:
+            buffer: RingBufferHandler to show (defaults to the one set up by setup_logging)
+        """
+        super().__init__()
+        self.buffer = buffer if buffer is not None else get_log_buffer()
+        capacity = self.buffer.capacity if self.buffer is not None else LOG_BUFFER_SIZE
+        self._lines: deque[tuple[int, str]] = deque(maxlen=capacity)  # (level, line) of all fetched lines
+        self._last_sequence = 0
+        self._filter = LogFilter()
+        self._poll_id = None
+
+        main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        main_box.append(self._create_toolbar())
+
+        self.model = Gtk.StringList()
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_setup_row)
+        factory.connect("bind", self._on_bind_row)
+        self.list_view = Gtk.ListView(model=Gtk.NoSelection(model=self.model), factory=factory)
+        self.list_view.add_css_class("monospace")
+
+        self.scrolled = Gtk.ScrolledWindow()
+        self.scrolled.set_vexpand(True)
+        self.scrolled.set_hexpand(True)
+        self.scrolled.set_child(self.list_view)
+        main_box.append(self.scrolled)
+
+        self.set_child(main_box)
+
+        # Only poll while shown
+        self.connect("map", self._on_map)
+        self.connect("unmap", self._on_unmap)
+
+    def _create_toolbar(self):
+        """Create the filter toolbar."""
+        toolbar = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+        toolbar.set_margin_start(6)
+        toolbar.set_margin_end(6)
+        toolbar.set_margin_top(6)
+        toolbar.set_margin_bottom(6)
+
+        self.level_dropdown = Gtk.DropDown.new_from_strings([label for _name, label in LEVELS])
+        self.level_dropdown.set_tooltip_text("Minimum level")
+        self.level_dropdown.connect("notify::selected", self._on_filter_changed)
+        toolbar.append(self.level_dropdown)
+
+        self.search_entry = Gtk.SearchEntry()
+        self.search_entry.set_placeholder_text("Search logs...")
+        self.search_entry.set_hexpand(True)
+        self.search_entry.connect("search-changed", self._on_filter_changed)
+        toolbar.append(self.search_entry)
+
+        clear_button = Gtk.Button(icon_name="edit-clear-all-symbolic")
+        clear_button.set_tooltip_text("Clear")
+        clear_button.connect("clicked", self._on_clear_clicked)
+        toolbar.append(clear_button)
+
+        return toolbar
+
+    def _on_setup_row(self, factory, list_item):
+        """Create a row widget (reused for whichever lines are visible)."""
+        label = Gtk.Label(xalign=0)
+        label.set_margin_start(6)
+        list_item.set_child(label)
+
+    def _on_bind_row(self, factory, list_item):
+        """Show a line in a row widget."""
+        label = list_item.get_child()
+        line = list_item.get_item().get_string()
+        label.set_label(line)
+        level_class = LEVEL_CSS_CLASSES.get(line[LEVEL_COLUMN].strip())
+        for css_class in ("warning", "error"):
+            if css_class == level_class:
+                label.add_css_class(css_class)
+            else:
+                label.remove_css_class(css_class)
+
+    def _on_map(self, widget):
+        """Start polling when the panel is shown."""
+        self._poll()
+        if self._poll_id is None:
+            self._poll_id = GLib.timeout_add(POLL_INTERVAL_MS, self._poll)
+
+    def _on_unmap(self, widget):
+        """Stop polling when the panel is hidden."""
+        if self._poll_id is not None:
+            GLib.source_remove(self._poll_id)
+            self._poll_id = None
+
+    def _is_scrolled_to_end(self) -> bool:
+        """Whether the newest lines are in view."""
+        adjustment = self.scrolled.get_vadjustment()
+        return adjustment.get_value() >= adjustment.get_upper() - adjustment.get_page_size() - 1
+
+    def _scroll_to_end(self):
+        """Show the newest lines (once the list has been resized)."""
+        def scroll():
+            adjustment = self.scrolled.get_vadjustment()
+            adjustment.set_value(adjustment.get_upper() - adjustment.get_page_size())
+            return False
+        GLib.idle_add(scroll)
+
+    def _poll(self) -> bool:
+        """Add lines logged since the last poll."""
+        if self.buffer is None:
+            return True
+        new = self.buffer.lines_since(self._last_sequence)
+        if not new:
+            return True
+        self._last_sequence = new[-1][0]
+        fetched = [(level, line) for _sequence, level, line in new]
+        self._lines.extend(fetched)
+        shown = self._filter.apply(fetched)
+        if shown:
+            follow = self._is_scrolled_to_end()
+            self.model.splice(self.model.get_n_items(), 0, shown)
+            excess = self.model.get_n_items() - self._lines.maxlen
+            if excess > 0:
+                self.model.splice(0, excess, [])
+            if follow:
+                self._scroll_to_end()
+        return True  # Keep polling
+
+    def _on_filter_changed(self, *args):
+        """Show the lines matching the new filter."""
+        name, _label = LEVELS[self.level_dropdown.get_selected()]
+        self._filter = LogFilter(getattr(logging, name), self.search_entry.get_text())
+        self.model.splice(0, self.model.get_n_items(), self._filter.apply(self._lines))
+        self._scroll_to_end()
+
+    def _on_clear_clicked(self, button):
+        """Remove the lines shown so far."""
+        self._lines.clear()
+        self.model.splice(0, self.model.get_n_items(), [])
+
+    def cleanup(self):
+        """Stop polling."""
+        self._on_unmap(self)
@@ -15,10 +15,12 @@ from commando.storage.default_commands import is_default_command
 from commando.widgets.command_card import CommandCard
 from commando.dialogs.card_editor import CardEditorDialog
 from commando.executor import CommandExecutor
-from commando.logger import get_logger
+from commando.scheduler import Scheduler
+from commando.logger import get_lazy_logger, lazy
 from commando.config import Config
 
-logger = get_logger(__name__)
+# Key handling logs on every key press; the facade skips that work unless debugging
+logger = get_lazy_logger(__name__)
 
 
 class MainView(Adw.Bin):
@@ -29,7 +31,14 @@ class MainView(Adw.Bin):
         super().__init__()
         self.storage = CommandStorage()
         self.executor = CommandExecutor()
+        self.scheduler = Scheduler(self.executor)
         self.config = Config()
+        # Settings used on every load and sort, kept current by a subscription
+        self.sort_by = self.config.get("main_view.sort_by", "number")
+        self.sort_ascending = self.config.get("main_view.sort_ascending", True)
+        self.show_default_cards = self.config.get("general.show_default_cards", True)
+        self.config.subscribe("main_view", self._on_config_changed)
+        self.config.subscribe("general.show_default_cards", self._on_config_changed)
         self.cards: dict[int, CommandCard] = {}
         self.number_input = ""  # Track number input for card selection
         self.number_input_timeout_id = None  # Timeout ID for resetting number input
@@ -314,6 +323,8 @@ class MainView(Adw.Bin):
         # Load commands for the current category
         current_category = self.category_stack.get_visible_child_name() or "all"
         self._load_commands_for_category(current_category)
+        # Pick up added, edited or deleted schedules
+        self.scheduler.sync(self.storage.get_all())
     
     def _load_commands_for_category(self, category_name: str):
         """Load and display commands for a specific category."""
@@ -328,8 +339,7 @@ class MainView(Adw.Bin):
         commands = self.storage.get_all()
         
         # Filter out default commands if setting is disabled
-        show_defaults = self.config.get("general.show_default_cards", True)
-        if not show_defaults:
+        if not self.show_default_cards:
             commands = [cmd for cmd in commands if not is_default_command(cmd)]
         
         # Filter commands by category
@@ -384,8 +394,8 @@ class MainView(Adw.Bin):
     
     def _sort_commands(self, commands: list[Command]):
         """Sort commands based on current sort setting."""
-        sort_by = self.config.get("main_view.sort_by", "number")
-        ascending = self.config.get("main_view.sort_ascending", True)
+        sort_by = self.sort_by
+        ascending = self.sort_ascending
         
         if sort_by == "number":
             commands.sort(key=lambda c: c.number, reverse=not ascending)
@@ -447,7 +457,7 @@ class MainView(Adw.Bin):
             if child.get_visible():
                 card = child.get_child()
                 if isinstance(card, CommandCard):
-                    logger.info(f"Executing command from search Enter: {card.command.title}")
+                    logger.info("Executing command from search Enter: %s", card.command.title)
                     self.execute_command(card.command)
                     # Clear search and hide search bar
                     entry.set_text("")
@@ -458,8 +468,15 @@ class MainView(Adw.Bin):
     def _on_sort_changed(self, combo):
         """Handle sort change."""
         sort_id = combo.get_active_id()
-        self.config.set("main_view.sort_by", sort_id)
-        self._load_commands()
+        self.config.set("main_view.sort_by", sort_id)  # Reloaded through _on_config_changed
+    
+    def _on_config_changed(self, changes: dict):
+        """Reload the cards when their sorting or filtering changed."""
+        self.sort_by = self.config.get("main_view.sort_by", "number")
+        self.sort_ascending = self.config.get("main_view.sort_ascending", True)
+        self.show_default_cards = self.config.get("general.show_default_cards", True)
+        if {"main_view.sort_by", "main_view.sort_ascending", "general.show_default_cards"} & changes.keys():
+            self._load_commands()
     
     def _on_layout_toggled(self, button):
         """Handle layout toggle."""
@@ -485,7 +502,7 @@ class MainView(Adw.Bin):
     
     def _on_card_click(self, command: Command):
         """Handle card click - select the card only."""
-        logger.debug(f"Card clicked: {command.title}")
+        logger.debug("Card clicked: %s", command.title)
         flow_box = self._get_current_flow_box()
         # Single click - only select the card, don't execute
         # Find the card in the FlowBox and select it
@@ -497,12 +514,12 @@ class MainView(Adw.Bin):
                     flow_box.select_child(child)
                     # Ensure FlowBox has focus for keyboard navigation
                     flow_box.grab_focus()
-                    logger.debug(f"Card {command.number} selected")
+                    logger.debug("Card %s selected", command.number)
                     break
     
     def _on_card_double_click(self, command: Command):
         """Handle card double-click."""
-        logger.info(f"Executing command: {command.title}")
+        logger.info("Executing command: %s", command.title)
         self.execute_command(command)
     
     def execute_command(self, command: Command):
@@ -607,7 +624,10 @@ class MainView(Adw.Bin):
         flow_box = self._get_current_flow_box()
         
         # Log ALL key presses at the very start to debug
-        logger.debug(f"MainView._on_key_pressed START: keyval={keyval}, flow_box_visible={flow_box.get_visible()}, cards_count={len(self.cards)}, main_view_has_focus={self.has_focus()}")
+        logger.debug(
+            "MainView._on_key_pressed START: keyval=%s, flow_box_visible=%s, cards_count=%s, main_view_has_focus=%s",
+            keyval, lazy(flow_box.get_visible), len(self.cards), lazy(self.has_focus),
+        )
         
         # Only handle keys when main view is visible and has cards
         if not flow_box.get_visible() or len(self.cards) == 0:
@@ -625,13 +645,16 @@ class MainView(Adw.Bin):
                 break
             parent = parent.get_parent()
         
-        logger.debug(f"MainView key pressed: keyval={keyval}, main_view_has_focus={self.has_focus()}, flow_box_has_focus={flow_box.has_focus()}, number_input='{self.number_input}'")
+        logger.debug(
+            "MainView key pressed: keyval=%s, main_view_has_focus=%s, flow_box_has_focus=%s, number_input='%s'",
+            keyval, lazy(self.has_focus), lazy(flow_box.has_focus), self.number_input,
+        )
         
         # Handle number keys for card selection (check this first, before other keys)
         if self._is_number_key(keyval):
             number = self._get_number_from_keyval(keyval)
             if number is not None:
-                logger.debug(f"Number key detected: {number}, current input: '{self.number_input}'")
+                logger.debug("Number key detected: %s, current input: '%s'", number, self.number_input)
                 self._handle_number_key(number)
                 return True
         
@@ -644,7 +667,7 @@ class MainView(Adw.Bin):
                 # Get the card widget from the child
                 card = child.get_child()
                 if isinstance(card, CommandCard):
-                    logger.info(f"Executing command from Enter key: {card.command.title}")
+                    logger.info("Executing command from Enter key: %s", card.command.title)
                     self.execute_command(card.command)
                 return True  # Event handled
             else:
@@ -657,9 +680,9 @@ class MainView(Adw.Bin):
         # Handle arrow key navigation
         elif keyval in (Gdk.KEY_Up, Gdk.KEY_Down, Gdk.KEY_Left, Gdk.KEY_Right, 
                         Gdk.KEY_KP_Up, Gdk.KEY_KP_Down, Gdk.KEY_KP_Left, Gdk.KEY_KP_Right):
-            logger.debug(f"Arrow key pressed: {keyval}, handling navigation")
+            logger.debug("Arrow key pressed: %s, handling navigation", keyval)
             result = self._handle_arrow_key(keyval)
-            logger.debug(f"Arrow key handling result: {result}")
+            logger.debug("Arrow key handling result: %s", result)
             # Reset number input when arrow keys are pressed
             self._reset_number_input()
             return result
@@ -787,37 +810,37 @@ class MainView(Adw.Bin):
         
         # Append the number to the input string
         self.number_input += str(number)
-        logger.debug(f"Number input updated to: '{self.number_input}'")
+        logger.debug("Number input updated to: '%s'", self.number_input)
         
         # Try to find and select the card with this number
         try:
             card_number = int(self.number_input)
-            logger.debug(f"Looking for card #{card_number}, available cards: {list(self.cards.keys())}")
+            logger.debug("Looking for card #%s, available cards: %s", card_number, lazy(lambda: list(self.cards)))
             card = self.cards.get(card_number)
             if card:
-                logger.debug(f"Found card #{card_number}: {card.command.title}")
+                logger.debug("Found card #%s: %s", card_number, card.command.title)
                 # Find the FlowBoxChild that contains this card
                 for child in flow_box:
                     if child.get_child() == card:
                         # Make sure the card is visible
                         if child.get_visible() and card.get_visible():
-                            logger.debug(f"Selecting card #{card_number} via number input")
+                            logger.debug("Selecting card #%s via number input", card_number)
                             flow_box.select_child(child)
                             self._scroll_to_child(child)
                             # Reset input after successful selection
                             self._reset_number_input()
                             return
                         else:
-                            logger.debug(f"Card #{card_number} found but not visible")
+                            logger.debug("Card #%s found but not visible", card_number)
             else:
-                logger.debug(f"Card #{card_number} not found in cards dictionary")
+                logger.debug("Card #%s not found in cards dictionary", card_number)
         except ValueError as e:
-            logger.debug(f"Error converting '{self.number_input}' to int: {e}")
+            logger.debug("Error converting '%s' to int: %s", self.number_input, e)
         
         # Set a timeout to reset the number input if no valid card is found
         # This allows users to type multi-digit numbers
         def reset_input():
-            logger.debug(f"Resetting number input after timeout")
+            logger.debug("Resetting number input after timeout")
             self._reset_number_input()
             return False
         
@@ -835,4 +858,6 @@ class MainView(Adw.Bin):
     def cleanup(self):
         """Clean up resources."""
         logger.debug("Cleaning up main view")
+        self.scheduler.stop()
+        self.executor.close()
 
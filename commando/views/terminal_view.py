@@ -2,8 +2,13 @@
 Terminal view with tabs.
 """
 
+import itertools
 import os
 import signal
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
 import gi
 
 gi.require_version("Gtk", "4.0")
@@ -14,9 +19,44 @@ from gi.repository import Gtk, Adw, Vte, GLib, Gdk, Pango, Gio
 
 from commando.logger import get_logger
 from commando.config import Config
+from commando.terminal.broadcast import BroadcastRun
+from commando.terminal.hibernation import (
+    HibernatedTab, TerminalMemoryBudget, estimate_cost, load_contents, restore_sequence, save_contents
+)
+from commando.terminal.monitor import ResourceMonitor, TabUsage, format_bytes
+from commando.terminal.persistence import TabSessionStore, TabSnapshot, new_tab_id
+from commando.terminal.pool import WarmTerminalPool
+from commando.terminal.profiles import DEFAULT_PROFILE, PROFILE_KEYS, TerminalProfile, TerminalProfiles
+from commando.terminal.recording import SessionRecorder, TabRecording, read_session
+from commando.terminal.search import OutputIndex, SearchHit, locate_row
+from commando.terminal.shutdown import ShutdownCoordinator
+from commando.terminal.reuse import TabReuseEngine
+from commando.terminal.throttle import OutputGovernor
+from commando.terminal.shell_integration import (
+    EVENTS_ENV, ShellEventChannel, ShellState, TerminalRun, install_scripts, integrate_shell, runtime_dir
+)
 
 logger = get_logger(__name__)
 
+# How often tab buffer sizes are checked against the memory budget
+MEMORY_CHECK_SECONDS = 60
+
+# Output of a recorded tab is collected at most this often
+RECORDING_CAPTURE_MS = 250
+
+# How often changed tabs are snapshotted for restoring them on the next launch
+PERSIST_SECONDS = 30
+
+# Rows of scrollback read per idle callback when snapshotting or hibernating a tab
+SNAPSHOT_CHUNK_ROWS = 2000
+
+# How often the output rate of tabs is checked for floods
+THROTTLE_TICK_MS = 250
+
+# PCRE2 flags for highlighting search matches
+PCRE2_CASELESS = 0x00000008
+PCRE2_MULTILINE = 0x00000400
+
 
 class TerminalView(Adw.Bin):
     """Terminal view with tab support."""
@@ -27,6 +67,49 @@ class TerminalView(Adw.Bin):
         self.config = Config()
         self.terminals: list[Vte.Terminal] = []
         self.terminal_pids: dict[Vte.Terminal, int] = {}  # Store PID for each terminal
+        self.profiles = TerminalProfiles(self.config)
+        self.terminal_profiles: dict[Vte.Terminal, str] = {}  # Profile name of each terminal
+        self.shell_states: dict[Vte.Terminal, ShellState] = {}  # Prompt state from shell integration
+        self._event_channels: dict[Vte.Terminal, tuple[ShellEventChannel, int]] = {}
+        self._channel_ids = itertools.count(1)
+        self._integration_dir = None
+        self._hibernated: dict[Vte.Terminal, HibernatedTab] = {}  # Tabs whose contents are on disk
+        self._hibernation_ids = itertools.count(1)
+        self._hibernating: dict[Vte.Terminal, Optional[Path]] = {}  # Tabs whose contents are being saved
+        # Compresses and writes hibernated contents off the main loop
+        self._hibernation_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="commando-hibernate")
+        self.memory_budget = TerminalMemoryBudget(
+            self.config.get("terminal.memory_budget_mb", 256) * 1024 * 1024,
+            self.config.get("terminal.hibernate_after_seconds", 300),
+        )
+        self.recorder = None  # SessionRecorder, started with the first recorded tab
+        self.output_index = None  # OutputIndex of recorded sessions, opened on first use
+        self.broadcast_group: dict[Vte.Terminal, None] = {}  # Ordered set of tabs receiving broadcast input
+        self._mirroring = False  # Guards against echoing mirrored keystrokes
+        self._recordings: dict[Vte.Terminal, TabRecording] = {}
+        self._shutdown = None  # ShutdownCoordinator, once the shells are being hung up
+        self.tab_reuse = TabReuseEngine(
+            self.config.get("terminal.tab_reuse_policy", "idle"),
+            self.config.get("terminal.max_tabs", 10),
+        )
+        # Tab snapshots for restoring tabs on the next launch
+        self.tab_store = None
+        if self.config.get("terminal.restore_sessions", True):
+            self.tab_store = TabSessionStore(self.config.get_state_dir() / "tabs")
+        self._snapshots: dict[Vte.Terminal, TabSnapshot] = {}
+        self._dirty_snapshots: set[Vte.Terminal] = set()  # Title, cwd or commands changed
+        self._dirty_scrollback: set[Vte.Terminal] = set()
+        self._capturing: set[Vte.Terminal] = set()  # Tabs whose scrollback is being read for a snapshot
+        self._pending_restores: dict[Adw.TabPage, TabSnapshot] = {}  # Restored tabs not viewed yet
+        self.resource_monitor = ResourceMonitor()
+        self.tab_usage: dict[Vte.Terminal, TabUsage] = {}  # Latest sample of each tab's processes
+        # Opt-in: background tabs flooded with output only run part of the time
+        self.output_governor = OutputGovernor(
+            self.config.get("terminal.flood_rows_per_second", 1000),
+            self.config.get("terminal.background_output_percent", 20) / 100,
+        )
+        self._paused_ptys: dict[Vte.Terminal, Vte.Pty] = {}  # Tabs not reading their output
+        self._throttle_id = None
         
         # Make TerminalView focusable and expand to fill available space
         self.set_focusable(True)
@@ -41,6 +124,8 @@ class TerminalView(Adw.Bin):
         
         # Connect to tab view signals to focus terminal when tab is selected
         self.tab_view.connect("notify::selected-page", self._on_tab_selected)
+        # Clicking the broadcast indicator removes a tab from the group
+        self.tab_view.connect("indicator-activated", self._on_indicator_activated)
         
         # Add keyboard controller to handle shortcuts even when terminal has focus
         # Use CAPTURE phase to intercept events before they reach child widgets
@@ -65,11 +150,39 @@ class TerminalView(Adw.Bin):
         # Tab view (the actual content) - make it expand to fill remaining space
         self.tab_view.set_vexpand(True)
         self.tab_view.set_hexpand(True)
-        main_box.append(self.tab_view)
+        content_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL)
+        content_box.set_vexpand(True)
+        content_box.append(self.tab_view)
+        content_box.append(self._create_monitor_sidebar())
+        main_box.append(content_box)
         
         self.set_child(main_box)
         
-        # Don't create initial terminal - create terminals only when commands are executed
+        # Don't create initial terminal - create terminals only when commands are executed,
+        # but keep shells warm in the background so those tabs open without startup latency
+        self.shell_pool = WarmTerminalPool(
+            self._spawn_pooled_terminal,
+            self.config.get("terminal.warm_pool_size", 1),
+            discard=lambda terminal: self._terminate_pooled([terminal]),
+        )
+        self.shell_pool.schedule_refill(delay_ms=2000)  # Let the window finish starting up first
+        self._memory_check_id = GLib.timeout_add_seconds(MEMORY_CHECK_SECONDS, self._check_memory_budget)
+        # One timer samples the processes of all tabs
+        self._monitor_id = GLib.timeout_add_seconds(
+            max(1, self.config.get("terminal.monitor_interval_seconds", 5)), self._sample_resources
+        )
+        self.set_output_throttling(self.config.get("terminal.throttle_background", False))
+        self._config_subscription = self.config.subscribe("terminal", self._on_config_changed)
+        # The selected tab is in the foreground again once the view is shown
+        self.connect(
+            "map", lambda widget: self._resume_output(self._get_page_terminal(self.tab_view.get_selected_page()))
+        )
+        
+        if self.tab_store is not None:
+            self._restore_tabs()
+            self._persist_id = GLib.timeout_add_seconds(PERSIST_SECONDS, self._persist_tabs)
+            # Restored tabs are materialized once the terminal view is shown
+            self.connect("map", lambda widget: self._materialize_tab(self.tab_view.get_selected_page()))
     
     def _create_toolbar(self):
         """Create toolbar for terminal."""
@@ -93,6 +206,37 @@ class TerminalView(Adw.Bin):
         
         toolbar.append(Gtk.Separator(orientation=Gtk.Orientation.VERTICAL))
         
+        # Broadcast group membership of the current tab
+        self.broadcast_button = Gtk.ToggleButton(icon_name="network-transmit-symbolic")
+        self.broadcast_button.set_tooltip_text("Broadcast commands and typing to this tab")
+        self.broadcast_button.connect("toggled", self._on_broadcast_toggled)
+        toolbar.append(self.broadcast_button)
+        
+        # Resource usage of the processes in each tab
+        self.monitor_button = Gtk.ToggleButton(icon_name="utilities-system-monitor-symbolic")
+        self.monitor_button.set_tooltip_text("Show resource usage of tabs")
+        self.monitor_button.connect("toggled", self._on_monitor_toggled)
+        toolbar.append(self.monitor_button)
+        
+        # Search in recorded output of all tabs and past sessions
+        self.output_search_entry = Gtk.SearchEntry()
+        self.output_search_entry.set_placeholder_text("Search output...")
+        self.output_search_entry.set_hexpand(True)
+        self.output_search_entry.connect("activate", self._on_output_search_activate)
+        toolbar.append(self.output_search_entry)
+        
+        self.search_results = Gtk.ListBox()
+        self.search_results.set_selection_mode(Gtk.SelectionMode.NONE)
+        self.search_results.connect("row-activated", self._on_search_result_activated)
+        results_scroll = Gtk.ScrolledWindow()
+        results_scroll.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
+        results_scroll.set_max_content_height(400)
+        results_scroll.set_propagate_natural_height(True)
+        results_scroll.set_child(self.search_results)
+        self.search_popover = Gtk.Popover()
+        self.search_popover.set_child(results_scroll)
+        self.search_popover.set_parent(self.output_search_entry)
+        
         # Settings button
         settings_btn = Gtk.Button(icon_name="emblem-system-symbolic")
         settings_btn.set_tooltip_text("Terminal Settings")
@@ -101,137 +245,61 @@ class TerminalView(Adw.Bin):
         
         return toolbar
     
-    def _create_terminal_tab(self, command_to_execute: str = None):
+    def _create_monitor_sidebar(self):
+        """Create the sidebar listing tabs by resource usage."""
+        self.monitor_list = Gtk.ListBox()
+        self.monitor_list.set_selection_mode(Gtk.SelectionMode.NONE)
+        self.monitor_list.add_css_class("navigation-sidebar")
+        self.monitor_list.connect("row-activated", self._on_monitor_row_activated)
+        scroll = Gtk.ScrolledWindow()
+        scroll.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
+        scroll.set_size_request(260, -1)
+        scroll.set_child(self.monitor_list)
+        self.monitor_revealer = Gtk.Revealer()
+        self.monitor_revealer.set_transition_type(Gtk.RevealerTransitionType.SLIDE_LEFT)
+        self.monitor_revealer.set_child(scroll)
+        return self.monitor_revealer
+    
+    def _create_terminal_tab(self, command_to_execute: str = None, run: TerminalRun = None, profile: str = None):
         """
         Create a new terminal tab.
         
         Args:
             command_to_execute: Optional command to execute once terminal is ready
+            run: Optional run tracking command_to_execute
+            profile: Terminal profile name (None for the default profile)
         """
         try:
-            # Create terminal
-            terminal = Vte.Terminal()
-            terminal.set_size(80, 24)
-            
-            # Make terminal focusable and ensure it can receive keyboard input
-            terminal.set_focusable(True)
-            terminal.set_can_focus(True)
-            # Ensure terminal receives keyboard events
-            terminal.set_can_target(True)
-            
-            # Add keyboard controller to intercept Ctrl+Shift+E even when terminal has focus
-            # Use CAPTURE phase to intercept events before VTE processes them
-            terminal_key_controller = Gtk.EventControllerKey()
-            terminal_key_controller.set_propagation_phase(Gtk.PropagationPhase.CAPTURE)
-            terminal_key_controller.connect("key-pressed", self._on_terminal_key_pressed)
-            terminal.add_controller(terminal_key_controller)
-            
-            # Configure terminal
-            self._configure_terminal(terminal)
-            
-            # Spawn shell - use user's default shell from $SHELL
-            # This ensures zsh, fish, or other shells work correctly
-            shell = GLib.getenv("SHELL")
-            if not shell:
-                # Try to find a shell in common locations
-                for shell_path in ["/bin/zsh", "/bin/bash", "/usr/bin/zsh", "/usr/bin/bash", "/bin/sh"]:
-                    if os.path.exists(shell_path) and os.access(shell_path, os.X_OK):
-                        shell = shell_path
-                        break
-                # Final fallback
-                if not shell:
-                    shell = "/bin/bash"
-            
-            # For bash and zsh, spawn as login shell to read .bashrc/.zshrc
-            # For other shells, check if they support -l flag
-            shell_name = os.path.basename(shell) if shell else "bash"
-            if shell_name in ["bash", "zsh"]:
-                shell_args = [shell, "-l"]
-            else:
-                # For other shells (fish, etc.), just use the shell
-                # They typically read their config automatically
-                shell_args = [shell]
+            profile = self.profiles.get(profile)
+            # Adopt a pre-spawned terminal if one is ready - its shell has
+            # already finished reading its startup files (pooled shells use the default profile)
+            terminal = self.shell_pool.acquire() if profile.name == DEFAULT_PROFILE else None
+            if terminal is not None:
+                self._add_terminal_page(terminal)
+                if command_to_execute:
+                    self._feed_command(terminal, command_to_execute, run)
+                else:
+                    self._focus_new_terminal(terminal)
+                logger.info("Created new terminal tab from warm pool")
+                return terminal
             
-            logger.debug(f"Spawning shell: {' '.join(shell_args)} (from $SHELL={GLib.getenv('SHELL')})")
+            terminal = self._create_terminal(profile)
             
             # Callback to execute command once terminal is ready
-            # VTE spawn_async callback signature: (terminal, pid, error, user_data)
-            def on_spawn_complete(terminal, pid, error, user_data):
-                if pid > 0 and error is None:
-                    # Store the child PID for later cleanup
-                    # The PID is passed directly as the second parameter
-                    self.terminal_pids[terminal] = pid
-                    logger.info(f"Stored PID {pid} for terminal in spawn callback")
-                    
-                    if command_to_execute:
-                        # Small delay to ensure shell is ready
-                        def execute_cmd():
-                            try:
-                                terminal.feed_child(command_to_execute.encode() + b"\n")
-                                # Ensure terminal can receive focus
-                                terminal.set_focusable(True)
-                                terminal.set_can_focus(True)
-                                terminal.set_can_target(True)
-                                # Focus the terminal with multiple attempts
-                                def focus_terminal():
-                                    terminal.grab_focus()
-                                    logger.debug(f"Focused terminal after command execution: {command_to_execute}")
-                                    return False
-                                # Try focusing immediately and with delays
-                                GLib.idle_add(focus_terminal)
-                                GLib.timeout_add(50, focus_terminal)
-                                GLib.timeout_add(200, focus_terminal)
-                                logger.info(f"Executed command in new terminal tab: {command_to_execute}")
-                            except Exception as e:
-                                logger.error(f"Failed to execute command in terminal: {e}")
-                            return False  # Don't repeat
-                        GLib.timeout_add(100, execute_cmd)  # 100ms delay
-                elif error:
-                    logger.error(f"Failed to spawn terminal: {error}")
-            
-            terminal.spawn_async(
-                Vte.PtyFlags.DEFAULT,
-                None,  # working_directory - None means use current directory
-                shell_args,
-                None,  # envv - None means inherit environment (includes $SHELL)
-                GLib.SpawnFlags.DEFAULT,
-                None,  # child_setup
-                None,  # child_setup_data
-                -1,    # timeout_ms
-                None,  # cancellable
-                on_spawn_complete,  # callback when spawn completes
-                None   # user_data
-            )
+            def on_spawned(terminal, success):
+                if success and command_to_execute:
+                    # Small delay to ensure shell is ready
+                    def execute_cmd():
+                        self._feed_command(terminal, command_to_execute, run)
+                        return False  # Don't repeat
+                    GLib.timeout_add(100, execute_cmd)  # 100ms delay
             
-            # Wrap terminal in a box for proper sizing
-            terminal_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
-            # Make terminal expand to fill the box
-            terminal.set_vexpand(True)
-            terminal.set_hexpand(True)
-            terminal_box.append(terminal)
-            
-            # Create page
-            page = self.tab_view.append(terminal_box)
-            page.set_title("Terminal")
-            icon = Gio.ThemedIcon.new("terminal-symbolic")
-            page.set_icon(icon)
-            
-            self.terminals.append(terminal)
-            
-            # Set as current page (this will be done automatically by append, but ensure it)
-            self.tab_view.set_selected_page(page)
+            self._spawn_shell(terminal, on_spawned, profile=profile)
+            self._add_terminal_page(terminal)
             
             # If no command to execute, focus the terminal after creation
             if not command_to_execute:
-                # Focus the terminal after a short delay to ensure it's ready
-                def focus_new_terminal():
-                    terminal.set_focusable(True)
-                    terminal.set_can_focus(True)
-                    terminal.set_can_target(True)
-                    terminal.grab_focus()
-                    logger.debug("Focused new terminal tab")
-                    return False
-                GLib.timeout_add(200, focus_new_terminal)
+                self._focus_new_terminal(terminal)
             
             logger.info("Created new terminal tab")
             
@@ -251,90 +319,408 @@ class TerminalView(Adw.Bin):
             icon = Gio.ThemedIcon.new("terminal-symbolic")
             page.set_icon(icon)
     
-    def _configure_terminal(self, terminal: Vte.Terminal):
-        """Configure terminal appearance and behavior."""
-        # Font
-        font_str = self.config.get("terminal.font", "Monospace 12")
+    def _create_terminal(self, profile: TerminalProfile = None) -> Vte.Terminal:
+        """Create and configure a terminal widget without a shell."""
+        terminal = Vte.Terminal()
+        terminal.set_size(80, 24)
+        
+        # Make terminal focusable and ensure it can receive keyboard input
+        terminal.set_focusable(True)
+        terminal.set_can_focus(True)
+        # Ensure terminal receives keyboard events
+        terminal.set_can_target(True)
+        
+        # Add keyboard controller to intercept Ctrl+Shift+E even when terminal has focus
+        # Use CAPTURE phase to intercept events before VTE processes them
+        terminal_key_controller = Gtk.EventControllerKey()
+        terminal_key_controller.set_propagation_phase(Gtk.PropagationPhase.CAPTURE)
+        terminal_key_controller.connect("key-pressed", self._on_terminal_key_pressed)
+        terminal.add_controller(terminal_key_controller)
+        
+        # Configure terminal
+        self._configure_terminal(terminal, profile)
+        
+        # Make terminal expand to fill its tab
+        terminal.set_vexpand(True)
+        terminal.set_hexpand(True)
+        return terminal
+    
+    def _get_shell_args(self) -> list[str]:
+        """Get the argv for the user's shell."""
+        # Use user's default shell from $SHELL
+        # This ensures zsh, fish, or other shells work correctly
+        shell = GLib.getenv("SHELL")
+        if not shell:
+            # Try to find a shell in common locations
+            for shell_path in ["/bin/zsh", "/bin/bash", "/usr/bin/zsh", "/usr/bin/bash", "/bin/sh"]:
+                if os.path.exists(shell_path) and os.access(shell_path, os.X_OK):
+                    shell = shell_path
+                    break
+            # Final fallback
+            if not shell:
+                shell = "/bin/bash"
+        
+        # For bash and zsh, spawn as login shell to read .bashrc/.zshrc
+        # For other shells, check if they support -l flag
+        shell_name = os.path.basename(shell) if shell else "bash"
+        if shell_name in ["bash", "zsh"]:
+            return [shell, "-l"]
+        # For other shells (fish, etc.), just use the shell
+        # They typically read their config automatically
+        return [shell]
+    
+    def _spawn_shell(self, terminal: Vte.Terminal, on_spawned=None, working_directory: str = None,
+                     profile: TerminalProfile = None):
+        """
+        Spawn the user's shell in a terminal.
+        
+        Args:
+            terminal: Terminal to spawn the shell in
+            on_spawned: Optional callback(terminal, success) once the spawn completes
+            working_directory: Directory to start in (None means the profile's or the current directory)
+            profile: Profile providing the shell, environment and directory (None for the default)
+        """
+        profile = profile or self.profiles.get()
+        shell_args = profile.shell_args() or self._get_shell_args()
+        working_directory = working_directory or profile.working_directory()
+        envv = None  # None means inherit environment (includes $SHELL)
+        self.shell_states[terminal] = ShellState()
+        terminal.connect("child-exited", self._on_child_exited)
+        integrate = self.config.get("terminal.shell_integration", True)
+        if integrate or profile.env:
+            env = dict(os.environ)
+            env.update({key: str(value) for key, value in profile.env.items()})
+            if integrate:
+                shell_args = self._setup_shell_integration(terminal, shell_args, env)
+            envv = [f"{key}={value}" for key, value in env.items()]
+        logger.debug(f"Spawning shell: {' '.join(shell_args)} (from $SHELL={GLib.getenv('SHELL')})")
+        
+        # VTE spawn_async callback signature: (terminal, pid, error, user_data)
+        def on_spawn_complete(terminal, pid, error, user_data):
+            success = pid > 0 and error is None
+            if success:
+                # Store the child PID for later cleanup
+                # The PID is passed directly as the second parameter
+                self.terminal_pids[terminal] = pid
+                logger.info(f"Stored PID {pid} for terminal in spawn callback")
+            elif error:
+                logger.error(f"Failed to spawn terminal: {error}")
+            if on_spawned:
+                on_spawned(terminal, success)
+        
+        terminal.spawn_async(
+            Vte.PtyFlags.DEFAULT,
+            working_directory,  # None means use current directory
+            shell_args,
+            envv,
+            GLib.SpawnFlags.DEFAULT,
+            None,  # child_setup
+            None,  # child_setup_data
+            -1,    # timeout_ms
+            None,  # cancellable
+            on_spawn_complete,  # callback when spawn completes
+            None   # user_data
+        )
+    
+    def _setup_shell_integration(self, terminal: Vte.Terminal, shell_args: list[str], env: dict) -> list[str]:
+        """
+        Prepare a shell to report prompt and command markers.
+        
+        Args:
+            terminal: Terminal the shell will run in
+            shell_args: Shell argv
+            env: Shell environment, modified in place
+        
+        Returns:
+            Shell argv loading the integration script
+        """
         try:
-            font_desc = Pango.FontDescription.from_string(font_str)
-            terminal.set_font(font_desc)
+            if self._integration_dir is None:
+                self._integration_dir = install_scripts(self.config.get_cache_dir() / "shell-integration")
+            fifo = runtime_dir() / f"events-{os.getpid()}-{next(self._channel_ids)}"
+            channel = ShellEventChannel(fifo)
+        except OSError as e:
+            logger.warning(f"Shell integration unavailable: {e}")
+            return shell_args
+        
+        source_id = GLib.unix_fd_add_full(
+            GLib.PRIORITY_DEFAULT, channel.read_fd, GLib.IOCondition.IN,
+            self._on_shell_events, terminal
+        )
+        self._event_channels[terminal] = (channel, source_id)
+        env[EVENTS_ENV] = str(fifo)
+        return integrate_shell(shell_args, env, self._integration_dir)
+    
+    def _on_shell_events(self, fd, condition, terminal) -> bool:
+        """Read shell integration markers for a terminal."""
+        entry = self._event_channels.get(terminal)
+        state = self.shell_states.get(terminal)
+        if entry is None or state is None:
+            return False  # Remove source
+        for event in entry[0].read_events():
+            if event.kind == "D" and state.current_run is not None and state.current_run.start_row is not None:
+                # Measured before handle() completes the run and notifies its callbacks
+                state.current_run.output_rows = max(
+                    terminal.get_cursor_position()[1] - state.current_run.start_row, 0
+                )
+            state.handle(event)
+            if event.kind == "C" and state.current_run is not None:
+                state.current_run.start_row = terminal.get_cursor_position()[1]
+        return True  # Keep watching
+    
+    def _close_event_channel(self, terminal: Vte.Terminal):
+        """Stop watching and remove a terminal's marker FIFO."""
+        entry = self._event_channels.pop(terminal, None)
+        if entry is not None:
+            channel, source_id = entry
+            GLib.source_remove(source_id)
+            channel.close()
+    
+    def _on_child_exited(self, terminal: Vte.Terminal, status: int):
+        """Handle a terminal's shell exiting."""
+        logger.debug(f"Shell exited with status {status}")
+        # Drain markers written just before exit, then give up on pending runs
+        self._on_shell_events(None, None, terminal)
+        state = self.shell_states.get(terminal)
+        if state is not None:
+            state.abandon()
+        self._close_event_channel(terminal)
+        self._resume_output(terminal)  # Show what the shell wrote before exiting
+        self.output_governor.remove(terminal)
+        self._stop_recording(terminal)
+        self.set_broadcast(terminal, False)
+        self.terminal_pids.pop(terminal, None)
+        self.tab_reuse.remove(terminal)  # Nothing left to run commands in
+    
+    def _spawn_pooled_terminal(self, on_ready) -> Vte.Terminal:
+        """Create a terminal for the warm pool and start its shell."""
+        terminal = self._create_terminal()
+        self._spawn_shell(terminal, on_ready)
+        return terminal
+    
+    def _add_terminal_page(self, terminal: Vte.Terminal, title: str = "Terminal", record: bool = True) -> Adw.TabPage:
+        """Add a terminal as a new selected tab."""
+        # Wrap terminal in a box for proper sizing
+        terminal_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        terminal_box.append(terminal)
+        
+        # Create page
+        page = self.tab_view.append(terminal_box)
+        page.set_title(title)
+        icon = Gio.ThemedIcon.new("terminal-symbolic")
+        page.set_icon(icon)
+        
+        self._register_terminal(terminal, title, record)
+        
+        # Set as current page (this will be done automatically by append, but ensure it)
+        self.tab_view.set_selected_page(page)
+        return page
+    
+    def _register_terminal(self, terminal: Vte.Terminal, title: str, record: bool = True,
+                           snapshot: TabSnapshot = None):
+        """Start tracking a terminal shown in a tab."""
+        self.terminals.append(terminal)
+        self.memory_budget.touch(terminal)
+        self.tab_reuse.touch(terminal)
+        if record and self.config.get("recording.enabled", False):
+            self._start_recording(terminal, title)
+        if self.tab_store is not None and terminal in self.shell_states:
+            self._snapshots[terminal] = snapshot or TabSnapshot(
+                new_tab_id(), title, profile=self.terminal_profiles.get(terminal, DEFAULT_PROFILE)
+            )
+            self._dirty_snapshots.add(terminal)
+            terminal.connect("contents-changed", self._dirty_scrollback.add)
+    
+    def _feed_command(self, terminal: Vte.Terminal, command: str, run: TerminalRun = None):
+        """Run a command in a terminal whose shell is ready and focus it."""
+        try:
+            if run is not None and terminal in self.shell_states:
+                self.shell_states[terminal].submit(run)
+            self._remember_command(terminal, command)
+            self._resume_output(terminal)
+            terminal.feed_child(command.encode() + b"\n")
+            # Ensure terminal can receive focus
+            terminal.set_focusable(True)
+            terminal.set_can_focus(True)
+            terminal.set_can_target(True)
+            # Focus the terminal with multiple attempts
+            def focus_terminal():
+                terminal.grab_focus()
+                logger.debug(f"Focused terminal after command execution: {command}")
+                return False
+            # Try focusing immediately and with delays
+            GLib.idle_add(focus_terminal)
+            GLib.timeout_add(50, focus_terminal)
+            GLib.timeout_add(200, focus_terminal)
+            logger.info(f"Executed command in terminal tab: {command}")
         except Exception as e:
-            logger.warning(f"Failed to set font '{font_str}': {e}")
-            # Use default font
-            font_desc = Pango.FontDescription.from_string("Monospace 12")
-            terminal.set_font(font_desc)
+            logger.error(f"Failed to execute command in terminal: {e}")
+    
+    def _focus_new_terminal(self, terminal: Vte.Terminal):
+        """Focus a newly added terminal after a short delay."""
+        # Focus the terminal after a short delay to ensure it's ready
+        def focus_new_terminal():
+            terminal.set_focusable(True)
+            terminal.set_can_focus(True)
+            terminal.set_can_target(True)
+            terminal.grab_focus()
+            logger.debug("Focused new terminal tab")
+            return False
+        GLib.timeout_add(200, focus_new_terminal)
+    
+    def _configure_terminal(self, terminal: Vte.Terminal, profile: TerminalProfile = None):
+        """Configure terminal appearance and behavior from a profile (default if None)."""
+        profile = profile or self.profiles.get()
+        self.terminal_profiles[terminal] = profile.name
+        self._apply_profile(terminal, profile)
+    
+    def _apply_profile(self, terminal: Vte.Terminal, profile: TerminalProfile, changed: set[str] = None):
+        """
+        Apply a profile's appearance to a terminal.
+        
+        Args:
+            terminal: Terminal to update
+            profile: Profile to apply
+            changed: Only apply these fields (None applies all)
+        """
+        appearance = self.profiles.appearance(profile)  # Parsed once per profile
+        
+        def wants(*names):
+            return changed is None or not changed.isdisjoint(names)
+        
+        # Font
+        if wants("font"):
+            terminal.set_font(appearance.font)
         
         # Scrollback
-        scrollback = self.config.get("terminal.scrollback_lines", 10000)
-        terminal.set_scrollback_lines(scrollback)
+        if wants("scrollback_lines"):
+            terminal.set_scrollback_lines(profile.scrollback_lines)
         
         # Cursor
-        cursor_blink = self.config.get("terminal.cursor_blink", True)
-        terminal.set_cursor_blink_mode(
-            Vte.CursorBlinkMode.ON if cursor_blink else Vte.CursorBlinkMode.OFF
-        )
+        if wants("cursor_blink"):
+            terminal.set_cursor_blink_mode(
+                Vte.CursorBlinkMode.ON if profile.cursor_blink else Vte.CursorBlinkMode.OFF
+            )
+        
+        if wants("cursor_shape"):
+            cursor_shape_map = {
+                "block": Vte.CursorShape.BLOCK,
+                "ibeam": Vte.CursorShape.IBEAM,
+                "underline": Vte.CursorShape.UNDERLINE,
+            }
+            terminal.set_cursor_shape(cursor_shape_map.get(profile.cursor_shape, Vte.CursorShape.BLOCK))
         
-        cursor_shape_str = self.config.get("terminal.cursor_shape", "block")
-        cursor_shape_map = {
-            "block": Vte.CursorShape.BLOCK,
-            "ibeam": Vte.CursorShape.IBEAM,
-            "underline": Vte.CursorShape.UNDERLINE,
-        }
-        terminal.set_cursor_shape(cursor_shape_map.get(cursor_shape_str, Vte.CursorShape.BLOCK))
-        
-        # Colors
-        bg_color = self.config.get("terminal.background_color")
-        fg_color = self.config.get("terminal.foreground_color")
-        
-        if bg_color:
-            bg = Gdk.RGBA()
-            bg.parse(bg_color)
-            terminal.set_color_background(bg)
-        
-        if fg_color:
-            fg = Gdk.RGBA()
-            fg.parse(fg_color)
-            terminal.set_color_foreground(fg)
-        
-        # Palette
-        palette_str = self.config.get("terminal.palette")
-        if palette_str:
-            palette = [Gdk.RGBA() for _ in range(16)]
-            colors = palette_str.split(":")
-            for i, color_str in enumerate(colors[:16]):
-                if color_str:
-                    palette[i].parse(color_str)
-            terminal.set_colors(None, None, palette)
+        # Colors and palette (set together: set_colors resets the defaults)
+        if wants("background_color", "foreground_color", "palette"):
+            if appearance.palette is not None:
+                terminal.set_colors(appearance.foreground, appearance.background, appearance.palette)
+            else:
+                if changed is not None:
+                    terminal.set_default_colors()  # Drop the colors of the previous settings
+                if appearance.background is not None:
+                    terminal.set_color_background(appearance.background)
+                if appearance.foreground is not None:
+                    terminal.set_color_foreground(appearance.foreground)
+    
+    def reload_profiles(self):
+        """Re-read terminal profiles and update open terminals whose profile changed."""
+        changes = self.profiles.reload()
+        updated = 0
+        for terminal, name in list(self.terminal_profiles.items()):
+            if name not in self.profiles.names():
+                # Profile was deleted: fall back to the default
+                name = self.terminal_profiles[terminal] = DEFAULT_PROFILE
+                self._apply_profile(terminal, self.profiles.get())
+                updated += 1
+            elif name in changes:
+                self._apply_profile(terminal, self.profiles.get(name), changes[name])
+                updated += 1
+        if updated:
+            logger.info(f"Updated {updated} terminal(s) for changed profiles: {', '.join(sorted(changes))}")
     
     def _on_close_tab(self, button):
         """Close current tab."""
         page = self.tab_view.get_selected_page()
         if page:
+            snapshot = self._pending_restores.pop(page, None)
+            if snapshot is not None:
+                self.tab_store.remove(snapshot.tab_id)
             child = page.get_child()
             # Terminal is wrapped in a box
             if isinstance(child, Gtk.Box) and child.get_first_child():
                 terminal = child.get_first_child()
                 if isinstance(terminal, Vte.Terminal) and terminal in self.terminals:
                     self.terminals.remove(terminal)
+                    self._forget_terminal(terminal)
             self.tab_view.close_page(page)
     
+    def _forget_terminal(self, terminal: Vte.Terminal):
+        """Drop per-terminal state of a closed tab."""
+        state = self.shell_states.pop(terminal, None)
+        if state is not None:
+            state.abandon()
+        self._close_event_channel(terminal)
+        self.memory_budget.remove(terminal)
+        self.tab_reuse.remove(terminal)
+        self._stop_recording(terminal)
+        self.set_broadcast(terminal, False)
+        entry = self._hibernated.pop(terminal, None)
+        if entry is not None:
+            entry.path.unlink(missing_ok=True)
+        snapshot = self._snapshots.pop(terminal, None)
+        if snapshot is not None:
+            self.tab_store.remove(snapshot.tab_id)
+        self._dirty_snapshots.discard(terminal)
+        self._dirty_scrollback.discard(terminal)
+        self._capturing.discard(terminal)
+        self.tab_usage.pop(terminal, None)
+        self.terminal_profiles.pop(terminal, None)
+        self._paused_ptys.pop(terminal, None)
+        self.output_governor.remove(terminal)
+    
     def _on_settings(self, button):
         """Open terminal settings."""
         # This would open a settings dialog
         logger.debug("Terminal settings clicked")
     
-    def execute_command(self, command: str, create_new_tab: bool = True):
+    def execute_command(self, command: str, create_new_tab: bool = None, card_key=None,
+                        profile: str = None) -> TerminalRun:
         """
         Execute a command in a terminal.
         
         Args:
             command: Command to execute
             create_new_tab: If True, create a new tab for this command. If False, use current tab.
+                If None, terminal.tab_reuse_policy decides whether an existing tab is reused.
+            card_key: Identifies the card being run, for per-card tab reuse
+            profile: Terminal profile for a new tab; reused tabs must have the same profile
+        
+        Returns:
+            Run handle; it completes when shell integration reports the command finished
         """
+        if self.broadcast_group and create_new_tab is not True:
+            return self._broadcast_command(command)
+        run = TerminalRun(command)
+        if create_new_tab is None:
+            profile_name = self.profiles.get(profile).name
+            choice = self.tab_reuse.choose(
+                card_key,
+                lambda terminal: self.terminal_profiles.get(terminal) == profile_name and self._is_tab_idle(terminal),
+            )
+            if choice.evict is not None:
+                logger.warning("All terminal tabs are busy at the tab limit, closing the least recently used")
+                self._close_terminal_tab(choice.evict)
+            if choice.terminal is not None:
+                self._run_in_tab(choice.terminal, command, run)
+                self.tab_reuse.assign(card_key, choice.terminal)
+                return run
+            create_new_tab = True
         if create_new_tab:
             # Create a new terminal tab with the command to execute
             # The command will be executed once the terminal is ready
-            self._create_terminal_tab(command_to_execute=command)
+            terminal = self._create_terminal_tab(command_to_execute=command, run=run, profile=profile)
+            if terminal is not None:
+                self.tab_reuse.assign(card_key, terminal)
         else:
             # Use current tab and execute immediately
             page = self.tab_view.get_selected_page()
@@ -345,10 +731,152 @@ class TerminalView(Adw.Bin):
                     terminal = child.get_first_child()
                     if isinstance(terminal, Vte.Terminal):
                         # Execute the command
+                        if terminal in self.shell_states:
+                            self.shell_states[terminal].submit(run)
+                        self._resume_output(terminal)
                         terminal.feed_child(command.encode() + b"\n")
                         # Give focus to the terminal so user can interact with it
                         terminal.grab_focus()
                         logger.info(f"Executed command in terminal: {command}")
+        return run
+    
+    def set_broadcast(self, terminal: Vte.Terminal, enabled: bool):
+        """
+        Add a tab to or remove it from the broadcast group.
+        
+        While the group is not empty, execute_command and type_command send
+        to every tab in it, and typing in one member is mirrored to the others.
+        """
+        page = self.tab_view.get_page(terminal.get_parent()) if terminal.get_parent() else None
+        if enabled and terminal not in self.broadcast_group:
+            self.broadcast_group[terminal] = None
+            terminal.connect("commit", self._on_broadcast_commit)
+            if page:
+                page.set_indicator_icon(Gio.ThemedIcon.new("network-transmit-symbolic"))
+                page.set_indicator_tooltip("Receiving broadcast input (click to stop)")
+                page.set_indicator_activatable(True)
+        elif not enabled and terminal in self.broadcast_group:
+            del self.broadcast_group[terminal]
+            terminal.disconnect_by_func(self._on_broadcast_commit)
+            if page:
+                page.set_indicator_icon(None)
+                page.set_needs_attention(False)
+        else:
+            return
+        logger.info(f"Broadcast group has {len(self.broadcast_group)} tab(s)")
+    
+    def _on_broadcast_toggled(self, button):
+        """Add or remove the current tab from the broadcast group."""
+        terminal = self._get_page_terminal(self.tab_view.get_selected_page())
+        if terminal is not None:
+            self.set_broadcast(terminal, button.get_active())
+        elif button.get_active():
+            button.set_active(False)
+    
+    def _on_indicator_activated(self, tab_view, page):
+        """Remove a tab from the broadcast group via its indicator."""
+        terminal = self._get_page_terminal(page)
+        if terminal is not None:
+            self.set_broadcast(terminal, False)
+            if page == tab_view.get_selected_page():
+                self.broadcast_button.set_active(False)
+    
+    def _on_broadcast_commit(self, terminal: Vte.Terminal, text: str, size: int):
+        """Mirror keystrokes typed in one member to the other members."""
+        if self._mirroring:
+            return
+        self._mirroring = True
+        try:
+            data = text.encode()
+            for member in self.broadcast_group:
+                if member is not terminal:
+                    self._resume_output(member)
+                    member.feed_child(data)
+        finally:
+            self._mirroring = False
+    
+    def _broadcast_bytes(self, data: bytes):
+        """Send the same input to every tab in the broadcast group."""
+        self._mirroring = True  # feed_child is not typing, but be safe
+        try:
+            for terminal in self.broadcast_group:
+                self._wake_terminal(terminal)  # Output must land after the restored contents
+                self._resume_output(terminal)
+                terminal.feed_child(data)
+        finally:
+            self._mirroring = False
+    
+    def _broadcast_command(self, command: str) -> BroadcastRun:
+        """Run a command in every tab of the broadcast group at once."""
+        members = list(self.broadcast_group)
+        broadcast = BroadcastRun(command, members)
+        for terminal, run in broadcast.runs.items():
+            self._remember_command(terminal, command)
+            state = self.shell_states.get(terminal)
+            if state is not None and state.integrated:
+                state.submit(run)
+            page = self.tab_view.get_page(terminal.get_parent())
+            if page:
+                page.set_needs_attention(False)
+        broadcast.add_tab_done_callback(self._on_broadcast_tab_finished)
+        self._broadcast_bytes(command.encode() + b"\n")
+        logger.info(f"Broadcast command to {len(members)} tab(s): {command}")
+        return broadcast
+    
+    def _on_broadcast_tab_finished(self, terminal: Vte.Terminal, run: TerminalRun):
+        """Report one tab's result of a broadcast command."""
+        logger.info(f"Broadcast command finished in tab with exit status {run.exit_status}: {run.command}")
+        parent = terminal.get_parent()
+        page = self.tab_view.get_page(parent) if parent else None
+        if page:
+            # Flag failed tabs in the tab bar
+            page.set_needs_attention(run.exit_status not in (0, None))
+    
+    def _is_tab_idle(self, terminal: Vte.Terminal) -> bool:
+        """Whether a tab's shell is waiting at its prompt."""
+        state = self.shell_states.get(terminal)
+        if state is not None and state.integrated:
+            return state.idle
+        # Without shell integration: idle when the shell is the foreground process group
+        pid = self.terminal_pids.get(terminal)
+        pty = self._get_pty(terminal)
+        if not pid or pty is None:
+            return False
+        try:
+            return os.tcgetpgrp(pty.get_fd()) == os.getpgid(pid)
+        except OSError:
+            return False
+    
+    def _run_in_tab(self, terminal: Vte.Terminal, command: str, run: TerminalRun = None):
+        """Run a command in an existing idle tab and show it."""
+        page = self.tab_view.get_page(terminal.get_parent())
+        self.tab_view.set_selected_page(page)
+        # Discard anything half-typed at the prompt (Ctrl+U)
+        terminal.feed_child(b"\x15")
+        self._feed_command(terminal, command, run)
+        logger.info("Reused idle terminal tab")
+    
+    def _close_terminal_tab(self, terminal: Vte.Terminal):
+        """Close a tab, hanging up its shell and foreground job."""
+        pid = self.terminal_pids.pop(terminal, None)
+        if pid:
+            pty = self._get_pty(terminal)
+            try:
+                if pty is not None:
+                    os.killpg(os.tcgetpgrp(pty.get_fd()), signal.SIGHUP)
+                os.killpg(os.getpgid(pid), signal.SIGHUP)
+            except OSError as e:
+                logger.debug(f"Could not hang up shell {pid}: {e}")
+        if terminal in self.terminals:
+            self.terminals.remove(terminal)
+        self._forget_terminal(terminal)
+        page = self.tab_view.get_page(terminal.get_parent())
+        if page:
+            self.tab_view.close_page(page)
+    
+    def set_tab_reuse_policy(self, policy: str):
+        """Change how card runs pick their terminal tab."""
+        self.tab_reuse.policy = policy
     
     def type_command(self, command: str, create_new_tab: bool = False):
         """
@@ -359,6 +887,11 @@ class TerminalView(Adw.Bin):
             command: Command to type
             create_new_tab: If True, create a new tab. If False, use current tab (creates one if none exists).
         """
+        if self.broadcast_group and not create_new_tab:
+            self._broadcast_bytes(command.encode())
+            logger.info(f"Typed command in {len(self.broadcast_group)} broadcast tab(s) (not executed): {command}")
+            return
+        
         # Check if there's a current tab
         has_current_tab = self.tab_view.get_selected_page() is not None
         
@@ -380,6 +913,7 @@ class TerminalView(Adw.Bin):
                 terminal = child.get_first_child()
                 if isinstance(terminal, Vte.Terminal):
                     # Type the command without newline (user can edit/execute)
+                    self._resume_output(terminal)
                     terminal.feed_child(command.encode())
                     # Give focus to the terminal so user can interact with it
                     terminal.grab_focus()
@@ -387,8 +921,589 @@ class TerminalView(Adw.Bin):
     
     def _on_tab_selected(self, tab_view, param):
         """Handle tab selection change - focus the terminal in the selected tab."""
+        if self.get_mapped():
+            self._materialize_tab(tab_view.get_selected_page())
+        terminal = self._get_page_terminal(tab_view.get_selected_page())
+        if terminal is not None:
+            self.memory_budget.touch(terminal)
+            self._wake_terminal(terminal)
+            self._resume_output(terminal)
+        self.broadcast_button.set_active(terminal in self.broadcast_group)
         GLib.idle_add(self.focus_current_terminal)
     
+    def _get_page_terminal(self, page):
+        """Get the terminal shown in a tab page, if any."""
+        if page is None:
+            return None
+        child = page.get_child()
+        # Terminal is wrapped in a box
+        if isinstance(child, Gtk.Box) and child.get_first_child():
+            terminal = child.get_first_child()
+            if isinstance(terminal, Vte.Terminal):
+                return terminal
+        return None
+    
+    def _check_memory_budget(self) -> bool:
+        """Hibernate least recently used idle tabs while over the memory budget."""
+        for terminal in self.terminals:
+            if terminal not in self._hibernated:
+                lines = int(terminal.get_vadjustment().get_upper())
+                self.memory_budget.set_cost(terminal, estimate_cost(lines, terminal.get_column_count()))
+        for terminal in self.memory_budget.select_victims(self._can_hibernate):
+            if terminal not in self._hibernating:
+                self._hibernate_terminal(terminal)
+        return True  # Keep checking
+    
+    def _can_hibernate(self, terminal: Vte.Terminal) -> bool:
+        """Whether a tab's contents may be moved to disk."""
+        if terminal in self._hibernated or terminal not in self.terminals:
+            return False
+        if terminal is self._get_page_terminal(self.tab_view.get_selected_page()):
+            return False
+        # Only shells reporting an idle prompt: nothing is writing to the tab
+        state = self.shell_states.get(terminal)
+        return state is not None and state.idle
+    
+    def _hibernate_terminal(self, terminal: Vte.Terminal):
+        """
+        Write a tab's contents to the cache dir and drop its scrollback.
+        
+        The contents are read in idle-time slices and compressed by the
+        hibernation writer thread; the scrollback is only dropped once they
+        are on disk and the tab has stayed idle and untouched meanwhile.
+        """
+        self._hibernating[terminal] = None
+        
+        def on_read(data: Optional[bytes]):
+            if data is None or not self._can_hibernate(terminal):
+                self._hibernating.pop(terminal, None)  # Closed or used while reading
+                return
+            path = self.config.get_cache_dir() / "hibernated" / f"tab-{os.getpid()}-{next(self._hibernation_ids)}.txt.gz"
+            self._hibernating[terminal] = path
+            marker = self._scrollback_marker(terminal)
+            future = self._hibernation_writer.submit(save_contents, path, data)
+            future.add_done_callback(
+                lambda future: GLib.idle_add(self._finish_hibernation, terminal, path, marker, future)
+            )
+        
+        self._read_scrollback(terminal, on_read, lambda: self._can_hibernate(terminal))
+    
+    def _scrollback_marker(self, terminal: Vte.Terminal) -> tuple:
+        """Cursor position and buffer size; they change whenever output arrives."""
+        return terminal.get_cursor_position(), int(terminal.get_vadjustment().get_upper())
+    
+    def _finish_hibernation(self, terminal: Vte.Terminal, path: Path, marker: tuple, future: Future) -> bool:
+        """Drop a tab's scrollback once its contents are written (main thread)."""
+        self._hibernating.pop(terminal, None)
+        error = future.exception()
+        if error is not None:
+            logger.warning(f"Failed to hibernate terminal tab: {error}")
+            path.unlink(missing_ok=True)
+            return False
+        if not self._can_hibernate(terminal) or self._scrollback_marker(terminal) != marker:
+            path.unlink(missing_ok=True)  # Closed, selected or written to since it was read
+            return False
+        
+        column, _row = terminal.get_cursor_position()
+        self._hibernated[terminal] = HibernatedTab(path, column)
+        # Setting the limit to 0 frees the history; restore it for new output
+        scrollback = terminal.get_scrollback_lines()
+        terminal.set_scrollback_lines(0)
+        terminal.set_scrollback_lines(scrollback)
+        self.memory_budget.set_cost(
+            terminal, estimate_cost(terminal.get_row_count(), terminal.get_column_count())
+        )
+        logger.info(f"Hibernated idle terminal tab to {path}")
+        return False
+    
+    def _get_contents(self, terminal: Vte.Terminal) -> bytes:
+        """Get a terminal's scrollback and screen as plain text."""
+        entry = self._hibernated.get(terminal)
+        if entry is not None:
+            return load_contents(entry.path)
+        stream = Gio.MemoryOutputStream.new_resizable()
+        terminal.write_contents_sync(stream, Vte.WriteFlags.DEFAULT, None)
+        stream.close(None)
+        return stream.steal_as_bytes().get_data()
+    
+    def _wake_terminal(self, terminal: Vte.Terminal):
+        """Put a hibernated tab's contents back into its terminal."""
+        entry = self._hibernated.pop(terminal, None)
+        if entry is None:
+            return
+        recording = self._recordings.get(terminal)
+        if recording is not None:
+            recording.skip_to_cursor = True  # Already recorded the first time around
+        try:
+            terminal.feed(restore_sequence(load_contents(entry.path), entry.cursor_column))
+            logger.debug(f"Restored hibernated terminal tab from {entry.path}")
+        except (OSError, EOFError) as e:
+            logger.warning(f"Failed to restore hibernated terminal tab: {e}")
+        finally:
+            entry.path.unlink(missing_ok=True)
+    
+    def _start_recording(self, terminal: Vte.Terminal, title: str):
+        """Record a tab's output to disk."""
+        if self.recorder is None:
+            self.recorder = SessionRecorder(
+                self.config.get_state_dir() / "sessions",
+                self.config.get("recording.max_segment_mb", 16) * 1024 * 1024,
+                self.config.get("recording.max_total_mb", 512) * 1024 * 1024,
+            )
+            self.recorder.listeners.append(self._get_output_index())
+        _column, row = terminal.get_cursor_position()
+        self._recordings[terminal] = TabRecording(self.recorder.open_session(title), next_row=row)
+        terminal.connect("contents-changed", self._on_contents_changed)
+    
+    def _on_contents_changed(self, terminal: Vte.Terminal):
+        """Schedule collecting new output; fires for every update, so only arm a timer."""
+        recording = self._recordings.get(terminal)
+        if recording is not None and recording.flush_id is None:
+            recording.flush_id = GLib.timeout_add(RECORDING_CAPTURE_MS, self._capture_output, terminal)
+    
+    def _capture_output(self, terminal: Vte.Terminal, final: bool = False) -> bool:
+        """
+        Hand the lines completed since the last capture to the recorder.
+        
+        Args:
+            terminal: Recorded terminal
+            final: Also record the cursor's line (the tab is going away)
+        """
+        recording = self._recordings.get(terminal)
+        if recording is None:
+            return False
+        recording.flush_id = None
+        _column, row = terminal.get_cursor_position()
+        end = row + 1 if final else row  # The cursor's line may still change
+        if recording.skip_to_cursor:
+            recording.skip_to_cursor = False
+            recording.next_row = end
+            return False
+        # Rows that already left the scrollback are lost
+        start = max(recording.next_row, int(terminal.get_vadjustment().get_lower()))
+        if end > start:
+            text, _length = terminal.get_text_range_format(Vte.Format.TEXT, start, 0, end - 1, -1)
+            if text:
+                self.recorder.write(recording.session_id, text if text.endswith("\n") else text + "\n", start)
+        recording.next_row = max(recording.next_row, end)
+        return False
+    
+    def _stop_recording(self, terminal: Vte.Terminal):
+        """Record a tab's remaining output and finish its session."""
+        recording = self._recordings.get(terminal)
+        if recording is None:
+            return
+        if recording.flush_id is not None:
+            GLib.source_remove(recording.flush_id)
+        self._capture_output(terminal, final=True)
+        del self._recordings[terminal]
+        terminal.disconnect_by_func(self._on_contents_changed)
+        self.recorder.close_session(recording.session_id)
+    
+    def _get_output_index(self) -> OutputIndex:
+        """Open the index of recorded output."""
+        if self.output_index is None:
+            self.output_index = OutputIndex(self.config.get_state_dir() / "sessions" / "index.db")
+        return self.output_index
+    
+    def search_output(self, query: str, limit: int = 100) -> list[SearchHit]:
+        """
+        Search recorded output of open tabs and past sessions.
+        
+        Args:
+            query: Words that must all appear on a line
+            limit: Maximum number of hits
+        
+        Returns:
+            Matching lines, newest session first
+        """
+        try:
+            return self._get_output_index().search(query, limit)
+        except Exception as e:
+            logger.error(f"Output search failed: {e}", exc_info=True)
+            return []
+    
+    def _on_output_search_activate(self, entry):
+        """Show matching lines in a popover."""
+        query = entry.get_text().strip()
+        while (row := self.search_results.get_first_child()) is not None:
+            self.search_results.remove(row)
+        if not query:
+            self.search_popover.popdown()
+            return
+        hits = self.search_output(query)
+        for hit in hits:
+            started = time.strftime("%Y-%m-%d %H:%M", time.localtime(hit.started_at))
+            label = Gtk.Label(label=f"{hit.title} \u00b7 {started}: {hit.text.strip()[:120]}")
+            label.set_xalign(0)
+            label.set_ellipsize(Pango.EllipsizeMode.END)
+            label.set_max_width_chars(80)
+            row = Gtk.ListBoxRow()
+            row.set_child(label)
+            row.hit = hit
+            self.search_results.append(row)
+        if not hits:
+            self.search_results.append(Gtk.Label(label="No matches in recorded output"))
+        self.search_popover.popup()
+    
+    def _on_search_result_activated(self, listbox, row):
+        """Jump to the line of a search result."""
+        hit = getattr(row, "hit", None)
+        if hit is not None:
+            self.search_popover.popdown()
+            self.show_search_hit(hit, self.output_search_entry.get_text().strip())
+    
+    def show_search_hit(self, hit: SearchHit, query: str = ""):
+        """
+        Show a search hit: scroll its tab to the line, or open the recording.
+        
+        Args:
+            hit: Result of search_output()
+            query: Text to highlight
+        """
+        terminal = next(
+            (terminal for terminal, recording in self._recordings.items() if recording.session_id == hit.session_id),
+            None,
+        )
+        if terminal is not None and hit.row is not None:
+            # Selecting the tab wakes it if hibernated; find the line once the contents are back
+            self.tab_view.set_selected_page(self.tab_view.get_page(terminal.get_parent()))
+            GLib.idle_add(self._show_hit_in_tab, terminal, hit, query)
+            return
+        self._show_recorded_hit(hit, query)
+    
+    def _show_hit_in_tab(self, terminal: Vte.Terminal, hit: SearchHit, query: str) -> bool:
+        """Scroll an open tab to a hit's line, checking the recorded row still holds it."""
+        lower = int(terminal.get_vadjustment().get_lower())
+        _column, cursor_row = terminal.get_cursor_position()
+        text, _length = terminal.get_text_range_format(Vte.Format.TEXT, lower, 0, cursor_row, -1)
+        row = locate_row((text or "").split("\n"), lower, hit.text, hit.row)
+        if row is None:
+            self._show_recorded_hit(hit, query)
+        else:
+            self._scroll_to_row(terminal, row, query)
+        return False  # Don't repeat
+    
+    def _show_recorded_hit(self, hit: SearchHit, query: str):
+        """Open a hit's recording read-only (the tab is gone or the line left its scrollback)."""
+        try:
+            text = read_session(self.config.get_state_dir() / "sessions" / hit.session_id)
+        except OSError as e:
+            logger.error(f"Failed to read recorded session {hit.session_id}: {e}")
+            return
+        viewer = self._create_terminal()
+        viewer.set_scrollback_lines(text.count("\n") + 100)
+        viewer.set_input_enabled(False)
+        viewer.feed(text.replace("\n", "\r\n").encode())
+        self._add_terminal_page(viewer, title=f"{hit.title} (recorded)", record=False)
+        GLib.idle_add(self._scroll_to_row, viewer, hit.line_no, query)
+    
+    def _scroll_to_row(self, terminal: Vte.Terminal, row: int, query: str = "") -> bool:
+        """Scroll a terminal so row is at the top and highlight query."""
+        terminal.get_vadjustment().set_value(row)
+        if query:
+            try:
+                # Any of the words, as search matches lines containing all of them
+                pattern = "|".join(GLib.Regex.escape_string(word, -1) for word in query.split())
+                regex = Vte.Regex.new_for_search(pattern, -1, PCRE2_CASELESS | PCRE2_MULTILINE)
+                terminal.search_set_regex(regex, 0)
+            except GLib.Error as e:
+                logger.debug(f"Could not highlight search match: {e}")
+        terminal.grab_focus()
+        return False
+    
+    def _remember_command(self, terminal: Vte.Terminal, command: str):
+        """Add a command to a tab's snapshot."""
+        snapshot = self._snapshots.get(terminal)
+        if snapshot is not None:
+            snapshot.add_command(command)
+            self._dirty_snapshots.add(terminal)
+    
+    def _get_tab_cwd(self, terminal: Vte.Terminal):
+        """Get a tab's working directory from shell integration or /proc."""
+        state = self.shell_states.get(terminal)
+        if state is not None and state.cwd:
+            return state.cwd
+        pid = self.terminal_pids.get(terminal)
+        if pid:
+            try:
+                return os.readlink(f"/proc/{pid}/cwd")
+            except OSError:
+                pass
+        return None
+    
+    def _persist_tabs(self, final: bool = False) -> bool:
+        """
+        Snapshot tabs that changed since the last run.
+        
+        Args:
+            final: Wait for scrollback writes to finish (shutdown)
+        """
+        page_ids = []
+        selected = None
+        for i in range(self.tab_view.get_n_pages()):
+            page = self.tab_view.get_nth_page(i)
+            terminal = self._get_page_terminal(page)
+            snapshot = self._snapshots.get(terminal) if terminal is not None else self._pending_restores.get(page)
+            if snapshot is None:
+                continue
+            page_ids.append(snapshot.tab_id)
+            if page == self.tab_view.get_selected_page():
+                selected = snapshot.tab_id
+            if terminal is None:
+                continue  # Not viewed since restore, nothing changed
+            
+            cwd = self._get_tab_cwd(terminal)
+            if cwd and cwd != snapshot.cwd:
+                snapshot.cwd = cwd
+                self._dirty_snapshots.add(terminal)
+            if page.get_title() != snapshot.title:
+                snapshot.title = page.get_title()
+                self._dirty_snapshots.add(terminal)
+            if terminal in self._dirty_snapshots:
+                self.tab_store.save_snapshot(snapshot)
+            if terminal in self._dirty_scrollback:
+                try:
+                    if final:
+                        self.tab_store.save_scrollback(snapshot.tab_id, self._get_contents(terminal), wait=True)
+                    else:
+                        self._snapshot_scrollback(terminal, snapshot.tab_id)
+                except Exception as e:
+                    logger.warning(f"Failed to snapshot terminal contents: {e}")
+        self._dirty_snapshots.clear()
+        self._dirty_scrollback.clear()
+        self.tab_store.save_order(page_ids, selected)
+        return True  # Keep snapshotting
+    
+    def _snapshot_scrollback(self, terminal: Vte.Terminal, tab_id: str):
+        """
+        Save a tab's scrollback without stalling the main loop.
+        
+        Hibernated contents are read by the store's writer thread. A live
+        terminal is read with _read_scrollback() and then handed to the
+        writer thread for compressing and writing.
+        """
+        entry = self._hibernated.get(terminal)
+        if entry is not None:
+            path = entry.path
+            self.tab_store.save_scrollback(tab_id, lambda: load_contents(path))
+            return
+        if terminal in self._capturing:
+            return  # Still reading the previous snapshot; the next one picks up the changes
+        self._capturing.add(terminal)
+        
+        def on_read(data: Optional[bytes]):
+            self._capturing.discard(terminal)
+            if data is not None:
+                self.tab_store.save_scrollback(tab_id, data)
+        
+        self._read_scrollback(terminal, on_read, lambda: terminal not in self._hibernated)
+    
+    def _read_scrollback(self, terminal: Vte.Terminal, on_read: Callable[[Optional[bytes]], None],
+                         keep_reading: Callable[[], bool]):
+        """
+        Read a terminal's scrollback and screen as plain text without stalling the main loop.
+        
+        A terminal can only be read on the main thread, so its rows are
+        collected a slice at a time from low-priority idle callbacks.
+        
+        Args:
+            terminal: Terminal to read
+            on_read: Called with the contents, or None if reading was given up
+            keep_reading: Checked before each slice; reading is given up once it returns False
+        """
+        adjustment = terminal.get_vadjustment()
+        end = int(adjustment.get_upper())
+        parts = []
+        next_row = int(adjustment.get_lower())
+        
+        def read_slice():
+            nonlocal next_row
+            if terminal not in self.terminals or self._shutdown is not None or not keep_reading():
+                on_read(None)  # Closed, shutting down (the final snapshot reads it) or no longer wanted
+                return False
+            start = max(next_row, int(terminal.get_vadjustment().get_lower()))  # Rows may have left the scrollback
+            stop = min(start + SNAPSHOT_CHUNK_ROWS, end)
+            if stop > start:
+                text, _length = terminal.get_text_range_format(Vte.Format.TEXT, start, 0, stop - 1, -1)
+                if text:
+                    parts.append(text if text.endswith("\n") else text + "\n")
+            next_row = stop
+            if next_row < end:
+                return True  # Next slice
+            on_read("".join(parts).encode("utf-8", "replace"))
+            return False
+        
+        GLib.idle_add(read_slice, priority=GLib.PRIORITY_LOW)
+    
+    def _restore_tabs(self):
+        """Add tab headers for the tabs of the last session; shells start when viewed."""
+        snapshots, selected = self.tab_store.load()
+        self.tab_store.prune({snapshot.tab_id for snapshot in snapshots})
+        selected_page = None
+        for snapshot in snapshots:
+            box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+            page = self.tab_view.append(box)
+            page.set_title(snapshot.title)
+            page.set_icon(Gio.ThemedIcon.new("terminal-symbolic"))
+            if snapshot.cwd:
+                page.set_tooltip(snapshot.cwd)
+            self._pending_restores[page] = snapshot
+            if snapshot.tab_id == selected:
+                selected_page = page
+        if selected_page is not None:
+            self.tab_view.set_selected_page(selected_page)
+        if snapshots:
+            logger.info(f"Restored {len(snapshots)} terminal tab(s) from the last session")
+    
+    def _materialize_tab(self, page):
+        """Start the shell and load the scrollback of a restored tab."""
+        snapshot = self._pending_restores.pop(page, None) if page is not None else None
+        if snapshot is None:
+            return
+        profile = self.profiles.get(snapshot.profile)
+        terminal = self._create_terminal(profile)
+        data = self.tab_store.load_scrollback(snapshot.tab_id).rstrip(b" \n")
+        if data:
+            # Previous output, then the new shell's prompt below a marker
+            terminal.feed(data.replace(b"\n", b"\r\n") + b"\r\n\x1b[2m--- restored ---\x1b[0m\r\n")
+        cwd = snapshot.cwd if snapshot.cwd and os.path.isdir(snapshot.cwd) else None
+        self._spawn_shell(terminal, working_directory=cwd, profile=profile)
+        page.get_child().append(terminal)
+        self._register_terminal(terminal, snapshot.title, snapshot=snapshot)
+        logger.debug(f"Materialized restored terminal tab {snapshot.tab_id}")
+    
+    def _sample_resources(self) -> bool:
+        """Sample the processes of all tabs and show their usage."""
+        if not self.get_mapped():
+            return True  # Nobody is looking
+        shells = {terminal: pid for terminal, pid in self.terminal_pids.items() if terminal in self.terminals}
+        try:
+            self.tab_usage = self.resource_monitor.sample(shells)
+        except Exception as e:
+            logger.warning(f"Failed to sample tab resource usage: {e}")
+            return True
+        for terminal, usage in self.tab_usage.items():
+            parent = terminal.get_parent()
+            page = self.tab_view.get_page(parent) if parent else None
+            if page:
+                page.set_tooltip(f"{page.get_title()}\n{usage.summary()}")
+        if self.monitor_revealer.get_reveal_child():
+            self._update_monitor_list()
+        return True  # Keep sampling
+    
+    def _update_monitor_list(self):
+        """List tabs by CPU usage, busiest first."""
+        while (row := self.monitor_list.get_first_child()) is not None:
+            self.monitor_list.remove(row)
+        ranked = sorted(self.tab_usage.items(), key=lambda item: item[1].cpu_percent, reverse=True)
+        for terminal, usage in ranked:
+            parent = terminal.get_parent()
+            page = self.tab_view.get_page(parent) if parent else None
+            if page is None:
+                continue
+            process = f"{usage.top_command} \u00b7 " if usage.top_command else ""
+            row = Adw.ActionRow(
+                title=GLib.markup_escape_text(page.get_title()),
+                subtitle=GLib.markup_escape_text(
+                    f"{process}{usage.process_count} process(es) \u00b7 "
+                    f"I/O {format_bytes(usage.read_rate)}/s / {format_bytes(usage.write_rate)}/s"
+                ),
+            )
+            row.set_activatable(True)
+            row.add_suffix(Gtk.Label(label=f"{usage.cpu_percent:.0f}%\n{format_bytes(usage.rss_bytes)}"))
+            row.terminal = terminal
+            self.monitor_list.append(row)
+        if not ranked:
+            self.monitor_list.append(Gtk.Label(label="No running tabs"))
+    
+    def _on_monitor_toggled(self, button):
+        """Show or hide the resource usage sidebar."""
+        self.monitor_revealer.set_reveal_child(button.get_active())
+        if button.get_active():
+            self._update_monitor_list()
+    
+    def _on_monitor_row_activated(self, listbox, row):
+        """Switch to the tab of a sidebar row."""
+        terminal = getattr(row, "terminal", None)
+        if terminal is not None and terminal.get_parent():
+            self.tab_view.set_selected_page(self.tab_view.get_page(terminal.get_parent()))
+    
+    def _get_pty(self, terminal: Vte.Terminal):
+        """Get a terminal's pty, also while its output is paused."""
+        return self._paused_ptys.get(terminal) or terminal.get_pty()
+    
+    def _govern_output(self) -> bool:
+        """Let the jobs of flooded background tabs run only part of the time."""
+        foreground = None
+        if self.get_mapped():
+            foreground = self._get_page_terminal(self.tab_view.get_selected_page())
+        for terminal in self.terminals:
+            if terminal not in self.terminal_pids or terminal in self._hibernated:
+                continue
+            _column, row = terminal.get_cursor_position()
+            if self.output_governor.update(terminal, row, terminal is foreground):
+                self._resume_output(terminal, reset=False)
+            else:
+                self._pause_output(terminal)
+        return True  # Keep governing
+    
+    def _pause_output(self, terminal: Vte.Terminal):
+        """
+        Detach a terminal from its pty, pausing its job.
+        
+        The job blocks once the pty buffer is full. VTE discards output it has
+        read but not parsed yet, so a few bytes can be lost.
+        """
+        if terminal in self._paused_ptys:
+            return
+        pty = terminal.get_pty()
+        if pty is None:
+            return
+        self._paused_ptys[terminal] = pty
+        terminal.set_pty(None)
+    
+    def _resume_output(self, terminal: Vte.Terminal, reset: bool = True):
+        """Reattach a paused terminal to its pty."""
+        if terminal is None:
+            return
+        if reset:
+            # Input or attention is coming: let the tab read freely until it floods again
+            self.output_governor.reset(terminal)
+        pty = self._paused_ptys.pop(terminal, None)
+        if pty is not None:
+            terminal.set_pty(pty)
+    
+    def set_output_throttling(self, enabled: bool):
+        """Enable or disable pausing the jobs of background tabs flooded with output."""
+        if enabled and self._throttle_id is None:
+            # High priority so the check still runs while terminals are busy parsing output
+            self._throttle_id = GLib.timeout_add(
+                THROTTLE_TICK_MS, self._govern_output, priority=GLib.PRIORITY_HIGH
+            )
+        elif not enabled and self._throttle_id is not None:
+            GLib.source_remove(self._throttle_id)
+            self._throttle_id = None
+            for terminal in list(self._paused_ptys):
+                self._resume_output(terminal)
+    
+    def _on_config_changed(self, changes: dict):
+        """Apply changed terminal settings to the running view."""
+        if any(key.startswith(PROFILE_KEYS) for key in changes):
+            self.reload_profiles()
+        if "terminal.memory_budget_mb" in changes:
+            self.set_memory_budget(changes["terminal.memory_budget_mb"])
+        if "terminal.tab_reuse_policy" in changes:
+            self.set_tab_reuse_policy(changes["terminal.tab_reuse_policy"])
+        if "terminal.warm_pool_size" in changes:
+            self.set_warm_pool_size(changes["terminal.warm_pool_size"])
+        if "terminal.throttle_background" in changes:
+            self.set_output_throttling(changes["terminal.throttle_background"])
+    
+    def set_memory_budget(self, budget_mb: int):
+        """Change the scrollback memory budget (0 disables hibernation)."""
+        self.memory_budget.budget_bytes = budget_mb * 1024 * 1024
+    
     def _on_key_pressed(self, controller, keyval, keycode, state):
         """Handle keyboard input - intercept Ctrl+Shift+E to toggle views."""
         # Only handle keys when terminal view is visible
@@ -482,96 +1597,115 @@ class TerminalView(Adw.Bin):
                     return False  # Don't repeat
         return False  # Don't repeat
     
+    def set_warm_pool_size(self, size: int):
+        """Change how many pre-spawned shells are kept ready."""
+        self._terminate_pooled(self.shell_pool.resize(size))
+    
+    def _terminate_pooled(self, terminals: list[Vte.Terminal]):
+        """Kill the shells of terminals removed from the warm pool."""
+        for terminal in terminals:
+            # Marker FIFO, its watch and shell state go the way of a closed tab's
+            self._forget_terminal(terminal)
+            pid = self.terminal_pids.pop(terminal, None)
+            if not pid:
+                continue
+            # Pooled shells have never run a command, nothing to flush
+            try:
+                os.killpg(os.getpgid(pid), signal.SIGKILL)
+                logger.debug(f"Killed pooled shell {pid}")
+            except (ProcessLookupError, OSError):
+                logger.debug(f"Pooled shell {pid} already terminated")
+    
+    def shutdown_shells(self, on_done):
+        """
+        Hang up all shells without blocking the main loop.
+        
+        Tabs are snapshotted first, while the shells still run.
+        
+        Args:
+            on_done: Called without arguments once all shells are gone
+        """
+        if self._shutdown is not None:
+            return
+        self._prepare_shutdown()
+        try:
+            self._shutdown.start(lambda result: on_done())
+        except Exception as e:
+            logger.error(f"Error hanging up terminal shells: {e}", exc_info=True)
+            on_done()
+    
+    def _prepare_shutdown(self):
+        """Snapshot tabs, kill pooled shells and collect the shells to hang up."""
+        # Snapshot tabs while their shells are still running (for /proc cwd)
+        if self.tab_store is not None:
+            GLib.source_remove(self._persist_id)
+            try:
+                self._persist_tabs(final=True)
+            except Exception as e:
+                logger.error(f"Failed to save terminal tabs: {e}", exc_info=True)
+        
+        # Shells still waiting in the warm pool have no tab
+        self._terminate_pooled(self.shell_pool.drain())
+        
+        # Hang up all shells at once and wait for them together, so history is
+        # saved and closing takes at most the grace period however many tabs are open
+        self._shutdown = ShutdownCoordinator(self.config.get("terminal.shutdown_grace_seconds", 2))
+        for terminal in self.terminals:
+            pid = self.terminal_pids.pop(terminal, None)
+            if not pid:
+                continue
+            foreground = None
+            try:
+                pty = self._get_pty(terminal)
+                if pty is not None:
+                    foreground = os.tcgetpgrp(pty.get_fd())
+            except OSError:
+                pass
+            self._shutdown.add(pid, foreground)
+        logger.info(f"Closing {len(self.terminals)} terminal tab(s)")
+    
     def cleanup(self):
         """Clean up resources."""
         logger.info("Cleaning up terminal view")
         
-        # Close all terminal tabs
+        self.config.unsubscribe(self._config_subscription)
+        GLib.source_remove(self._memory_check_id)
+        GLib.source_remove(self._monitor_id)
+        self.set_output_throttling(False)
+        
+        # Finish hanging up the shells; this blocks (up to the grace period) only if
+        # the app quit without closing the window first, when the main loop has stopped
+        if self._shutdown is None:
+            self._prepare_shutdown()
         try:
-            # Get all pages and close them
-            pages = []
-            n_pages = self.tab_view.get_n_pages()
-            logger.info(f"Closing {n_pages} terminal tab(s)")
-            
-            for i in range(n_pages):
-                page = self.tab_view.get_nth_page(i)
-                if page:
-                    pages.append(page)
-            
-            for idx, page in enumerate(pages):
-                try:
-                    child = page.get_child()
-                    if isinstance(child, Gtk.Box) and child.get_first_child():
-                        terminal = child.get_first_child()
-                        if isinstance(terminal, Vte.Terminal):
-                            logger.info(f"Closing terminal {idx + 1}/{len(pages)}")
-                            
-                            # Get child PID from stored dict or try to get it from PTY
-                            child_pid = None
-                            
-                            # First, try to get from stored PIDs
-                            if terminal in self.terminal_pids:
-                                child_pid = self.terminal_pids[terminal]
-                                logger.info(f"Found stored PID {child_pid} for terminal {idx + 1}")
-                            else:
-                                logger.debug(f"Terminal {idx + 1} not found in stored PIDs (total stored: {len(self.terminal_pids)})")
-                            
-                            # Note: We can't get PID from PTY object directly in VTE 3.91
-                            # The PID must be stored when the terminal spawns via the callback
-                            
-                            # Kill the process if we have a PID
-                            if child_pid and child_pid > 0:
-                                logger.info(f"Terminating child process {child_pid} for terminal {idx + 1}")
-                                
-                                # Try to get the process group ID and kill the entire group
-                                # This ensures all child processes are terminated
-                                try:
-                                    pgid = os.getpgid(child_pid)
-                                    logger.info(f"Process group ID: {pgid} for PID {child_pid}")
-                                    
-                                    # Kill the entire process group with SIGTERM first
-                                    try:
-                                        os.killpg(pgid, signal.SIGTERM)
-                                        logger.info(f"Sent SIGTERM to process group {pgid}")
-                                    except ProcessLookupError:
-                                        logger.info(f"Process group {pgid} already terminated")
-                                    except Exception as e:
-                                        logger.warning(f"Error sending SIGTERM to process group {pgid}: {e}")
-                                    
-                                    # Also send SIGKILL to the process group (force kill)
-                                    try:
-                                        os.killpg(pgid, signal.SIGKILL)
-                                        logger.info(f"Sent SIGKILL to process group {pgid}")
-                                    except ProcessLookupError:
-                                        logger.info(f"Process group {pgid} already terminated")
-                                    except Exception as e:
-                                        logger.warning(f"Error sending SIGKILL to process group {pgid}: {e}")
-                                except (ProcessLookupError, OSError):
-                                    # Process doesn't exist or we can't get PGID, try killing just the PID
-                                    logger.debug(f"Could not get process group, killing PID {child_pid} directly")
-                                    try:
-                                        os.kill(child_pid, signal.SIGTERM)
-                                        os.kill(child_pid, signal.SIGKILL)
-                                        logger.info(f"Killed process {child_pid} directly")
-                                    except ProcessLookupError:
-                                        logger.info(f"Process {child_pid} already terminated")
-                                    except Exception as e:
-                                        logger.warning(f"Error killing process {child_pid}: {e}")
-                            else:
-                                logger.warning(f"Could not get child PID for terminal {idx + 1}")
-                            
-                            # Note: In VTE, we don't need to explicitly close the PTY.
-                            # Killing the child process will cause the PTY to close automatically.
-                            # The terminal will clean up when the process is terminated.
-                            
-                            # Remove from stored PIDs
-                            if terminal in self.terminal_pids:
-                                del self.terminal_pids[terminal]
-                except Exception as e:
-                    logger.warning(f"Error closing terminal page {idx + 1}: {e}")
+            self._shutdown.run()
         except Exception as e:
             logger.error(f"Error during terminal cleanup: {e}", exc_info=True)
         
+        # Remove shell integration FIFOs
+        for terminal in list(self._event_channels):
+            self._close_event_channel(terminal)
+        
+        # Write out the rest of recorded output
+        for terminal in list(self._recordings):
+            self._stop_recording(terminal)
+        if self.recorder is not None:
+            self.recorder.stop()
+        if self.output_index is not None:
+            self.output_index.close()
+        if self.tab_store is not None:
+            self.tab_store.close()
+        
+        # Hibernated contents are not restored across restarts
+        self._hibernation_writer.shutdown(wait=True)
+        for path in self._hibernating.values():
+            if path is not None:
+                path.unlink(missing_ok=True)
+        self._hibernating.clear()
+        for entry in self._hibernated.values():
+            entry.path.unlink(missing_ok=True)
+        self._hibernated.clear()
+        
         # Clear the terminals list
         self.terminals.clear()
         logger.info("Terminal view cleanup complete")
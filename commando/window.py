@@ -14,6 +14,7 @@ from commando.config import Config
 from commando.views.main_view import MainView
 from commando.views.terminal_view import TerminalView
 from commando.views.web_view import WebView
+from commando.views.log_view import LogView
 from commando.widgets.speed_dial import SpeedDial
 
 logger = get_logger(__name__)
@@ -31,6 +32,7 @@ class CommandoWindow(Adw.ApplicationWindow):
         self.set_default_size(1200, 800)
         
         # Connect close request to ensure proper cleanup and quit
+        self._closing = False  # Shells are being hung up
         self.connect("close-request", self._on_close_request)
         
         # Connect to window focus events to handle focus properly when returning from external apps
@@ -52,6 +54,13 @@ class CommandoWindow(Adw.ApplicationWindow):
         self.speed_dial = SpeedDial(None)  # Will be set after main_view is created
         self.main_box.append(self.speed_dial)
         
+        # Log panel below the views (appended after the stack), hidden until toggled
+        self.log_view = LogView()
+        self.log_view.set_size_request(-1, 240)
+        self.log_revealer = Gtk.Revealer()
+        self.log_revealer.set_transition_type(Gtk.RevealerTransitionType.SLIDE_UP)
+        self.log_revealer.set_child(self.log_view)
+        
         # Set main box as content
         self.set_content(self.main_box)
         
@@ -87,6 +96,7 @@ class CommandoWindow(Adw.ApplicationWindow):
         self.stack.add_titled(self.main_view, "main", "Commands")
         self.stack.add_titled(self.terminal_view, "terminal", "Terminal")
         self.stack.add_titled(self.web_view, "web", "Web")
+        self.main_box.append(self.log_revealer)
         
         # Set main view as default
         self.stack.set_visible_child_name("main")
@@ -136,6 +146,13 @@ class CommandoWindow(Adw.ApplicationWindow):
         self.theme_toggle.connect("toggled", self._on_theme_toggled)
         header.pack_end(self.theme_toggle)
         
+        # Log panel toggle
+        self.log_toggle = Gtk.ToggleButton()
+        self.log_toggle.set_icon_name("format-justify-left-symbolic")
+        self.log_toggle.set_tooltip_text("Show Logs")
+        self.log_toggle.connect("toggled", self._on_log_toggled)
+        header.pack_end(self.log_toggle)
+        
         # View switcher will be added here
     
     def _create_menu_model(self):
@@ -598,18 +615,29 @@ class CommandoWindow(Adw.ApplicationWindow):
     def _on_close_request(self, window):
         """Handle window close request."""
         logger.debug("Window close requested")
-        # Cleanup will be handled by application shutdown signal
-        # Explicitly quit the application to ensure Python process exits
         app = self.get_application()
+        if hasattr(self, "terminal_view") and not self._closing:
+            # Hang up the shells while the main loop keeps running, then quit;
+            # the rest of the cleanup is handled by the application shutdown signal
+            self._closing = True
+            self.set_visible(False)
+            self.terminal_view.shutdown_shells(lambda: app.quit() if app else None)
+            return True  # Keep the window (and app) alive until the shells are gone
+        # Explicitly quit the application to ensure Python process exits
         if app:
             app.quit()
         # Return False to allow default close behavior
         return False
     
+    def _on_log_toggled(self, button):
+        """Show or hide the log panel."""
+        self.log_revealer.set_reveal_child(button.get_active())
+    
     def cleanup(self):
         """Clean up resources."""
         logger.info("Cleaning up window")
         try:
+            self.log_view.cleanup()
             if hasattr(self, "main_view"):
                 logger.debug("Cleaning up main view")
                 self.main_view.cleanup()
@@ -0,0 +1,53 @@
+"""Tests for broadcasting commands to several tabs."""
+
+from commando.terminal.broadcast import BroadcastRun
+
+
+class TestBroadcastRun:
+    """Test BroadcastRun class."""
+
+    def test_completes_when_all_tabs_finish(self):
+        """Test the broadcast finishes only after every tab."""
+        broadcast = BroadcastRun("uptime", ["a", "b"])
+        broadcast.runs["a"].started_at = 10.0
+        broadcast.runs["a"]._finish(0, 11.0)
+        assert not broadcast.finished
+        assert broadcast.pending == ["b"]
+
+        broadcast.runs["b"].started_at = 10.5
+        broadcast.runs["b"]._finish(0, 12.0)
+        assert broadcast.finished
+        assert broadcast.exit_status == 0
+        assert broadcast.started_at == 10.0
+        assert broadcast.ended_at == 12.0
+
+    def test_failure_status(self):
+        """Test a failing tab makes the broadcast fail."""
+        broadcast = BroadcastRun("false", ["a", "b"])
+        broadcast.runs["a"]._finish(0, 1.0)
+        broadcast.runs["b"]._finish(2, 1.0)
+        assert broadcast.exit_status == 2
+
+    def test_per_tab_callbacks(self):
+        """Test each tab's completion is reported as it happens."""
+        broadcast = BroadcastRun("ls", ["a", "b"])
+        broadcast.runs["a"]._finish(0, 1.0)
+        seen = []
+        broadcast.add_tab_done_callback(lambda tab, run: seen.append((tab, run.exit_status)))
+        assert seen == [("a", 0)]
+
+        broadcast.runs["b"]._finish(1, 2.0)
+        assert seen == [("a", 0), ("b", 1)]
+
+    def test_done_callback(self):
+        """Test the combined run notifies its callbacks once."""
+        broadcast = BroadcastRun("ls", ["a"])
+        done = []
+        broadcast.add_done_callback(done.append)
+        broadcast.runs["a"]._finish(None, 1.0)
+        assert done == [broadcast]
+        assert broadcast.exit_status is None
+
+    def test_empty_group(self):
+        """Test a broadcast to no tabs completes immediately."""
+        assert BroadcastRun("ls", []).finished
@@ -4,6 +4,7 @@ import pytest
 import json
 import tempfile
 import shutil
+import threading
 from pathlib import Path
 from unittest.mock import patch, mock_open
 
@@ -80,3 +81,378 @@ class TestConfig:
                 config2 = Config()
                 assert config1 is config2
 
+
+
+class TestConfigWrites:
+    """Test debounced and batched config writes."""
+    
+    @pytest.fixture
+    def config(self, temp_config_dir):
+        """Create a fresh config instance writing to a temporary directory."""
+        with patch('commando.config.Config._get_config_dir', return_value=temp_config_dir):
+            Config._instance = None
+            config = Config()
+            yield config
+            config.flush()
+            Config._instance = None
+    
+    def read_file(self, config):
+        """Read the settings in the config file as written."""
+        with open(config._get_config_file()) as f:
+            return json.load(f)["values"]
+    
+    def test_writes_are_debounced(self, config):
+        """Test rapid changes are written once."""
+        with patch.object(Config, '_save', wraps=config._save) as save:
+            for text in ["M", "Mo", "Mon", "Mono 11"]:
+                config.set("terminal.font", text)
+            assert save.call_count == 0
+            config.flush()
+            assert save.call_count == 1
+        assert self.read_file(config)["terminal.font"] == "Mono 11"
+    
+    def test_debounced_write_happens(self, config):
+        """Test changes reach the file without an explicit flush."""
+        config.set("test.key", "later")
+        config._save_timer.join(5)
+        assert self.read_file(config)["test.key"] == "later"
+    
+    def test_transaction_batches(self, config):
+        """Test changes in a transaction are written together after it ends."""
+        with patch.object(Config, '_save', wraps=config._save) as save:
+            with config.transaction():
+                config.set("a.one", 1)
+                with config.transaction():
+                    config.set("a.two", 2)
+                assert config._save_timer is None
+            config.flush()
+            assert save.call_count == 1
+        settings = self.read_file(config)
+        assert (settings["a.one"], settings["a.two"]) == (1, 2)
+    
+    def test_flush_without_changes(self, config):
+        """Test flushing with nothing pending does not write."""
+        config.flush()
+        with patch.object(Config, '_save') as save:
+            config.flush()
+            save.assert_not_called()
+    
+    def test_atomic_write_leaves_no_temp_file(self, config, temp_config_dir):
+        """Test the file is replaced without leftovers."""
+        config.set("test.key", "value")
+        config.flush()
+        assert sorted(path.name for path in temp_config_dir.iterdir()) == ["config.json"]
+    
+    def test_set_does_not_wait_for_write(self, config):
+        """Test settings can change while a background write is in progress."""
+        started, release = threading.Event(), threading.Event()
+        
+        def slow_save():
+            started.set()
+            release.wait(5)
+        
+        config.set("test.key", "first")
+        with patch.object(config, '_save', side_effect=slow_save):
+            writer = threading.Thread(target=config.flush)
+            writer.start()
+            assert started.wait(5)
+            setter = threading.Thread(target=config.set, args=("test.key", "second"))
+            setter.start()
+            setter.join(2)
+            blocked = setter.is_alive()
+            release.set()
+            writer.join(5)
+            setter.join(5)
+        assert not blocked
+        assert config.get("test.key") == "second"
+
+
+class TestConfigSubscriptions:
+    """Test config change notifications."""
+    
+    @pytest.fixture
+    def config(self, temp_config_dir):
+        """Create a config instance whose notifications are delivered on demand."""
+        with patch('commando.config.Config._get_config_dir', return_value=temp_config_dir):
+            Config._instance = None
+            config = Config()
+            config.scheduled = []
+            config.dispatcher = config.scheduled.append
+            yield config
+            config.flush()
+            Config._instance = None
+    
+    def run_dispatch(self, config):
+        """Run the scheduled dispatches, like one main loop iteration."""
+        scheduled, config.scheduled[:] = list(config.scheduled), []
+        for callback in scheduled:
+            callback()
+    
+    def test_changes_coalesced(self, config):
+        """Test several changes are delivered in one call per iteration."""
+        received = []
+        config.subscribe("terminal", received.append)
+        config.set("terminal.font", "Mono 10")
+        config.set("terminal.font", "Mono 11")
+        config.set("terminal.scrollback_lines", 500)
+        assert len(config.scheduled) == 1
+        self.run_dispatch(config)
+        assert received == [{"terminal.font": "Mono 11", "terminal.scrollback_lines": 500}]
+    
+    def test_key_and_prefix_matching(self, config):
+        """Test subscriptions match exact keys and whole prefixes only."""
+        exact, prefix, other, everything = [], [], [], []
+        config.subscribe("terminal.font", exact.append)
+        config.subscribe("terminal", prefix.append)
+        config.subscribe("term", other.append)
+        config.subscribe("", everything.append)
+        config.set("terminal.font", "Mono 10")
+        config.set("terminal.fontsize", 3)
+        self.run_dispatch(config)
+        assert exact == [{"terminal.font": "Mono 10"}]
+        assert prefix == [{"terminal.font": "Mono 10", "terminal.fontsize": 3}]
+        assert other == []
+        assert everything == prefix
+    
+    def test_unchanged_values_not_notified(self, config):
+        """Test setting the current value, or changing and reverting it, notifies nothing."""
+        received = []
+        config.subscribe("theme", received.append)
+        config.set("theme", config.get("theme"))
+        assert config.scheduled == []
+        config.set("theme", "dark")
+        config.set("theme", "system")
+        self.run_dispatch(config)
+        assert received == []
+    
+    def test_transaction_dispatches_at_end(self, config):
+        """Test changes in a transaction are delivered after it ends."""
+        received = []
+        config.subscribe("a", received.append)
+        with config.transaction():
+            config.set("a.one", 1)
+            config.set("a.two", 2)
+            assert config.scheduled == []
+        self.run_dispatch(config)
+        assert received == [{"a.one": 1, "a.two": 2}]
+    
+    def test_unsubscribe_and_failing_subscriber(self, config):
+        """Test unsubscribed callbacks are not called and failures do not stop delivery."""
+        received = []
+        subscription = config.subscribe("a", received.append)
+        config.subscribe("a", lambda changes: 1 / 0)
+        config.subscribe("a", received.append)
+        config.unsubscribe(subscription)
+        config.set("a.one", 1)
+        self.run_dispatch(config)
+        assert received == [{"a.one": 1}]
+    
+    def test_values_copied(self, config):
+        """Test changing a dict after setting it does not change the config."""
+        profiles = {"prod": {"font": "Mono 9"}}
+        config.set("terminal.profiles", profiles)
+        profiles["prod"]["font"] = "Mono 20"
+        assert config.get("terminal.profiles")["prod"]["font"] == "Mono 9"
+    
+    def test_get_returns_copies(self, config):
+        """Test changing a returned dict or a notified dict does not change the config."""
+        received = []
+        config.subscribe("terminal", received.append)
+        config.set("terminal.profiles", {"prod": {"font": "Mono 9"}})
+        self.run_dispatch(config)
+        received[0]["terminal.profiles"]["prod"]["font"] = "Mono 20"
+        config.get("terminal.profiles")["prod"]["font"] = "Mono 30"
+        config.get("terminal.profiles")["dev"] = {}
+        assert config.get("terminal.profiles") == {"prod": {"font": "Mono 9"}}
+
+
+class TestConfigSchema:
+    """Test typed settings and migration of the old file layout."""
+    
+    @pytest.fixture
+    def make_config(self, temp_config_dir):
+        """Create config instances reading the file in a temporary directory."""
+        instances = []
+        
+        def make():
+            Config._instance = None
+            with patch('commando.config.Config._get_config_dir', return_value=temp_config_dir):
+                config = Config()
+            instances.append(config)
+            return config
+        
+        with patch('commando.config.Config._get_config_dir', return_value=temp_config_dir):
+            yield make
+            for config in instances:
+                config.flush()
+        Config._instance = None
+    
+    def write_file(self, temp_config_dir, data):
+        """Write a config file."""
+        with open(temp_config_dir / "config.json", "w") as f:
+            json.dump(data, f)
+    
+    def test_defaults_without_file(self, make_config):
+        """Test every declared setting has its default on first run."""
+        config = make_config()
+        assert config.get("terminal.scrollback_lines") == 10000
+        assert config.get("main_view.sort_by") == "number"
+        assert config.get("terminal.background_color", "#000000") == "#000000"
+    
+    def test_invalid_values_rejected(self, make_config):
+        """Test values of the wrong type or out of range are ignored."""
+        config = make_config()
+        config.set("terminal.scrollback_lines", "lots")
+        config.set("terminal.cursor_shape", "triangle")
+        config.set("executor.max_concurrent_jobs", 0)
+        config.set("terminal.cursor_blink", 1)
+        assert config.get("terminal.scrollback_lines") == 10000
+        assert config.get("terminal.cursor_shape") == "block"
+        assert config.get("executor.max_concurrent_jobs") == 2
+        assert config.get("terminal.cursor_blink") is True
+    
+    def test_lossless_conversion(self, make_config):
+        """Test numbers are converted to the declared type when nothing is lost."""
+        config = make_config()
+        config.set("terminal.max_tabs", 12.0)
+        config.set("terminal.shutdown_grace_seconds", 3)
+        assert config.get("terminal.max_tabs") == 12
+        assert isinstance(config.get("terminal.max_tabs"), int)
+        assert config.get("terminal.shutdown_grace_seconds") == 3.0
+        assert isinstance(config.get("terminal.shutdown_grace_seconds"), float)
+    
+    def test_only_customized_settings_saved(self, make_config, temp_config_dir):
+        """Test default values and reset settings are left out of the file."""
+        config = make_config()
+        config.set("theme", "dark")
+        config.set("terminal.max_tabs", 10)
+        config.set("terminal.font", "Mono 9")
+        config.set("terminal.font", None)
+        config.flush()
+        with open(temp_config_dir / "config.json") as f:
+            data = json.load(f)
+        assert data["version"] == 2
+        assert data["values"] == {"theme": "dark"}
+    
+    def test_migrates_version_1(self, make_config, temp_config_dir):
+        """Test flat defaults and nested changes are merged, nested values winning."""
+        self.write_file(temp_config_dir, {
+            "theme": "dark",
+            "terminal.font": "Monospace 12",
+            "terminal.scrollback_lines": 10000,
+            "terminal": {"font": "Mono 8", "profiles": {"prod": {"font": "Mono 9"}}},
+            "main_view": {"sort_ascending": False},
+            "recording.max_segment_mb": "big",
+        })
+        config = make_config()
+        assert config.get("theme") == "dark"
+        assert config.get("terminal.font") == "Mono 8"
+        assert config.get("terminal.profiles") == {"prod": {"font": "Mono 9"}}
+        assert config.get("main_view.sort_ascending") is False
+        assert config.get("recording.max_segment_mb") == 16
+        with open(temp_config_dir / "config.json") as f:
+            assert json.load(f)["values"] == {
+                "theme": "dark",
+                "terminal.font": "Mono 8",
+                "terminal.profiles": {"prod": {"font": "Mono 9"}},
+                "main_view.sort_ascending": False,
+            }
+        assert (temp_config_dir / "config.json.v1").exists()
+    
+    def test_version_2_not_rewritten(self, make_config, temp_config_dir):
+        """Test a current file is loaded as is."""
+        self.write_file(temp_config_dir, {"version": 2, "values": {"terminal.max_tabs": 4, "custom.key": [1]}})
+        with patch.object(Config, '_save') as save:
+            config = make_config()
+            save.assert_not_called()
+        assert config.get("terminal.max_tabs") == 4
+        assert config.get("custom.key") == [1]
+
+
+class TestConfigSharing:
+    """Test merging changes several processes make to the same file."""
+    
+    @pytest.fixture
+    def make_config(self, temp_config_dir):
+        """Create independent config instances sharing one file, like separate processes."""
+        instances = []
+        
+        def make():
+            Config._instance = None
+            config = Config()
+            config.scheduled = []
+            config.dispatcher = config.scheduled.append
+            instances.append(config)
+            return config
+        
+        with patch('commando.config.Config._get_config_dir', return_value=temp_config_dir):
+            yield make
+            for config in instances:
+                config.flush()
+        Config._instance = None
+    
+    def test_reload_picks_up_changes(self, make_config):
+        """Test settings another process wrote are merged and notified."""
+        first, second = make_config(), make_config()
+        received = []
+        first.subscribe("terminal", received.append)
+        second.set("terminal.font", "Mono 7")
+        second.flush()
+        assert first.reload()
+        assert first.get("terminal.font") == "Mono 7"
+        for callback in first.scheduled:
+            callback()
+        assert received == [{"terminal.font": "Mono 7"}]
+    
+    def test_own_writes_ignored(self, make_config):
+        """Test the file is not merged again when its content did not change."""
+        config = make_config()
+        config.set("theme", "dark")
+        config.flush()
+        with patch.object(Config, '_merge') as merge:
+            assert not config.reload()
+            merge.assert_not_called()
+    
+    def test_save_keeps_other_writers_changes(self, make_config, temp_config_dir):
+        """Test saving merges instead of overwriting settings written meanwhile."""
+        first, second = make_config(), make_config()
+        first.set("theme", "dark")
+        second.set("terminal.max_tabs", 4)
+        second.flush()
+        first.flush()
+        with open(temp_config_dir / "config.json") as f:
+            assert json.load(f)["values"] == {"theme": "dark", "terminal.max_tabs": 4}
+        assert first.get("terminal.max_tabs") == 4
+    
+    def test_latest_change_wins(self, make_config):
+        """Test a key changed in both processes keeps the later change."""
+        first, second = make_config(), make_config()
+        first.set("theme", "dark")
+        second.set("theme", "light")
+        second.flush()
+        first.flush()
+        assert first.get("theme") == "light"
+        second.reload()
+        assert second.get("theme") == "light"
+    
+    def test_reset_propagates(self, make_config):
+        """Test resetting a setting to its default reaches other processes."""
+        first = make_config()
+        first.set("theme", "dark")
+        first.flush()
+        second = make_config()
+        second.set("theme", None)
+        second.flush()
+        first.reload()
+        assert first.get("theme") == "system"
+    
+    def test_hand_edit_without_timestamps(self, make_config, temp_config_dir):
+        """Test values edited by hand win over values not changed since."""
+        config = make_config()
+        config.set("theme", "dark")
+        config.flush()
+        with open(temp_config_dir / "config.json", "w") as f:
+            json.dump({"version": 2, "values": {"terminal.max_tabs": 3}}, f)
+        config.reload()
+        assert config.get("terminal.max_tabs") == 3
+        assert config.get("theme") == "system"
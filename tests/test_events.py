@@ -0,0 +1,76 @@
+"""Tests for the structured command event log."""
+
+import gzip
+import json
+
+import pytest
+
+from commando.events import EventLog, command_stats, event_files, iter_events, main
+
+
+class TestEventLog:
+    """Test writing and rotating the event file."""
+
+    def test_events_written_as_json_lines(self, temp_data_dir):
+        """Test each event is one JSON object per line."""
+        events = EventLog(temp_data_dir, max_file_bytes=1024 * 1024, max_total_bytes=10 * 1024 * 1024)
+        events.emit("command_started", number=1, title="100% done")
+        events.emit("command_finished", number=1, duration=0.5, exit_status=0)
+        events.close()
+        lines = (temp_data_dir / "events.ndjson").read_text().splitlines()
+        assert [json.loads(line)["event"] for line in lines] == ["command_started", "command_finished"]
+        assert json.loads(lines[0])["title"] == "100% done"
+        assert "ts" in json.loads(lines[1])
+
+    def test_rotated_files_read_in_order(self, temp_data_dir):
+        """Test full files are compressed and all events are read back oldest first."""
+        events = EventLog(temp_data_dir, max_file_bytes=300, max_total_bytes=10 * 1024 * 1024)
+        for i in range(20):
+            events.emit("command_started", number=i)
+        events.close()
+        assert any(path.suffix == ".gz" for path in event_files(temp_data_dir))
+        assert [event["number"] for event in iter_events(temp_data_dir)] == list(range(20))
+
+    def test_unreadable_lines_skipped(self, temp_data_dir):
+        """Test a line cut off by a crash does not stop reading."""
+        with gzip.open(temp_data_dir / "events.ndjson.20260101-000000.gz", "wt") as f:
+            f.write('{"event": "command_started", "number": 1, "ts": 5}\n{"event": "comm')
+        (temp_data_dir / "events.ndjson").write_text('{"event": "command_started", "number": 2, "ts": 20}\n')
+        assert [event["number"] for event in iter_events(temp_data_dir)] == [1, 2]
+        assert [event["number"] for event in iter_events(temp_data_dir, since=10)] == [2]
+
+
+class TestCommandStats:
+    """Test aggregating events."""
+
+    def test_aggregates_per_command(self):
+        """Test runs, failures and durations are summed per command."""
+        events = [
+            {"event": "command_started", "number": 1, "title": "Backup"},
+            {"event": "command_finished", "number": 1, "duration": 2.0, "exit_status": 0, "output_lines": 10},
+            {"event": "command_started", "number": 1, "title": "Backup"},
+            {"event": "command_finished", "number": 1, "duration": 4.0, "exit_status": 1, "timed_out": True},
+            {"event": "command_started", "number": 2, "title": "Deploy"},
+            {"event": "command_finished", "number": 2, "duration": None, "exit_status": None},
+            {"event": "other"},
+        ]
+        stats = command_stats(iter(events))
+        backup, deploy = stats[1], stats[2]
+        assert (backup.title, backup.started, backup.finished, backup.failures, backup.timeouts) == (
+            "Backup", 2, 2, 1, 1,
+        )
+        assert (backup.mean_duration, backup.max_duration, backup.failure_rate) == (3.0, 4.0, 0.5)
+        assert backup.terminal_output_lines == 10
+        assert (deploy.started, deploy.finished, deploy.mean_duration) == (1, 0, None)
+
+    def test_main_prints_table(self, temp_data_dir, capsys):
+        """Test the command line summary."""
+        (temp_data_dir / "events.ndjson").write_text(
+            '{"event": "command_started", "number": 7, "title": "Logs", "ts": 1}\n'
+            '{"event": "command_finished", "number": 7, "duration": 1.25, "exit_status": 0, "ts": 2,'
+            ' "output_lines": 3}\n'
+        )
+        assert main(["--dir", str(temp_data_dir)]) == 0
+        output = capsys.readouterr().out.splitlines()
+        assert "term lines" in output[0]
+        assert output[1].split() == ["7", "1", "0", "1.2", "1.2", "3", "Logs"]
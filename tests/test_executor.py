@@ -1,10 +1,15 @@
 """Tests for command executor."""
 
+import os
 import pytest
+import signal
+import subprocess
+import time
 from unittest.mock import Mock, MagicMock, patch
 
 from commando.models.command import Command
-from commando.executor import CommandExecutor
+from commando.executor import CommandExecutor, Job, has_resource_limits, make_preexec_fn
+from commando.terminal.shell_integration import TerminalRun
 
 
 class TestCommandExecutor:
@@ -13,7 +18,7 @@ class TestCommandExecutor:
     @pytest.fixture
     def executor(self):
         """Create an executor instance."""
-        with patch('commando.executor.Config'):
+        with patch('commando.executor.Config'), patch('commando.executor.EventLog'):
             return CommandExecutor()
     
     def test_executor_initialization(self, executor):
@@ -45,7 +50,7 @@ class TestCommandExecutor:
         
         executor._execute_internal(cmd)
         
-        mock_terminal_view.execute_command.assert_called_once_with("echo test")
+        mock_terminal_view.execute_command.assert_called_once_with("echo test", card_key=1, profile=None)
     
     @patch('commando.executor.CommandExecutor._execute_external')
     def test_execute_internal_fallback(self, mock_external, executor):
@@ -61,16 +66,254 @@ class TestCommandExecutor:
     def test_get_terminal_command_gnome_terminal(self, executor):
         """Test getting command for gnome-terminal."""
         result = executor._get_terminal_command("gnome-terminal", "echo test")
-        assert "gnome-terminal" in result
-        assert "echo test" in result
+        assert result == ["gnome-terminal", "--", "bash", "-c", "echo test\nexec bash"]
     
     def test_get_terminal_command_xterm(self, executor):
         """Test getting command for xterm."""
         result = executor._get_terminal_command("xterm", "echo test")
-        assert "xterm" in result
+        assert result[:2] == ["xterm", "-e"]
     
     def test_get_terminal_command_generic(self, executor):
         """Test getting command for generic terminal."""
         result = executor._get_terminal_command("custom-terminal", "echo test")
-        assert "custom-terminal" in result
+        assert result[0] == "custom-terminal"
+        assert result[1] == "-e"
+    
+    def test_get_terminal_command_keeps_quotes(self, executor):
+        """Test commands with double quotes are passed through unchanged."""
+        result = executor._get_terminal_command("kitty", 'echo "hello world"')
+        assert result == ["kitty", "bash", "-c", 'echo "hello world"\nexec bash']
+    
+    def test_get_terminal_command_with_options(self, executor):
+        """Test terminal settings may include options."""
+        result = executor._get_terminal_command("wezterm --config-file 'my conf.lua'", "ls")
+        assert result[:5] == ["wezterm", "--config-file", "my conf.lua", "start", "--"]
+    
+    @patch('commando.executor.subprocess.Popen')
+    def test_execute_external_uses_argv(self, mock_popen, executor):
+        """Test external launches do not go through a shell."""
+        executor.config.get.return_value = "foot"
+        executor._execute_external(Command(number=1, title="Test", command="echo test"))
+        
+        args, kwargs = mock_popen.call_args
+        assert args[0][:2] == ["foot", "bash"]
+        assert not kwargs.get("shell")
+    
+    def test_build_direct_argv_plain(self, executor):
+        """Test direct runs go through /bin/sh without extra wrappers."""
+        cmd = Command(number=1, title="Test", command="echo test")
+        argv = executor._build_direct_argv(cmd)
+        assert argv == ["/bin/sh", "-c", "echo test"]
+    
+    @patch('commando.executor.shutil.which', return_value="/usr/bin/ionice")
+    def test_build_direct_argv_ionice(self, mock_which, executor):
+        """Test I/O class wraps the command with ionice."""
+        cmd = Command(number=1, title="Test", command="echo test", ionice_class="idle")
+        argv = executor._build_direct_argv(cmd)
+        assert argv[:3] == ["ionice", "-c", "3"]
+        assert argv[-1] == "echo test"
+    
+    def test_build_direct_argv_systemd_scope(self, executor):
+        """Test memory limit is enforced by a systemd scope when requested."""
+        cmd = Command(number=1, title="Test", command="echo test", memory_limit=512)
+        argv = executor._build_direct_argv(cmd, use_scope=True)
+        assert argv[0] == "systemd-run"
+        assert "--scope" in argv
+        assert "MemoryMax=512M" in argv
+        assert argv[-3:] == ["/bin/sh", "-c", "echo test"]
+    
+    def test_make_preexec_fn_without_limits(self):
+        """Test no preexec function is built when no limits are set."""
+        assert make_preexec_fn() is None
+    
+    def test_make_preexec_fn_applies_limits(self):
+        """Test rlimits and niceness are applied in the child process."""
+        preexec = make_preexec_fn(cpu_limit=5, nice=3)
+        output = subprocess.run(
+            ["/bin/sh", "-c", "ulimit -t; nice"],
+            preexec_fn=preexec, capture_output=True, text=True, check=True
+        ).stdout.split()
+        assert output[0] == "5"
+        assert int(output[1]) >= 3
+    
+    def test_has_resource_limits(self):
+        """Test detection of configured resource limits."""
+        assert not has_resource_limits(Command(number=1, title="Test", command="cmd"))
+        assert has_resource_limits(Command(number=1, title="Test", command="cmd", nice=5))
+    
+    @patch('commando.executor.subprocess.Popen')
+    def test_execute_direct_tracks_job(self, mock_popen, executor):
+        """Test direct runs are registered as jobs."""
+        mock_popen.return_value.pid = 4242
+        executor.config.get.return_value = False
+        cmd = Command(number=7, title="Test", command="sleep 1", no_terminal=True, timeout=10)
+        
+        job = executor._execute_direct(cmd)
+        
+        assert job.pid == 4242
+        assert executor.jobs[job.job_id] is job
+        assert job.running
+        assert mock_popen.call_args.kwargs["start_new_session"] is True
+    
+    @patch('commando.executor.os.killpg')
+    def test_terminate_job_sends_sigterm(self, mock_killpg, executor):
+        """Test terminating a job signals its process group."""
+        executor.config.get.return_value = 5
+        job = Job(job_id=1, command=Command(number=1, title="Test", command="cmd"), mode="direct", pid=4242)
+        executor.jobs[1] = job
+        
+        assert executor.terminate_job(1) is True
+        mock_killpg.assert_called_once_with(4242, signal.SIGTERM)
+    
+    @patch('commando.executor.os.waitid', return_value=None)
+    @patch('commando.executor.os.killpg')
+    def test_terminate_job_escalates_by_process_group(self, mock_killpg, mock_waitid, executor):
+        """Test SIGKILL goes to the process group while the leader is not reaped."""
+        executor.config.get.return_value = 5
+        job = Job(job_id=1, command=Command(number=1, title="Test", command="cmd"), mode="direct",
+                  pid=4242, started_at=1.0)
+        executor.jobs[1] = job
+        from gi.repository import GLib
+        GLib.timeout_add_seconds.reset_mock()
+        
+        executor.terminate_job(1)
+        grace, callback, *args = GLib.timeout_add_seconds.call_args.args
+        callback(*args)
+        
+        assert grace == 5
+        assert mock_killpg.call_args_list[-1].args == (4242, signal.SIGKILL)
+    
+    @patch('commando.executor.os.waitid', return_value=None)
+    @patch('commando.executor.os.killpg', side_effect=ProcessLookupError)
+    def test_kill_group_already_gone(self, mock_killpg, mock_waitid, executor):
+        """Test escalating on a group that has fully exited is harmless."""
+        assert executor._kill_group(4242, 1) is False
+    
+    def test_kill_group_after_leader_reaped(self, executor):
+        """Test members ignoring SIGTERM are killed after the leader was reaped."""
+        leader = subprocess.Popen(
+            ["sh", "-c", "(trap '' TERM; exec sleep 30) & echo $!"],
+            stdout=subprocess.PIPE, start_new_session=True,
+        )
+        member = int(leader.stdout.readline())
+        leader.wait()
+        leader.stdout.close()
+        
+        with patch('commando.executor.os.killpg') as mock_killpg:
+            executor._kill_group(leader.pid, 1)
+        
+        mock_killpg.assert_not_called()
+        for _ in range(100):
+            try:
+                with open(f"/proc/{member}/stat") as f:
+                    if f.read().rsplit(")", 1)[1].split()[0] == "Z":
+                        break
+            except FileNotFoundError:
+                break
+            time.sleep(0.05)
+        else:
+            os.kill(member, signal.SIGKILL)
+            pytest.fail("Member of the reaped leader's group was not killed")
+    
+    @patch('commando.executor.signal.pidfd_send_signal')
+    @patch('commando.executor.os.waitid', side_effect=ChildProcessError)
+    @patch('commando.executor._group_members', return_value=[4242, 4300])
+    @patch('commando.executor.os.killpg')
+    def test_kill_group_reused_id(self, mock_killpg, mock_members, mock_waitid, mock_send, executor):
+        """Test nothing is killed when a new process has the reaped leader's pid."""
+        executor._kill_group(4242, 1)
+        mock_killpg.assert_not_called()
+        mock_send.assert_not_called()
+    
+    @patch('commando.executor.subprocess.Popen')
+    def test_direct_run_keeps_process_until_exit(self, mock_popen, executor):
+        """Test the Popen object is kept so only the child watch reaps the job."""
+        process = mock_popen.return_value
+        process.pid = 4242
+        executor.config.get.return_value = False
+        job = executor._execute_direct(Command(number=7, title="Test", command="true", no_terminal=True))
+        assert job.process is process
+        
+        executor._on_job_exited(4242, 1 << 8, job.job_id)
+        assert job.process is None
+        assert process.returncode == 1
+    
+    def test_on_job_exited_records_status(self, executor):
+        """Test job completion records the exit status and removes the job."""
+        job = Job(job_id=1, command=Command(number=1, title="Test", command="cmd"), mode="direct",
+                  pid=4242, started_at=1.0)
+        executor.jobs[1] = job
+        
+        executor._on_job_exited(4242, 3 << 8, 1)
+        
+        assert job.exit_status == 3
+        assert job.ended_at is not None
+        assert 1 not in executor.jobs
+    
+    @patch('commando.executor.subprocess.Popen')
+    def test_enqueue_limits_concurrency(self, mock_popen, executor):
+        """Test queued jobs wait for a free background slot."""
+        mock_popen.return_value.pid = 4242
+        executor.config.get.side_effect = lambda key, default=None: 1 if key == "executor.max_concurrent_jobs" else False
+        first = executor.enqueue(Command(number=1, title="A", command="a"))
+        second = executor.enqueue(Command(number=2, title="B", command="b"))
+        
+        assert first.running
+        assert not second.running
+        
+        done = []
+        first.add_done_callback(done.append)
+        executor._on_job_exited(4242, 0, first.job_id)
+        
+        assert done == [first]
+        assert second.running
+    
+    def test_execute_internal_tracks_terminal_run(self, executor):
+        """Test terminal runs reported by shell integration complete the job."""
+        run = TerminalRun("echo test")
+        mock_terminal_view = Mock()
+        mock_terminal_view.execute_command.return_value = run
+        executor.set_terminal_view(mock_terminal_view)
+        executor.metrics = Mock()
+        
+        executor._execute_internal(Command(number=5, title="Test", command="echo test"))
+        run.started_at = 100.0
+        run._finish(0, 101.5)
+        
+        executor.metrics.record.assert_called_once_with(5, 100.0, 101.5, 0)
 
+    def test_events_emitted_for_direct_run(self, executor):
+        """Test a direct run emits start and finish events with its outcome."""
+        job = Job(job_id=1, command=Command(number=3, title="Backup", command="cmd"), mode="direct",
+                  pid=4242, started_at=10.0)
+        executor.jobs[1] = job
+        executor._emit_started(job)
+        executor._on_job_exited(4242, 2 << 8, 1)
+        
+        (started, started_fields), (finished, finished_fields) = [
+            (call.args[0], call.kwargs) for call in executor.events.emit.call_args_list
+        ]
+        assert (started, started_fields["number"], started_fields["mode"]) == ("command_started", 3, "direct")
+        assert finished == "command_finished"
+        assert finished_fields["exit_status"] == 2
+        assert finished_fields["duration"] == job.ended_at - 10.0
+        assert finished_fields["output_lines"] is None
+    
+    def test_events_emitted_for_terminal_run(self, executor):
+        """Test a terminal run's finish event carries its output size."""
+        run = TerminalRun("echo test")
+        mock_terminal_view = Mock()
+        mock_terminal_view.execute_command.return_value = run
+        executor.set_terminal_view(mock_terminal_view)
+        
+        executor._execute_internal(Command(number=5, title="Test", command="echo test"))
+        run.started_at = 100.0
+        run.output_rows = 12
+        run._finish(1, 101.5)
+        
+        kinds = [call.args[0] for call in executor.events.emit.call_args_list]
+        assert kinds == ["command_started", "command_finished"]
+        fields = executor.events.emit.call_args.kwargs
+        assert (fields["mode"], fields["duration"], fields["exit_status"], fields["output_lines"]) == (
+            "internal", 1.5, 1, 12,
+        )
@@ -0,0 +1,93 @@
+"""Tests for the external terminal registry."""
+
+import subprocess
+
+import pytest
+from unittest.mock import patch
+
+from commando import external_terminal
+from commando.external_terminal import (
+    AUTO, ExternalTerminal, build_terminal_argv, detect_terminal, register_terminal, resolve_terminal
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Reset cached detection between tests."""
+    resolve_terminal.cache_clear()
+    detect_terminal.cache_clear()
+    yield
+    resolve_terminal.cache_clear()
+    detect_terminal.cache_clear()
+
+
+class TestExternalTerminal:
+    """Test argv construction and detection."""
+    
+    @pytest.mark.parametrize("name,prefix", [
+        ("gnome-terminal", ["gnome-terminal", "--"]),
+        ("konsole", ["konsole", "-e"]),
+        ("alacritty", ["alacritty", "-e"]),
+        ("kitty", ["kitty"]),
+        ("foot", ["foot"]),
+        ("wezterm", ["wezterm", "start", "--"]),
+        ("xterm", ["xterm", "-e"]),
+    ])
+    def test_known_terminals(self, name, prefix):
+        """Test each registered terminal gets its own exec arguments."""
+        argv = build_terminal_argv(name, "ls")
+        assert argv == prefix + ["bash", "-c", "ls\nexec bash"]
+    
+    @pytest.mark.parametrize("command", ["echo a &", "echo a  # note"])
+    def test_shell_started_after_command(self, command):
+        """Test a trailing "&" or comment in the command does not break starting the shell."""
+        argv = build_terminal_argv("xterm", command, shell="/bin/echo")
+        result = subprocess.run(["sh", "-c", argv[-1]], capture_output=True, text=True, timeout=10)
+        assert result.returncode == 0
+        assert result.stdout.count("\n") == 2  # "a" from the command, a blank line from the "shell"
+    
+    def test_absolute_path(self):
+        """Test terminals configured by path are recognised."""
+        argv = build_terminal_argv("/usr/bin/gnome-terminal", "ls")
+        assert argv[:2] == ["/usr/bin/gnome-terminal", "--"]
+    
+    def test_empty_setting(self):
+        """Test an empty setting is rejected."""
+        with pytest.raises(ValueError):
+            build_terminal_argv("  ", "ls")
+    
+    def test_resolve_is_cached(self):
+        """Test resolution only looks up the executable once."""
+        with patch('commando.external_terminal.shutil.which', return_value="/usr/bin/foot") as mock_which:
+            resolve_terminal("foot")
+            resolve_terminal("foot")
+        assert mock_which.call_count == 1
+    
+    def test_detect_prefers_terminal_env(self, monkeypatch):
+        """Test $TERMINAL wins over the registry order."""
+        monkeypatch.setenv("TERMINAL", "foot")
+        with patch('commando.external_terminal.shutil.which', return_value="/usr/bin/x"):
+            assert detect_terminal() == "foot"
+    
+    def test_detect_registry_order(self, monkeypatch):
+        """Test the first installed registry terminal is detected."""
+        monkeypatch.delenv("TERMINAL", raising=False)
+        installed = {"kitty", "xterm"}
+        with patch('commando.external_terminal.shutil.which', side_effect=lambda n: n if n in installed else None):
+            assert detect_terminal() == "kitty"
+            assert build_terminal_argv(AUTO, "ls")[0] == "kitty"
+    
+    def test_detect_nothing_installed(self, monkeypatch):
+        """Test auto mode fails cleanly without any terminal."""
+        monkeypatch.delenv("TERMINAL", raising=False)
+        with patch('commando.external_terminal.shutil.which', return_value=None):
+            with pytest.raises(ValueError):
+                build_terminal_argv(AUTO, "ls")
+    
+    def test_register_terminal(self):
+        """Test custom terminals can be registered."""
+        register_terminal(ExternalTerminal("myterm", ("-x",)))
+        try:
+            assert build_terminal_argv("myterm", "ls")[:2] == ["myterm", "-x"]
+        finally:
+            del external_terminal.EXTERNAL_TERMINALS["myterm"]
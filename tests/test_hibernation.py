@@ -0,0 +1,87 @@
+"""Tests for terminal tab hibernation."""
+
+import pytest
+
+from commando.terminal.hibernation import (
+    BYTES_PER_CELL, TerminalMemoryBudget, estimate_cost, load_contents, restore_sequence, save_contents
+)
+
+
+class TestEstimateCost:
+    """Test estimate_cost function."""
+
+    def test_cells(self):
+        """Test cost scales with buffer cells."""
+        assert estimate_cost(100, 80) == 100 * 80 * BYTES_PER_CELL
+
+    def test_negative(self):
+        """Test nonsensical sizes cost nothing."""
+        assert estimate_cost(-1, 80) == 0
+
+
+class TestTerminalMemoryBudget:
+    """Test TerminalMemoryBudget class."""
+
+    @pytest.fixture
+    def budget(self):
+        """Create a budget with three tabs used at t=0, 100 and 200."""
+        budget = TerminalMemoryBudget(budget_bytes=250, idle_seconds=300)
+        for i, key in enumerate(("a", "b", "c")):
+            budget.touch(key, now=i * 100)
+            budget.set_cost(key, 100)
+        return budget
+
+    def test_total(self, budget):
+        """Test total sums tab costs."""
+        assert budget.total == 300
+
+    def test_under_budget(self, budget):
+        """Test nothing is hibernated under budget."""
+        budget.budget_bytes = 1000
+        assert budget.select_victims(lambda key: True, now=10000) == []
+
+    def test_least_recently_used_first(self, budget):
+        """Test only as many LRU tabs as needed are picked."""
+        assert budget.select_victims(lambda key: True, now=10000) == ["a"]
+
+    def test_touch_changes_order(self, budget):
+        """Test a selected tab becomes most recently used."""
+        budget.touch("a", now=300)
+        assert budget.select_victims(lambda key: True, now=10000) == ["b"]
+
+    def test_recently_used_skipped(self, budget):
+        """Test tabs used within idle_seconds are kept."""
+        assert budget.select_victims(lambda key: True, now=250) == []
+        assert budget.select_victims(lambda key: True, now=350) == ["a"]
+
+    def test_busy_tabs_skipped(self, budget):
+        """Test tabs that cannot hibernate are passed over."""
+        assert budget.select_victims(lambda key: key != "a", now=10000) == ["b"]
+
+    def test_disabled(self, budget):
+        """Test a zero budget disables hibernation."""
+        budget.budget_bytes = 0
+        assert budget.select_victims(lambda key: True, now=10000) == []
+
+    def test_remove(self, budget):
+        """Test closed tabs stop counting."""
+        budget.remove("a")
+        assert budget.total == 200
+        assert budget.select_victims(lambda key: True, now=10000) == []
+
+
+class TestContents:
+    """Test saving and restoring contents."""
+
+    def test_roundtrip(self, tmp_path):
+        """Test contents survive compression."""
+        path = tmp_path / "hibernated" / "tab.txt.gz"
+        data = b"line\n" * 1000
+        save_contents(path, data)
+        assert path.stat().st_size < len(data)
+        assert load_contents(path) == data
+
+    def test_restore_sequence(self):
+        """Test replay clears the screen and scrollback and drops trailing blank lines."""
+        sequence = restore_sequence(b"out 1\nout 2\n$ \n\n\n", cursor_column=2)
+        assert sequence == b"\x1b[H\x1b[2J\x1b[3Jout 1\r\nout 2\r\n$\x1b[3G"
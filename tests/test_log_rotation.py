@@ -0,0 +1,74 @@
+"""Tests for size and age limited log files."""
+
+import gzip
+import logging
+import time
+
+import pytest
+
+from commando.log_rotation import CompressedRotatingFileHandler
+
+
+class TestCompressedRotatingFileHandler:
+    """Test rotating, compressing and pruning log files."""
+
+    @pytest.fixture
+    def make_handler(self, temp_data_dir):
+        """Create handlers writing commando.log in a temporary directory."""
+        handlers = []
+
+        def make(max_bytes=1000, max_age_seconds=3600, max_total_bytes=100000):
+            handler = CompressedRotatingFileHandler(
+                temp_data_dir / "commando.log", max_bytes, max_age_seconds, max_total_bytes
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s - %(message)s"))
+            handlers.append(handler)
+            return handler
+
+        yield make
+        for handler in handlers:
+            handler.close()
+
+    def emit(self, handler, message):
+        """Log a message through the handler."""
+        handler.handle(logging.LogRecord("test", logging.INFO, __file__, 1, message, None, None))
+
+    def test_rotates_by_size_and_compresses(self, make_handler, temp_data_dir):
+        """Test a full file is compressed and a new one started."""
+        handler = make_handler(max_bytes=200)
+        for i in range(10):
+            self.emit(handler, f"line {i} " + "x" * 40)
+        rotated = handler.rotated_files()
+        assert rotated
+        text = "".join(gzip.open(path, "rt").read() for path in rotated)
+        text += (temp_data_dir / "commando.log").read_text()
+        assert [f"line {i} " in text for i in range(10)] == [True] * 10
+        assert (temp_data_dir / "commando.log").stat().st_size <= 200
+        assert not list(temp_data_dir.glob("*.tmp"))
+
+    def test_rotates_by_age(self, make_handler, temp_data_dir):
+        """Test a file older than the limit is rotated, going by its first line."""
+        old = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time() - 7200))
+        (temp_data_dir / "commando.log").write_text(f"{old},000 - old line\n")
+        handler = make_handler(max_age_seconds=3600)
+        self.emit(handler, "new line")
+        assert len(handler.rotated_files()) == 1
+        assert "old line" in gzip.open(handler.rotated_files()[0], "rt").read()
+        assert "old line" not in (temp_data_dir / "commando.log").read_text()
+
+    def test_recent_file_continued(self, make_handler, temp_data_dir):
+        """Test a file within the limits is appended to."""
+        self.emit(make_handler(), "first")
+        handler = make_handler()
+        self.emit(handler, "second")
+        assert handler.rotated_files() == []
+        assert "first" in (temp_data_dir / "commando.log").read_text()
+
+    def test_oldest_files_pruned(self, make_handler, temp_data_dir):
+        """Test compressed files beyond the disk cap are deleted, oldest first."""
+        for stamp in ("20260101-000000", "20260102-000000", "20260103-000000"):
+            (temp_data_dir / f"commando.log.{stamp}.gz").write_bytes(b"x" * 400)
+        handler = make_handler(max_bytes=200, max_total_bytes=1000)
+        assert [path.name for path in handler.rotated_files()] == [
+            "commando.log.20260102-000000.gz", "commando.log.20260103-000000.gz",
+        ]
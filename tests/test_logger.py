@@ -2,9 +2,14 @@
 
 import pytest
 import logging
+import queue
 from unittest.mock import patch, MagicMock
 
-from commando.logger import setup_logging, get_logger, set_log_level, LogLevel
+from commando import logger as logger_module
+from commando.logger import (
+    setup_logging, get_logger, set_log_level, LogLevel, DroppingQueueHandler, get_lazy_logger, lazy,
+    RingBufferHandler,
+)
 
 
 class TestLogger:
@@ -24,7 +29,7 @@ class TestLogger:
     
     @patch('commando.logger.logging.getLogger')
     @patch('commando.logger.logging.StreamHandler')
-    @patch('commando.logger.logging.FileHandler')
+    @patch('commando.logger.CompressedRotatingFileHandler')
     @patch('commando.logger.Path.mkdir')
     def test_setup_logging(self, mock_mkdir, mock_file_handler, mock_stream_handler, mock_get_logger):
         """Test setting up logging."""
@@ -59,3 +64,119 @@ class TestLogger:
         assert LogLevel.ERROR.value == logging.ERROR
         assert LogLevel.CRITICAL.value == logging.CRITICAL
 
+
+
+class TestQueueLogging:
+    """Test logging through the writer thread."""
+    
+    def make_record(self, message):
+        """Create a log record."""
+        return logging.LogRecord("test", logging.INFO, __file__, 1, message, None, None)
+    
+    def test_full_queue_drops_and_reports(self):
+        """Test records are dropped instead of blocking, and the drop is logged later."""
+        log_queue = queue.Queue(2)
+        handler = DroppingQueueHandler(log_queue)
+        for i in range(4):
+            handler.handle(self.make_record(f"message {i}"))
+        assert handler.dropped == 2
+        assert [log_queue.get_nowait().getMessage() for _ in range(2)] == ["message 0", "message 1"]
+        handler.handle(self.make_record("message 4"))
+        assert log_queue.get_nowait().getMessage() == "Log queue full, dropped 2 messages"
+        assert log_queue.get_nowait().getMessage() == "message 4"
+        assert handler.dropped == 2
+    
+    def test_records_written_by_listener(self, temp_config_dir):
+        """Test records reach the log file through the queue."""
+        root = logging.getLogger()
+        old_level = root.level
+        with patch('commando.config.Config') as mock_config:
+            mock_config.return_value.get.side_effect = lambda key, default=None: (
+                "INFO" if key == "logging.level" else default
+            )
+            mock_config.return_value.get_cache_dir.return_value = temp_config_dir
+            with patch('commando.logger.Config', mock_config):
+                setup_logging()
+        try:
+            assert isinstance(root.handlers[-1], DroppingQueueHandler)
+            assert logger_module._console_handler not in root.handlers  # Only on the writer thread
+            get_logger("test.queue").warning("queued message")
+        finally:
+            root.removeHandler(logger_module._queue_handler)
+            logger_module._stop_listener()
+            logger_module._file_handler.close()
+            logger_module._config_subscription = None
+            root.setLevel(old_level)
+        assert not any(isinstance(handler, DroppingQueueHandler) for handler in root.handlers)
+        log_text = (temp_config_dir / "logs" / "commando.log").read_text()
+        assert "queued message" in log_text
+
+
+class TestLazyLogger:
+    """Test the logger facade for hot paths."""
+    
+    @pytest.fixture
+    def facade(self):
+        """Create a facade whose logger starts at INFO."""
+        wrapped = logging.getLogger("test.lazy")
+        wrapped.setLevel(logging.INFO)
+        yield get_lazy_logger("test.lazy")
+        wrapped.setLevel(logging.NOTSET)
+    
+    def test_facade_shared(self, facade):
+        """Test the same facade is returned for the same name."""
+        assert get_lazy_logger("test.lazy") is facade
+        assert facade.logger is get_logger("test.lazy")
+    
+    def test_disabled_level_does_no_work(self, facade):
+        """Test messages below the level are neither built nor formatted."""
+        calls = []
+        facade.debug("value %s", lazy(lambda: calls.append("arg")))
+        facade.debug(lambda: calls.append("message"))
+        assert calls == []
+    
+    def test_enabled_level_formats(self, facade, caplog):
+        """Test emitted messages are formatted, with lazy parts evaluated."""
+        with caplog.at_level(logging.INFO, logger="test.lazy"):
+            facade.info("value %s of %d", lazy(lambda: "computed"), 3)
+            facade.info(lambda: "built message")
+        assert [record.getMessage() for record in caplog.records] == ["value computed of 3", "built message"]
+        assert caplog.records[0].funcName == "test_enabled_level_formats"
+    
+    def test_level_cache_reset(self, facade):
+        """Test set_log_level updates the cached level checks."""
+        assert not facade.isEnabledFor(logging.DEBUG)
+        logging.getLogger("test.lazy").setLevel(logging.NOTSET)
+        root_level = logging.getLogger().level
+        try:
+            set_log_level(LogLevel.DEBUG)
+            assert facade.isEnabledFor(logging.DEBUG)
+        finally:
+            logging.getLogger().setLevel(root_level)
+
+
+class TestRingBuffer:
+    """Test the in-memory log buffer."""
+    
+    def emit(self, handler, level, message):
+        """Log a message through the handler."""
+        handler.handle(logging.LogRecord("test", level, __file__, 1, message, None, None))
+    
+    def test_keeps_most_recent_lines(self):
+        """Test the buffer holds at most its capacity, dropping the oldest lines."""
+        handler = RingBufferHandler(capacity=3)
+        for i in range(5):
+            self.emit(handler, logging.INFO, f"line {i}")
+        assert [line for _sequence, _level, line in handler.lines_since()] == ["line 2", "line 3", "line 4"]
+    
+    def test_lines_since(self):
+        """Test readers get only the lines added since their last read, with levels."""
+        handler = RingBufferHandler()
+        handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        self.emit(handler, logging.INFO, "first")
+        last = handler.lines_since()[-1][0]
+        self.emit(handler, logging.WARNING, "second")
+        assert [(level, line) for _sequence, level, line in handler.lines_since(last)] == [
+            (logging.WARNING, "WARNING second"),
+        ]
+        assert handler.lines_since(last + 1) == []
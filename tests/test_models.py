@@ -3,6 +3,8 @@
 import pytest
 import json
 from commando.models.command import Command         
+from commando.models.command_table import CommandTable
+from commando.models import memory_benchmark
 
 
 class TestCommand:
@@ -98,3 +100,58 @@ class TestCommand:
         assert restored.color == original.color
         assert restored.tag == original.tag
 
+
+    def test_command_slotted(self):
+        """Test commands have no per-instance dict."""
+        cmd = Command(number=1, title="Test", command="cmd")
+        assert not hasattr(cmd, "__dict__")
+        with pytest.raises(AttributeError):
+            cmd.unknown = 1
+    
+    def test_low_cardinality_fields_shared(self):
+        """Test repeated icon, color, tag and category strings are one object."""
+        first, second = (
+            Command.from_json('{"number": %d, "title": "T", "command": "c", "icon": "folder-symbolic", '
+                              '"color": "red", "tag": "net", "category": "Network"}' % number)
+            for number in (1, 2)
+        )
+        for name in ("icon", "color", "tag", "category"):
+            assert getattr(first, name) is getattr(second, name)
+
+
+class TestCommandTable:
+    """Test the column-wise command store."""
+    
+    @pytest.fixture
+    def commands(self):
+        """Commands sharing some categories."""
+        return [
+            Command(number=1, title="One", command="echo 1", category="A", no_terminal=True, timeout=5),
+            Command(number=2, title="Two", command="echo 2", category="B"),
+            Command(number=3, title="Three", command="echo 3", category="A", description="third"),
+        ]
+    
+    def test_roundtrip(self, commands):
+        """Test commands read back equal to the ones added."""
+        table = CommandTable(commands)
+        assert len(table) == 3
+        assert list(table) == commands
+        assert table[-1] == commands[-1]
+        assert table[0].no_terminal is True
+    
+    def test_columns(self, commands):
+        """Test single fields are read without creating commands."""
+        table = CommandTable(commands)
+        assert table.column("category") == ["A", "B", "A"]
+        assert table.column("number") == [1, 2, 3]
+        assert table.column("no_terminal") == [True, False, False]
+        assert table.distinct("category") == ["A", "B"]
+
+
+class TestMemoryBenchmark:
+    """Test the memory benchmark."""
+    
+    def test_compact_representations_smaller(self):
+        """Test slotted commands and the table use less memory than dict-based commands."""
+        results = memory_benchmark.run(count=2000)
+        assert results["table"] < results["slots"] < results["dict"]
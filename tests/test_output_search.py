@@ -0,0 +1,138 @@
+"""Tests for full-text search over recorded output."""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+import commando.terminal.search as search
+from commando.terminal.recording import SessionRecorder
+from commando.terminal.search import OutputIndex, locate_row
+
+
+@pytest.fixture(params=["fts5", "like"])
+def index(request, tmp_path, monkeypatch):
+    """Create an index, with and without FTS5."""
+    if request.param == "like":
+        monkeypatch.setattr(search, "fts5_available", lambda: False)
+    elif not search.fts5_available():
+        pytest.skip("SQLite without FTS5")
+    index = OutputIndex(tmp_path / "index.db")
+    yield index
+    index.close()
+
+
+def record(index, session_id, title, started_at, lines, first_row=0):
+    """Feed lines to the index as the recorder would."""
+    index.session_opened(session_id, title, started_at)
+    index.output_written(session_id, Path("000001.log.gz"), f"# header {title}\n", None)
+    index.output_written(session_id, Path("000001.log.gz"), "".join(line + "\n" for line in lines), first_row)
+
+
+class TestOutputIndex:
+    """Test OutputIndex class."""
+
+    def test_search(self, index):
+        """Test hits carry session, line and terminal row."""
+        record(index, "s1", "make", 100.0, ["compiling", "error: missing semicolon", "done"], first_row=40)
+        hits = index.search("error")
+        assert len(hits) == 1
+        hit = hits[0]
+        assert (hit.session_id, hit.title, hit.line_no, hit.row) == ("s1", "make", 2, 41)
+        assert hit.text == "error: missing semicolon"
+
+    def test_all_words_required(self, index):
+        """Test every word must appear on the line."""
+        record(index, "s1", "make", 100.0, ["error in foo", "error in bar"])
+        assert [hit.text for hit in index.search("error bar")] == ["error in bar"]
+
+    def test_case_insensitive(self, index):
+        """Test matching ignores case."""
+        record(index, "s1", "make", 100.0, ["Permission Denied"])
+        assert len(index.search("permission denied")) == 1
+
+    def test_newest_session_first(self, index):
+        """Test hits of newer sessions come first."""
+        record(index, "old", "a", 100.0, ["failed"])
+        record(index, "new", "b", 200.0, ["failed"])
+        assert [hit.session_id for hit in index.search("failed")] == ["new", "old"]
+
+    def test_special_characters(self, index):
+        """Test query syntax characters are matched literally."""
+        record(index, "s1", "x", 100.0, ['say "hi" 100%', "100 percent"])
+        assert len(index.search('"hi"')) == 1
+        assert index.search("   ") == []
+
+    def test_line_numbers_continue(self, index):
+        """Test later writes continue the session's line numbers."""
+        record(index, "s1", "x", 100.0, ["one"])
+        index.output_written("s1", Path("000001.log.gz"), "two\n", 1)
+        assert index.search("two")[0].line_no == 2
+
+    def test_word_prefix(self, index):
+        """Test a query word matches words starting with it, with and without FTS5."""
+        record(index, "s1", "x", 100.0, ["ssh: connection refused"])
+        assert len(index.search("conn ref")) == 1
+
+    def test_segment_removed(self, index):
+        """Test lines of pruned segments leave the index."""
+        record(index, "s1", "x", 100.0, ["gone"])
+        index.output_written("s1", Path("000002.log.gz"), "kept\n", 2)
+        index.segment_removed("s1", Path("000001.log.gz"))
+        assert index.search("gone") == []
+        assert [hit.text for hit in index.search("kept")] == ["kept"]
+
+    def test_search_does_not_wait_for_writer(self, index):
+        """Test searching while the recorder thread is writing."""
+        record(index, "s1", "x", 100.0, ["found"])
+        hits = []
+        with index._lock:  # Held by the writer during inserts and deletes
+            searcher = threading.Thread(target=lambda: hits.extend(index.search("found")))
+            searcher.start()
+            searcher.join(timeout=5)
+            assert not searcher.is_alive()
+        assert len(hits) == 1
+
+    def test_old_schema_replaced(self, tmp_path):
+        """Test an index with an older schema is recreated."""
+        with sqlite3.connect(tmp_path / "index.db") as connection:
+            connection.execute("CREATE TABLE lines (text TEXT, session_id TEXT)")
+        index = OutputIndex(tmp_path / "index.db")
+        record(index, "s1", "x", 100.0, ["new"])
+        assert len(index.search("new")) == 1
+        index.close()
+
+
+class TestLocateRow:
+    """Test finding a hit's line in a terminal whose rows may have shifted."""
+
+    def test_recorded_row_still_matches(self):
+        """Test the recorded row is used while it holds the line."""
+        assert locate_row(["a", "make  ", "b", "make"], 10, "make", 11) == 11
+
+    def test_shifted_rows(self):
+        """Test the closest matching row is used after the contents moved."""
+        lines = ["make", "x", "y", "z", "make", "w"]
+        assert locate_row(lines, 100, "make", 105) == 104
+
+    def test_line_gone(self):
+        """Test None is returned when the line is no longer in the terminal."""
+        assert locate_row(["a", "b"], 0, "make", 1) is None
+
+
+class TestRecorderIntegration:
+    """Test indexing fed by the recorder thread."""
+
+    def test_recorded_output_searchable(self, tmp_path):
+        """Test output written through the recorder can be found."""
+        recorder = SessionRecorder(tmp_path / "sessions", flush_interval=0.05)
+        index = OutputIndex(tmp_path / "sessions" / "index.db")
+        recorder.listeners.append(index)
+        session_id = recorder.open_session("deploy")
+        recorder.write(session_id, "connecting\nssh: connection refused\n", first_row=3)
+        recorder.stop()
+
+        hits = index.search("refused")
+        assert [(hit.session_id, hit.title, hit.line_no, hit.row) for hit in hits] == [(session_id, "deploy", 2, 4)]
+        index.close()
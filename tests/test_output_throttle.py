@@ -0,0 +1,73 @@
+"""Tests for the terminal output rate governor."""
+
+import pytest
+
+from commando.terminal.throttle import OutputGovernor
+
+TICK = 0.25
+
+
+def run_ticks(governor, key, ticks, rows_per_tick, foreground=False, start=0.0, row=0):
+    """Simulate ticks where the tab writes rows_per_tick lines whenever it reads."""
+    flowing = governor.update(key, row, foreground, now=start)
+    decisions = []
+    for i in range(1, ticks + 1):
+        if flowing:
+            row += rows_per_tick
+        flowing = governor.update(key, row, foreground, now=start + i * TICK)
+        decisions.append(flowing)
+    return decisions
+
+
+class TestOutputGovernor:
+    """Test OutputGovernor class."""
+
+    def test_quiet_tab_flows(self):
+        """Test a background tab below the flood rate is not throttled."""
+        governor = OutputGovernor(flood_rows_per_second=1000, duty_cycle=0.2)
+        decisions = run_ticks(governor, "tab", 20, rows_per_tick=10)
+        assert all(decisions)
+        assert not governor.throttled("tab")
+
+    def test_flooding_background_tab_throttled(self):
+        """Test a flooding background tab reads only its share of the time."""
+        governor = OutputGovernor(flood_rows_per_second=1000, duty_cycle=0.2)
+        decisions = run_ticks(governor, "tab", 100, rows_per_tick=10000)
+        assert governor.throttled("tab")
+        assert sum(decisions) / len(decisions) == pytest.approx(0.2, abs=0.05)
+
+    def test_foreground_tab_never_paused(self):
+        """Test the tab the user looks at always reads output."""
+        governor = OutputGovernor(flood_rows_per_second=1000, duty_cycle=0.2)
+        decisions = run_ticks(governor, "tab", 20, rows_per_tick=10000, foreground=True)
+        assert all(decisions)
+
+    def test_flood_ends(self):
+        """Test a tab reads freely again once its output calms down."""
+        governor = OutputGovernor(flood_rows_per_second=1000, duty_cycle=0.5)
+        run_ticks(governor, "tab", 10, rows_per_tick=10000)
+        assert governor.throttled("tab")
+        decisions = run_ticks(governor, "tab", 10, rows_per_tick=1, start=10.0, row=10 ** 6)
+        assert not governor.throttled("tab")
+        assert all(decisions[-5:])
+
+    def test_reset(self):
+        """Test reset lets a throttled tab read immediately."""
+        governor = OutputGovernor(flood_rows_per_second=1000, duty_cycle=0.2)
+        run_ticks(governor, "tab", 10, rows_per_tick=10000)
+        governor.reset("tab")
+        assert not governor.throttled("tab")
+
+    def test_zero_duty_cycle_pauses(self):
+        """Test a zero share keeps flooding background tabs paused."""
+        governor = OutputGovernor(flood_rows_per_second=1000, duty_cycle=0)
+        decisions = run_ticks(governor, "tab", 20, rows_per_tick=10000)
+        assert not any(decisions[1:])
+
+    def test_remove(self):
+        """Test removed tabs start over."""
+        governor = OutputGovernor()
+        run_ticks(governor, "tab", 10, rows_per_tick=10000)
+        governor.remove("tab")
+        assert not governor.throttled("tab")
+        assert governor.update("tab", 0, False, now=100.0)
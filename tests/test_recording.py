@@ -0,0 +1,149 @@
+"""Tests for terminal session recording."""
+
+import gzip
+import os
+import threading
+
+import pytest
+
+from commando.terminal.recording import (
+    SEGMENT_SUFFIX, RecordingListener, SessionRecorder, read_segment, read_session
+)
+
+
+class Recorded(RecordingListener):
+    """Listener remembering what it was told."""
+
+    def __init__(self):
+        self.opened = []
+        self.written = []
+
+    def session_opened(self, session_id, title, started_at):
+        self.opened.append((session_id, title))
+
+    def output_written(self, session_id, path, text, first_row):
+        self.written.append((session_id, path.name, text, first_row))
+
+
+class TestSessionRecorder:
+    """Test SessionRecorder class."""
+
+    @pytest.fixture
+    def recorder(self, tmp_path):
+        """Create a recorder with small segments."""
+        recorder = SessionRecorder(tmp_path / "sessions", max_segment_bytes=100,
+                                   max_total_bytes=10 ** 6, flush_interval=0.05)
+        yield recorder
+        recorder.stop()
+
+    def test_write_and_read(self, recorder):
+        """Test output is written after a header line."""
+        session_id = recorder.open_session("echo")
+        recorder.write(session_id, "hello\n")
+        recorder.write(session_id, "world\n")
+        recorder.close_session(session_id)
+        recorder.stop()
+
+        text = read_session(recorder.directory / session_id)
+        assert text.startswith(f"# Commando session {session_id} (echo)")
+        assert text.endswith("hello\nworld\n")
+
+    def test_rotation(self, recorder):
+        """Test segments rotate once they reach the size limit."""
+        session_id = recorder.open_session()
+        lines = [f"line {i:03d} " + "x" * 40 + "\n" for i in range(10)]
+        for line in lines:
+            recorder.write(session_id, line)
+        recorder.stop()
+
+        segments = sorted((recorder.directory / session_id).glob(f"*{SEGMENT_SUFFIX}"))
+        assert len(segments) > 1
+        assert read_session(recorder.directory / session_id).endswith("".join(lines))
+
+    def test_prune(self, tmp_path):
+        """Test the oldest closed segments are removed over the total limit."""
+        recorder = SessionRecorder(tmp_path / "sessions", max_segment_bytes=1000,
+                                   max_total_bytes=1, flush_interval=0.05)
+        old = recorder.open_session()
+        recorder.write(old, "old output\n")
+        recorder.close_session(old)
+        new = recorder.open_session()
+        recorder.write(new, "a" * 900 + "\n")
+        recorder.write(new, "b" * 900 + "\n")
+        recorder.stop()
+
+        assert not (recorder.directory / old).exists()
+        assert list((recorder.directory / new).glob(f"*{SEGMENT_SUFFIX}"))
+
+    def test_prune_short_sessions(self, tmp_path):
+        """Test the total limit holds for many sessions that never rotate."""
+        recorder = SessionRecorder(tmp_path / "sessions", max_segment_bytes=10 ** 6,
+                                   max_total_bytes=4000, flush_interval=0.05)
+        for _ in range(50):
+            session_id = recorder.open_session()
+            recorder.write(session_id, "".join(os.urandom(32).hex() + "\n" for _ in range(5)))
+            recorder.close_session(session_id)
+        recorder.stop()
+
+        segments = list(recorder.directory.glob(f"*/*{SEGMENT_SUFFIX}"))
+        assert segments
+        assert sum(path.stat().st_size for path in segments) <= 4000
+        assert read_session(recorder.directory / session_id).endswith("\n")
+
+    def test_prune_at_startup(self, tmp_path):
+        """Test recordings left by an earlier run are pruned when the recorder starts."""
+        old = tmp_path / "sessions" / "old"
+        old.mkdir(parents=True)
+        (old / f"000001{SEGMENT_SUFFIX}").write_bytes(os.urandom(5000))
+        recorder = SessionRecorder(tmp_path / "sessions", max_total_bytes=1000, flush_interval=0.05)
+        recorder.stop()
+
+        assert not old.exists()
+
+    def test_listeners(self, recorder):
+        """Test listeners see sessions and written text with its segment and rows."""
+        listener = Recorded()
+        recorder.listeners.append(listener)
+        session_id = recorder.open_session("build")
+        recorder.write(session_id, "hello\n", first_row=7)
+        recorder.stop()
+
+        assert listener.opened == [(session_id, "build")]
+        header, output = listener.written
+        assert header[3] is None
+        assert output == (session_id, f"000001{SEGMENT_SUFFIX}", "hello\n", 7)
+
+    def test_rows_follow_rotation(self, recorder):
+        """Test rows of output split across segments stay correct."""
+        listener = Recorded()
+        recorder.listeners.append(listener)
+        session_id = recorder.open_session()
+        recorder.write(session_id, "".join(f"line {i:02d} " + "x" * 30 + "\n" for i in range(5)), first_row=10)
+        recorder.stop()
+
+        rows = [(row, text.split(" ")[1]) for _sid, _path, text, row in listener.written[1:]]
+        assert rows[0] == (10, "00")
+        assert all(row == 10 + int(first) for row, first in rows)
+        assert len({path for _sid, path, _text, _row in listener.written}) > 1
+
+    def test_read_open_segment(self, recorder):
+        """Test a segment still being written is readable."""
+        written = threading.Event()
+        listener = RecordingListener()
+        listener.output_written = lambda *args: written.set()
+        recorder.listeners.append(listener)
+        session_id = recorder.open_session()
+        recorder.write(session_id, "partial\n")
+        assert written.wait(5)
+
+        segment = next((recorder.directory / session_id).glob(f"*{SEGMENT_SUFFIX}"))
+        assert read_segment(segment).endswith("partial\n")
+
+    def test_closed_segment_is_gzip(self, recorder):
+        """Test finished segments are plain gzip files."""
+        session_id = recorder.open_session()
+        recorder.write(session_id, "done\n")
+        recorder.stop()
+        segment = next((recorder.directory / session_id).glob(f"*{SEGMENT_SUFFIX}"))
+        with gzip.open(segment, "rt") as f:
+            assert f.read().endswith("done\n")
@@ -0,0 +1,96 @@
+"""Tests for the per-tab process resource monitor."""
+
+import os
+
+import pytest
+
+from commando.terminal.monitor import CLOCK_TICKS, PAGE_SIZE, ResourceMonitor, format_bytes
+
+
+def write_process(proc, pid, ppid, ticks=0, rss_pages=0, comm="sh", read_bytes=0, write_bytes=0):
+    """Create the /proc files of a fake process."""
+    directory = proc / str(pid)
+    directory.mkdir(exist_ok=True)
+    # Fields after the command name: state ppid ... utime(11) stime(12) ... rss(21)
+    fields = ["S", str(ppid)] + ["0"] * 9 + [str(ticks), "0"] + ["0"] * 8 + [str(rss_pages)] + ["0"] * 5
+    (directory / "stat").write_text(f"{pid} ({comm} with ) in name) " + " ".join(fields))
+    (directory / "comm").write_text(comm + "\n")
+    (directory / "io").write_text(f"rchar: 1\nread_bytes: {read_bytes}\nwrite_bytes: {write_bytes}\n")
+
+
+class TestResourceMonitor:
+    """Test ResourceMonitor class."""
+
+    @pytest.fixture
+    def proc(self, tmp_path):
+        """Fake /proc with two tabs: shell 10 running 11 (with child 12), and shell 20."""
+        write_process(tmp_path, 1, 0, ticks=500, comm="init")
+        write_process(tmp_path, 10, 1, rss_pages=10, comm="bash")
+        write_process(tmp_path, 11, 10, rss_pages=20, comm="make")
+        write_process(tmp_path, 12, 11, rss_pages=30, comm="cc")
+        write_process(tmp_path, 20, 1, rss_pages=5, comm="bash")
+        (tmp_path / "self").mkdir()
+        return tmp_path
+
+    def test_aggregates_descendants(self, proc):
+        """Test a tab's usage covers the shell and all its descendants."""
+        usage = ResourceMonitor(proc).sample({"a": 10, "b": 20}, now=0)
+        assert usage["a"].process_count == 3
+        assert usage["a"].rss_bytes == 60 * PAGE_SIZE
+        assert usage["b"].process_count == 1
+        assert usage["b"].rss_bytes == 5 * PAGE_SIZE
+        assert usage["a"].cpu_percent == 0  # No previous sample yet
+
+    def test_cpu_percent_and_top_command(self, proc):
+        """Test CPU usage is the tick delta over the interval and names the busiest process."""
+        monitor = ResourceMonitor(proc)
+        monitor.sample({"a": 10, "b": 20}, now=0)
+        write_process(proc, 12, 11, ticks=CLOCK_TICKS, rss_pages=30, comm="cc")
+        usage = monitor.sample({"a": 10, "b": 20}, now=2)
+        assert usage["a"].cpu_percent == pytest.approx(50)
+        assert usage["a"].top_command == "cc"
+        assert usage["b"].cpu_percent == 0
+        assert usage["b"].top_command == "bash"
+
+    def test_new_process_counts_all_ticks(self, proc):
+        """Test a process started between samples counts its whole CPU time."""
+        monitor = ResourceMonitor(proc)
+        monitor.sample({"b": 20}, now=0)
+        write_process(proc, 21, 20, ticks=CLOCK_TICKS, comm="sleep")
+        usage = monitor.sample({"b": 20}, now=1)
+        assert usage["b"].cpu_percent == pytest.approx(100)
+
+    def test_io_rates(self, proc):
+        """Test I/O rates are computed from cumulative bytes."""
+        monitor = ResourceMonitor(proc)
+        monitor.sample({"b": 20}, now=0)
+        write_process(proc, 20, 1, comm="bash", read_bytes=4096, write_bytes=1024)
+        usage = monitor.sample({"b": 20}, now=4)
+        assert usage["b"].read_rate == 1024
+        assert usage["b"].write_rate == 256
+        assert "I/O" in usage["b"].summary()
+
+    def test_exited_shell(self, proc):
+        """Test a shell that is gone reports no usage."""
+        usage = ResourceMonitor(proc).sample({"gone": 99}, now=0)
+        assert usage["gone"].process_count == 0
+
+    def test_real_process(self):
+        """Test sampling the test process itself."""
+        usage = ResourceMonitor().sample({"me": os.getpid()})
+        assert usage["me"].process_count >= 1
+        assert usage["me"].rss_bytes > 0
+
+
+class TestFormatBytes:
+    """Test format_bytes function."""
+
+    @pytest.mark.parametrize("size,expected", [
+        (0, "0 B"),
+        (1536, "1.5 KiB"),
+        (3 * 1024 ** 2, "3.0 MiB"),
+        (5 * 1024 ** 4, "5120.0 GiB"),
+    ])
+    def test_units(self, size, expected):
+        """Test sizes use the largest fitting unit."""
+        assert format_bytes(size) == expected
@@ -0,0 +1,157 @@
+"""Tests for scheduled command execution."""
+
+import pytest
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from commando.models.command import Command
+from commando.scheduler import (
+    CronSchedule, IntervalSchedule, ScheduleHistory, Scheduler, parse_duration, parse_schedule
+)
+
+
+def ts(*args) -> float:
+    """Local timestamp for a datetime."""
+    return datetime(*args).timestamp()
+
+
+class TestParsing:
+    """Test schedule expression parsing."""
+    
+    def test_parse_duration(self):
+        """Test duration parsing."""
+        assert parse_duration("90s") == 90
+        assert parse_duration("15m") == 900
+        assert parse_duration("1h30m") == 5400
+        assert parse_duration("120") == 120
+    
+    @pytest.mark.parametrize("text", ["", "0s", "1x", "5m junk"])
+    def test_parse_duration_invalid(self, text):
+        """Test malformed durations are rejected."""
+        with pytest.raises(ValueError):
+            parse_duration(text)
+    
+    def test_parse_every(self):
+        """Test @every expressions give interval schedules."""
+        schedule = parse_schedule("@every 10m")
+        assert isinstance(schedule, IntervalSchedule)
+        assert schedule.next_after(1000.0) == 1600.0
+    
+    @pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "*/0 * * * *", "5-1 * * * *", "@often"])
+    def test_parse_cron_invalid(self, expression):
+        """Test invalid cron expressions are rejected."""
+        with pytest.raises(ValueError):
+            parse_schedule(expression)
+
+
+class TestCronSchedule:
+    """Test cron next-run computation."""
+    
+    def test_step_minutes(self):
+        """Test */15 runs at the next quarter hour."""
+        schedule = CronSchedule("*/15 * * * *")
+        assert schedule.next_after(ts(2024, 3, 5, 10, 7)) == ts(2024, 3, 5, 10, 15)
+        assert schedule.next_after(ts(2024, 3, 5, 10, 15)) == ts(2024, 3, 5, 10, 30)
+    
+    def test_day_rollover(self):
+        """Test daily schedules roll over to the next day."""
+        schedule = parse_schedule("@daily")
+        assert schedule.next_after(ts(2024, 12, 31, 23, 59)) == ts(2025, 1, 1, 0, 0)
+    
+    def test_weekday_names(self):
+        """Test weekday names select the right day."""
+        schedule = CronSchedule("30 9 * * mon")
+        # 2024-03-06 is a Wednesday, next Monday is 2024-03-11
+        assert schedule.next_after(ts(2024, 3, 6, 12, 0)) == ts(2024, 3, 11, 9, 30)
+    
+    def test_day_fields_match_either(self):
+        """Test restricted day-of-month and day-of-week are ORed."""
+        schedule = CronSchedule("0 0 13 * 5")
+        # 2024-03-08 is a Friday, before the 13th
+        assert schedule.next_after(ts(2024, 3, 6, 0, 0)) == ts(2024, 3, 8, 0, 0)
+    
+    def test_month_restriction(self):
+        """Test month field skips whole months."""
+        schedule = CronSchedule("0 12 1 jun *")
+        assert schedule.next_after(ts(2024, 7, 1, 0, 0)) == ts(2025, 6, 1, 12, 0)
+    
+    def test_never_matches(self):
+        """Test impossible dates raise instead of looping forever."""
+        with pytest.raises(ValueError):
+            CronSchedule("0 0 30 2 *").next_after(ts(2024, 1, 1))
+
+
+class TestScheduler:
+    """Test the scheduler heap and run dispatch."""
+    
+    @pytest.fixture
+    def scheduler(self, temp_data_dir):
+        """Create a scheduler with a mock executor."""
+        with patch('commando.scheduler.Config') as mock_config:
+            mock_instance = mock_config.return_value
+            mock_instance.get_state_dir.return_value = temp_data_dir
+            mock_instance.get.side_effect = lambda key, default=None: default
+            yield Scheduler(Mock())
+    
+    def test_sync_ignores_unscheduled_and_invalid(self, scheduler):
+        """Test only valid schedules are added."""
+        scheduler.sync([
+            Command(number=1, title="A", command="a"),
+            Command(number=2, title="B", command="b", schedule="@every 1m"),
+            Command(number=3, title="C", command="c", schedule="bogus"),
+        ], now=0.0)
+        assert scheduler.next_due() == 60.0
+        assert list(scheduler._entries) == [2]
+    
+    def test_pop_due_orders_by_time(self, scheduler):
+        """Test due entries come out earliest first and are rescheduled."""
+        scheduler.sync([
+            Command(number=1, title="A", command="a", schedule="@every 5m"),
+            Command(number=2, title="B", command="b", schedule="@every 1m"),
+        ], now=0.0)
+        assert scheduler.pop_due(30.0) == []
+        assert [number for number, _, _ in scheduler.pop_due(60.0)] == [2]
+        assert scheduler.next_due() == 120.0
+    
+    def test_pop_due_coalesces_missed_runs(self, scheduler):
+        """Test a long gap (e.g. suspend) yields one catch-up run per command."""
+        scheduler.sync([Command(number=1, title="A", command="a", schedule="@every 1m")], now=0.0)
+        due = scheduler.pop_due(3600.0)
+        assert due == [(1, 60.0, True)]
+        assert scheduler.next_due() == 3660.0
+    
+    def test_sync_removes_and_replaces(self, scheduler):
+        """Test changed or removed schedules cancel old entries."""
+        scheduler.sync([Command(number=1, title="A", command="a", schedule="@every 1m")], now=0.0)
+        scheduler.sync([Command(number=1, title="A", command="a", schedule="@every 2m")], now=0.0)
+        assert scheduler.next_due() == 120.0
+        scheduler.sync([], now=0.0)
+        assert scheduler.next_due() is None
+    
+    def test_run_goes_through_job_queue(self, scheduler):
+        """Test scheduled runs are submitted to the executor queue and recorded."""
+        command = Command(number=1, title="A", command="a", schedule="@every 1m")
+        scheduler.sync([command], now=0.0)
+        job = Mock(command=command, started_at=61.0, ended_at=62.0, exit_status=0, timed_out=False)
+        scheduler.executor.enqueue.return_value = job
+        
+        scheduler._run(1, 60.0, False)
+        
+        scheduler.executor.enqueue.assert_called_once_with(command)
+        callback = job.add_done_callback.call_args.args[0]
+        callback(job)
+        assert scheduler.history.for_command(1)[0]["exit_status"] == 0
+
+
+class TestScheduleHistory:
+    """Test bounded run history."""
+    
+    def test_history_is_bounded_and_persisted(self, temp_data_dir):
+        """Test the oldest records are dropped and the rest survive reload."""
+        path = temp_data_dir / "history.json"
+        history = ScheduleHistory(path, max_entries=3)
+        for i in range(5):
+            history.record({"number": i})
+        
+        reloaded = ScheduleHistory(path, max_entries=3)
+        assert [e["number"] for e in reloaded.entries] == [2, 3, 4]
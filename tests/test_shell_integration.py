@@ -0,0 +1,165 @@
+"""Tests for terminal shell integration."""
+
+import os
+import pty
+import shutil
+import subprocess
+import time
+
+import pytest
+
+from commando.terminal.shell_integration import (
+    EVENTS_ENV, ShellEvent, ShellEventChannel, ShellEventParser, ShellState, TerminalRun,
+    install_scripts, integrate_shell
+)
+
+
+class TestShellEventParser:
+    """Test OSC marker parsing."""
+    
+    def test_parse_markers(self):
+        """Test OSC 133 markers with BEL and ST terminators."""
+        events = ShellEventParser().feed(b"\x1b]133;A\x07\x1b]133;D;2\x1b\\")
+        assert [e.kind for e in events] == ["A", "D"]
+        assert events[1].exit_status == 2
+    
+    def test_partial_sequences(self):
+        """Test sequences split across reads are reassembled."""
+        parser = ShellEventParser()
+        assert parser.feed(b"\x1b]133;") == []
+        assert parser.feed(b"C\x07\x1b]13")[0].kind == "C"
+        assert parser.feed(b"3;D;0\x07")[0].exit_status == 0
+    
+    def test_cwd(self):
+        """Test OSC 7 reports are decoded to paths."""
+        events = ShellEventParser().feed(b"\x1b]7;file://host/home/me/My%20Dir\x07")
+        assert events == [ShellEvent("cwd", ["/home/me/My Dir"])]
+    
+    def test_ignores_other_sequences(self):
+        """Test unrelated OSC sequences and text are skipped."""
+        assert ShellEventParser().feed(b"text\x1b]0;title\x07more") == []
+
+
+class TestShellState:
+    """Test run tracking from markers."""
+    
+    def test_run_lifecycle(self):
+        """Test a submitted run gets start, end, status and duration."""
+        state = ShellState()
+        assert not state.integrated
+        state.handle(ShellEvent("A"), when=1.0)
+        assert state.idle
+        
+        run = TerminalRun("make")
+        finished = []
+        run.add_done_callback(finished.append)
+        state.submit(run)
+        assert not state.idle
+        
+        state.handle(ShellEvent("C"), when=2.0)
+        assert state.state == ShellState.RUNNING
+        state.handle(ShellEvent("D", ["1"]), when=5.5)
+        
+        assert finished == [run]
+        assert run.exit_status == 1
+        assert run.duration == 3.5
+        assert state.idle
+    
+    def test_empty_prompt_does_not_finish_run(self):
+        """Test D markers without a started command are ignored."""
+        state = ShellState()
+        run = TerminalRun("ls")
+        state.submit(run)
+        state.handle(ShellEvent("D", ["0"]))
+        assert not run.finished
+    
+    def test_abandon(self):
+        """Test outstanding runs finish without status when the shell exits."""
+        state = ShellState()
+        run = TerminalRun("ls")
+        state.submit(run)
+        state.abandon()
+        assert run.finished
+        assert run.exit_status is None
+    
+    def test_done_callback_after_finish(self):
+        """Test callbacks added late still fire."""
+        run = TerminalRun("ls")
+        run._finish(0, time.time())
+        called = []
+        run.add_done_callback(called.append)
+        assert called == [run]
+
+
+class TestIntegrateShell:
+    """Test shell argv and environment setup."""
+    
+    def test_bash(self, tmp_path):
+        """Test bash loads the init file instead of login files."""
+        argv = integrate_shell(["/bin/bash", "-l"], {}, tmp_path)
+        assert argv == ["/bin/bash", "--init-file", str(tmp_path / "bash-integration.bash"), "-i"]
+    
+    def test_zsh(self, tmp_path):
+        """Test zsh is redirected through ZDOTDIR, keeping the original."""
+        env = {"ZDOTDIR": "/home/me/.config/zsh"}
+        argv = integrate_shell(["/usr/bin/zsh", "-l"], env, tmp_path)
+        assert argv == ["/usr/bin/zsh", "-l"]
+        assert env["ZDOTDIR"] == str(tmp_path / "zsh")
+        assert env["COMMANDO_ORIG_ZDOTDIR"] == "/home/me/.config/zsh"
+    
+    def test_fish(self, tmp_path):
+        """Test fish sources the script via --init-command."""
+        argv = integrate_shell(["/usr/bin/fish"], {}, tmp_path)
+        assert argv[1] == "--init-command"
+    
+    def test_unsupported_shell(self, tmp_path):
+        """Test other shells run unchanged."""
+        assert integrate_shell(["/bin/dash"], {}, tmp_path) == ["/bin/dash"]
+    
+    def test_install_scripts(self, tmp_path):
+        """Test scripts are written for every supported shell."""
+        install_scripts(tmp_path)
+        assert (tmp_path / "bash-integration.bash").exists()
+        assert (tmp_path / "zsh" / ".zshenv").exists()
+        assert (tmp_path / "fish-integration.fish").exists()
+
+
+class TestShellEventChannel:
+    """Test the marker FIFO."""
+    
+    def test_read_events(self, tmp_path):
+        """Test markers written by another process are read back."""
+        channel = ShellEventChannel(tmp_path / "events")
+        try:
+            assert channel.read_events() == []
+            with open(channel.path, "ab") as f:
+                f.write(b"\x1b]133;C\x07")
+            assert [e.kind for e in channel.read_events()] == ["C"]
+        finally:
+            channel.close()
+        assert not (tmp_path / "events").exists()
+    
+    @pytest.mark.integration
+    @pytest.mark.skipif(shutil.which("bash") is None, reason="bash not installed")
+    def test_bash_reports_exit_status(self, tmp_path):
+        """Test an interactive bash with the integration reports command markers."""
+        script_dir = install_scripts(tmp_path / "scripts")
+        channel = ShellEventChannel(tmp_path / "events")
+        env = {"HOME": str(tmp_path), "PATH": os.environ.get("PATH", ""), EVENTS_ENV: str(channel.path)}
+        argv = integrate_shell(["bash", "-l"], env, script_dir)
+        master, slave = pty.openpty()
+        try:
+            process = subprocess.Popen(argv, stdin=slave, stdout=slave, stderr=slave, env=env,
+                                       start_new_session=True)
+            os.write(master, b"false\nexit\n")
+            process.wait(timeout=10)
+            events = channel.read_events()
+        finally:
+            os.close(master)
+            os.close(slave)
+            channel.close()
+        
+        kinds = [e.kind for e in events]
+        assert "C" in kinds
+        after_start = events[kinds.index("C") + 1:]
+        assert [e.exit_status for e in after_start if e.kind == "D"][0] == 1
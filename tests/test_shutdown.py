@@ -0,0 +1,148 @@
+"""Tests for parallel shell termination on shutdown."""
+
+import subprocess
+import time
+
+import pytest
+
+import commando.terminal.shutdown as shutdown
+from commando.terminal.shutdown import ShutdownCoordinator, _pid_alive
+
+
+def spawn(script):
+    """Start a shell script in its own process group."""
+    process = subprocess.Popen(["/bin/sh", "-c", script], start_new_session=True)
+    time.sleep(0.05)  # Let the trap be installed
+    return process
+
+
+@pytest.fixture
+def processes():
+    """Collect processes and reap them after the test."""
+    started = []
+    yield started
+    for process in started:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+        process.wait()
+
+
+@pytest.fixture
+def glib():
+    """The (mocked) GLib used by the coordinator, with calls recorded per test."""
+    shutdown.GLib.reset_mock()
+    return shutdown.GLib
+
+
+class TestShutdownCoordinator:
+    """Test ShutdownCoordinator class."""
+
+    def test_empty(self):
+        """Test nothing to do returns immediately."""
+        result = ShutdownCoordinator().run()
+        assert result.exited == [] and result.killed == []
+
+    def test_hangup_exits_without_kill(self, processes):
+        """Test shells that honour SIGHUP are not killed."""
+        processes.extend(spawn("sleep 30") for _ in range(5))
+        coordinator = ShutdownCoordinator(grace_seconds=5)
+        for process in processes:
+            coordinator.add(process.pid)
+
+        result = coordinator.run()
+
+        assert sorted(result.exited) == sorted(process.pid for process in processes)
+        assert result.killed == []
+        assert result.elapsed < 2
+
+    def test_waits_concurrently_then_kills(self, processes):
+        """Test the grace period is shared, not spent per shell."""
+        processes.extend(spawn("trap '' HUP; while :; do sleep 0.1; done") for _ in range(5))
+        coordinator = ShutdownCoordinator(grace_seconds=0.5)
+        for process in processes:
+            coordinator.add(process.pid)
+
+        result = coordinator.run()
+
+        assert sorted(result.killed) == sorted(process.pid for process in processes)
+        assert 0.5 <= result.elapsed < 1.5
+        for process in processes:
+            assert process.wait(timeout=2) == -9
+
+    def test_mixed(self, processes):
+        """Test only shells ignoring the hangup are killed."""
+        polite = spawn("sleep 30")
+        stubborn = spawn("trap '' HUP; while :; do sleep 0.1; done")
+        processes.extend([polite, stubborn])
+        coordinator = ShutdownCoordinator(grace_seconds=0.3)
+        coordinator.add(polite.pid)
+        coordinator.add(stubborn.pid)
+
+        result = coordinator.run()
+
+        assert result.exited == [polite.pid]
+        assert result.killed == [stubborn.pid]
+
+    def test_pid_alive(self, processes):
+        """Test zombies count as exited."""
+        process = spawn("exit 0")
+        processes.append(process)
+        time.sleep(0.1)
+        assert not _pid_alive(process.pid)
+        sleeper = spawn("sleep 30")
+        processes.append(sleeper)
+        assert _pid_alive(sleeper.pid)
+
+    def test_start_does_not_block(self, processes, glib):
+        """Test start() returns at once and finishes when the main loop reports the exits."""
+        processes.extend(spawn("sleep 30") for _ in range(3))
+        coordinator = ShutdownCoordinator(grace_seconds=5)
+        for process in processes:
+            coordinator.add(process.pid)
+        results = []
+
+        started = time.monotonic()
+        coordinator.start(results.append)
+        assert time.monotonic() - started < 0.5
+        assert results == [] and not coordinator.done
+
+        for process in processes:
+            process.wait(timeout=2)
+        # Dispatch the pidfd watches as the main loop would
+        for call in glib.unix_fd_add_full.call_args_list:
+            _priority, fd, _condition, callback, pid = call.args
+            callback(fd, None, pid)
+
+        assert len(results) == 1 and coordinator.done
+        assert sorted(results[0].exited) == sorted(process.pid for process in processes)
+        assert results[0].killed == []
+        glib.source_remove.assert_called_once()  # The deadline
+
+    def test_start_kills_at_deadline(self, processes, glib):
+        """Test shells still running when the deadline fires are killed."""
+        stubborn = spawn("trap '' HUP; while :; do sleep 0.1; done")
+        processes.append(stubborn)
+        coordinator = ShutdownCoordinator(grace_seconds=0.2)
+        coordinator.add(stubborn.pid)
+        results = []
+        coordinator.start(results.append)
+
+        on_deadline = glib.timeout_add.call_args_list[-1].args[1]
+        on_deadline()
+
+        assert results[0].killed == [stubborn.pid]
+        assert stubborn.wait(timeout=2) == -9
+
+    def test_run_completes_started_wait(self, processes, glib):
+        """Test run() finishes a wait begun by start(), e.g. when quitting meanwhile."""
+        processes.append(spawn("sleep 30"))
+        coordinator = ShutdownCoordinator(grace_seconds=5)
+        coordinator.add(processes[0].pid)
+        coordinator.start()
+
+        result = coordinator.run()
+
+        assert result.exited == [processes[0].pid]
+        assert coordinator.run() is result
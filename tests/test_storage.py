@@ -9,6 +9,7 @@ from unittest.mock import patch, mock_open
 
 from commando.models.command import Command
 from commando.storage.command_storage import CommandStorage
+from commando.storage.usage_metrics import UsageMetrics
 
 
 class TestCommandStorage:
@@ -49,6 +50,16 @@ class TestCommandStorage:
         all_commands = temp_storage.get_all()
         assert len(all_commands) == 3
     
+    def test_update_interns_edited_fields(self, temp_storage):
+        """Test fields of a card edited in place share strings with other cards after saving."""
+        command = temp_storage.get_all()[0]
+        command.category = "".join(["Net", "work"])  # A new string object, as typed in the editor
+        command.color = "".join(["pur", "ple"])
+        assert temp_storage.update(command) is True
+        other = Command(number=999, title="Other", command="cmd", category="Network", color="purple")
+        assert command.category is other.category
+        assert command.color is other.color
+    
     def test_get_by_number(self, temp_storage, mock_command):
         """Test getting command by number."""
         temp_storage.add(mock_command)
@@ -119,3 +130,35 @@ class TestCommandStorage:
             assert found is not None
             assert found.title == "Test"
 
+
+
+class TestUsageMetrics:
+    """Test UsageMetrics class."""
+    
+    def test_record_and_persist(self, temp_data_dir):
+        """Test runs are aggregated and survive reload."""
+        path = temp_data_dir / "usage.json"
+        metrics = UsageMetrics(path)
+        metrics.record(1, 10.0, 12.0, 0)
+        metrics.record(1, 20.0, 24.0, 2)
+        metrics.record(2, 30.0, None, None)
+        
+        reloaded = UsageMetrics(path)
+        stats = reloaded.get(1)
+        assert stats["runs"] == 2
+        assert stats["failures"] == 1
+        assert stats["last_exit_status"] == 2
+        assert reloaded.average_duration(1) == 3.0
+        assert reloaded.get(2)["failures"] == 0
+        assert reloaded.get(3) is None
+    
+    def test_writes_debounced(self, temp_data_dir):
+        """Test runs are written together after a delay, or by flush()."""
+        path = temp_data_dir / "usage.json"
+        metrics = UsageMetrics(path)
+        metrics.record(1, 10.0, 12.0, 0)
+        metrics.record(1, 20.0, 24.0, 0)
+        assert not path.exists()
+        
+        metrics.flush()
+        assert json.loads(path.read_text())["1"]["runs"] == 2
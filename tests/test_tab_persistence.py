@@ -0,0 +1,96 @@
+"""Tests for terminal tab snapshots."""
+
+import threading
+
+import pytest
+
+from commando.terminal.persistence import MAX_COMMANDS, TabSessionStore, TabSnapshot, new_tab_id
+
+
+class TestTabSnapshot:
+    """Test TabSnapshot class."""
+
+    def test_commands_bounded(self):
+        """Test only the most recent commands are kept."""
+        snapshot = TabSnapshot(new_tab_id())
+        for i in range(MAX_COMMANDS + 5):
+            snapshot.add_command(f"cmd {i}")
+        assert len(snapshot.commands) == MAX_COMMANDS
+        assert snapshot.commands[-1] == f"cmd {MAX_COMMANDS + 4}"
+
+    def test_from_dict_ignores_unknown(self):
+        """Test snapshots from newer versions still load."""
+        snapshot = TabSnapshot.from_dict({"tab_id": "x", "cwd": "/tmp", "future": 1})
+        assert snapshot.tab_id == "x"
+        assert snapshot.cwd == "/tmp"
+
+
+class TestTabSessionStore:
+    """Test TabSessionStore class."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Create a store in a temporary directory."""
+        store = TabSessionStore(tmp_path / "tabs")
+        yield store
+        store.close()
+
+    def test_empty(self, store):
+        """Test a fresh store has no tabs."""
+        assert store.load() == ([], None)
+
+    def test_roundtrip(self, store, tmp_path):
+        """Test tabs are restored in order with their selection."""
+        first = TabSnapshot(new_tab_id(), "build", "/srv", ["make"])
+        second = TabSnapshot(new_tab_id(), "logs", "/var/log")
+        for snapshot in (first, second):
+            store.save_snapshot(snapshot)
+        store.save_order([second.tab_id, first.tab_id], selected=first.tab_id)
+
+        snapshots, selected = TabSessionStore(tmp_path / "tabs").load()
+        assert [s.title for s in snapshots] == ["logs", "build"]
+        assert snapshots[1].commands == ["make"]
+        assert selected == first.tab_id
+
+    def test_scrollback(self, store):
+        """Test scrollback is stored compressed and read back."""
+        store.save_scrollback("abc", b"output\n" * 100, wait=True)
+        assert (store.directory / "abc.txt.gz").stat().st_size < 700
+        assert store.load_scrollback("abc") == b"output\n" * 100
+        assert store.load_scrollback("missing") == b""
+
+    def test_scrollback_read_on_writer_thread(self, store):
+        """Test scrollback given as a function is read by the background thread."""
+        threads = []
+
+        def read():
+            threads.append(threading.current_thread())
+            return b"hibernated\n"
+
+        store.save_scrollback("abc", read, wait=True)
+        assert store.load_scrollback("abc") == b"hibernated\n"
+        assert threads and threads[0] is not threading.current_thread()
+
+    def test_remove(self, store):
+        """Test closed tabs lose their files."""
+        snapshot = TabSnapshot("abc")
+        store.save_snapshot(snapshot)
+        store.save_scrollback("abc", b"x", wait=True)
+        store.remove("abc")
+        store.close()
+        assert list(store.directory.iterdir()) == []
+
+    def test_missing_snapshot_skipped(self, store):
+        """Test order entries without a snapshot file are skipped."""
+        store.save_snapshot(TabSnapshot("abc"))
+        store.save_order(["gone", "abc"])
+        snapshots, _selected = store.load()
+        assert [s.tab_id for s in snapshots] == ["abc"]
+
+    def test_prune(self, store):
+        """Test files of tabs no longer listed are deleted."""
+        store.save_snapshot(TabSnapshot("keep"))
+        store.save_snapshot(TabSnapshot("stale"))
+        store.save_order(["keep"])
+        store.prune({"keep"})
+        assert sorted(path.name for path in store.directory.iterdir()) == ["keep.json", "tabs.json"]
@@ -0,0 +1,87 @@
+"""Tests for terminal tab reuse policies."""
+
+import pytest
+
+from commando.terminal.reuse import (
+    POLICY_IDLE, POLICY_LRU, POLICY_NEW, POLICY_PER_CARD, TabReuseEngine
+)
+
+
+def make_engine(policy, tabs, max_tabs=10):
+    """Create an engine tracking tabs, used in list order."""
+    engine = TabReuseEngine(policy, max_tabs)
+    for card_key, terminal in tabs:
+        engine.assign(card_key, terminal)
+    return engine
+
+
+class TestTabReuseEngine:
+    """Test TabReuseEngine class."""
+
+    @pytest.fixture
+    def tabs(self):
+        """Tabs "a", "b" and "c" used by cards 1, 2 and 3 in that order."""
+        return [(1, "a"), (2, "b"), (3, "c")]
+
+    def test_new_policy(self, tabs):
+        """Test the new policy never reuses tabs."""
+        engine = make_engine(POLICY_NEW, tabs)
+        assert engine.choose(1, lambda tab: True).new_tab
+
+    def test_idle_prefers_card_tab(self, tabs):
+        """Test the idle policy reuses the card's previous tab."""
+        engine = make_engine(POLICY_IDLE, tabs)
+        assert engine.choose(1, lambda tab: True).terminal == "a"
+
+    def test_idle_most_recent_idle_tab(self, tabs):
+        """Test the idle policy falls back to the most recently used idle tab."""
+        engine = make_engine(POLICY_IDLE, tabs)
+        assert engine.choose(1, lambda tab: tab == "b").terminal == "b"
+        assert engine.choose(9, lambda tab: True).terminal == "c"
+
+    def test_idle_none_idle(self, tabs):
+        """Test the idle policy opens a new tab when all are busy."""
+        engine = make_engine(POLICY_IDLE, tabs)
+        assert engine.choose(1, lambda tab: False).new_tab
+
+    def test_per_card(self, tabs):
+        """Test the per-card policy only reuses the card's own tab."""
+        engine = make_engine(POLICY_PER_CARD, tabs)
+        assert engine.choose(2, lambda tab: True).terminal == "b"
+        assert engine.choose(2, lambda tab: tab != "b").new_tab
+        assert engine.choose(9, lambda tab: True).new_tab
+
+    def test_lru_below_limit(self, tabs):
+        """Test the lru policy opens tabs until the limit."""
+        engine = make_engine(POLICY_LRU, tabs, max_tabs=4)
+        assert engine.choose(1, lambda tab: True).new_tab
+
+    def test_lru_recycles_oldest_idle(self, tabs):
+        """Test the lru policy reuses the least recently used idle tab at the limit."""
+        engine = make_engine(POLICY_LRU, tabs, max_tabs=3)
+        assert engine.choose(9, lambda tab: tab != "a").terminal == "b"
+
+    def test_lru_evicts_when_all_busy(self, tabs):
+        """Test the lru policy replaces the oldest tab when every tab is busy."""
+        engine = make_engine(POLICY_LRU, tabs, max_tabs=3)
+        choice = engine.choose(9, lambda tab: False)
+        assert choice.new_tab
+        assert choice.evict == "a"
+
+    def test_touch_updates_order(self, tabs):
+        """Test using a tab makes it most recently used."""
+        engine = make_engine(POLICY_LRU, tabs, max_tabs=3)
+        engine.touch("a")
+        assert engine.choose(9, lambda tab: True).terminal == "b"
+
+    def test_remove(self, tabs):
+        """Test closed tabs are forgotten, including card assignments."""
+        engine = make_engine(POLICY_PER_CARD, tabs)
+        engine.remove("a")
+        assert engine.tab_count == 2
+        assert engine.choose(1, lambda tab: True).new_tab
+
+    def test_unknown_policy(self, tabs):
+        """Test unknown policies behave like new."""
+        engine = make_engine("bogus", tabs)
+        assert engine.choose(1, lambda tab: True).new_tab
@@ -0,0 +1,108 @@
+"""Tests for the warm terminal pool."""
+
+import pytest
+from unittest.mock import Mock
+
+from commando.terminal.pool import WarmTerminalPool
+
+
+class TestWarmTerminalPool:
+    """Test WarmTerminalPool class."""
+    
+    @pytest.fixture
+    def spawned(self):
+        """Record spawn callbacks so tests can complete spawns."""
+        return []
+    
+    @pytest.fixture
+    def discarded(self):
+        """Record terminals the pool discards."""
+        return []
+    
+    @pytest.fixture
+    def pool(self, spawned, discarded):
+        """Create a pool whose spawns complete on demand."""
+        def spawn(on_ready):
+            terminal = Mock()
+            spawned.append((terminal, on_ready))
+            return terminal
+        return WarmTerminalPool(spawn, size=2, discard=discarded.append)
+    
+    def test_acquire_empty(self, pool):
+        """Test acquiring from an empty pool returns None."""
+        assert pool.acquire() is None
+    
+    def test_refill_spawns_up_to_size(self, pool, spawned):
+        """Test refill never spawns more than the pool size."""
+        for _ in range(5):
+            pool._refill()
+        assert len(spawned) == 2
+    
+    def test_acquire_ready_terminal(self, pool, spawned):
+        """Test spawned terminals become available in FIFO order."""
+        pool._refill()
+        terminal, on_ready = spawned[0]
+        on_ready(terminal, True)
+        
+        assert pool.ready_count == 1
+        assert pool.acquire() is terminal
+        assert pool.ready_count == 0
+        terminal.disconnect_by_func.assert_called_once()
+    
+    def test_failed_spawn_not_added(self, pool, spawned, discarded):
+        """Test failed spawns do not enter the pool."""
+        pool._refill()
+        terminal, on_ready = spawned[0]
+        on_ready(terminal, False)
+        assert pool.ready_count == 0
+        assert discarded == [terminal]
+    
+    def test_exited_shell_dropped(self, pool, spawned):
+        """Test terminals whose shell exits are removed."""
+        pool._refill()
+        terminal, on_ready = spawned[0]
+        on_ready(terminal, True)
+        pool._on_child_exited(terminal, 0)
+        assert pool.acquire() is None
+    
+    def test_resize_returns_surplus(self, pool, spawned):
+        """Test shrinking the pool hands back surplus terminals."""
+        pool._refill()
+        pool._refill()
+        for terminal, on_ready in spawned:
+            on_ready(terminal, True)
+        
+        surplus = pool.resize(1)
+        assert len(surplus) == 1
+        assert pool.ready_count == 1
+    
+    def test_drain(self, pool, spawned):
+        """Test draining empties the pool and stops refills."""
+        pool._refill()
+        terminal, on_ready = spawned[0]
+        on_ready(terminal, True)
+        
+        assert pool.drain() == [terminal]
+        pool._refill()
+        assert len(spawned) == 1
+    
+    def test_spawn_completing_after_drain_discarded(self, pool, spawned, discarded):
+        """Test a spawn still in flight when the pool is drained is not kept."""
+        pool._refill()
+        terminal, on_ready = spawned[0]
+        assert pool.drain() == []
+        on_ready(terminal, True)
+        
+        assert pool.ready_count == 0
+        assert discarded == [terminal]
+    
+    def test_spawn_completing_after_resize_discarded(self, pool, spawned, discarded):
+        """Test spawns beyond a reduced size are discarded when they complete."""
+        pool._refill()
+        pool._refill()
+        pool.resize(1)
+        for terminal, on_ready in spawned:
+            on_ready(terminal, True)
+        
+        assert pool.ready_count == 1
+        assert discarded == [spawned[1][0]]
@@ -0,0 +1,102 @@
+"""Tests for terminal profiles."""
+
+import pytest
+
+from commando.terminal import profiles as profiles_module
+from commando.terminal.profiles import DEFAULT_PROFILE, TerminalProfile, TerminalProfiles
+
+
+class FakeConfig:
+    """Config stand-in reading dotted keys from a flat dict."""
+
+    def __init__(self, values=None):
+        self.values = dict(values or {})
+
+    def get(self, key, default=None):
+        value = self.values.get(key)
+        return default if value is None else value
+
+
+@pytest.fixture
+def config():
+    """Config with a global font and two profiles."""
+    return FakeConfig({
+        "terminal.font": "Monospace 11",
+        "terminal.profiles": {
+            "prod": {"background_color": "#400000", "env": {"KUBECONFIG": "~/.kube/prod"}},
+            "remote": {"shell": "ssh -t host", "cwd": "~/work", "font": "Monospace 14"},
+        },
+    })
+
+
+class TestTerminalProfile:
+    """Test TerminalProfile class."""
+
+    def test_changed_fields(self):
+        """Test only differing appearance fields are reported."""
+        old = TerminalProfile(font="Monospace 10")
+        new = TerminalProfile(font="Monospace 12", shell="zsh")
+        assert old.changed_fields(new) == {"font"}
+
+    def test_shell_args(self):
+        """Test the shell command line is split like a shell would."""
+        assert TerminalProfile(shell="ssh -t 'my host'").shell_args() == ["ssh", "-t", "my host"]
+        assert TerminalProfile().shell_args() is None
+
+    def test_working_directory_expanded(self, monkeypatch):
+        """Test ~ in the directory is expanded."""
+        monkeypatch.setenv("HOME", "/home/user")
+        assert TerminalProfile(cwd="~/src").working_directory() == "/home/user/src"
+        assert TerminalProfile().working_directory() is None
+
+
+class TestTerminalProfiles:
+    """Test TerminalProfiles class."""
+
+    def test_profiles_override_defaults(self, config):
+        """Test named profiles inherit the global settings they do not override."""
+        profiles = TerminalProfiles(config)
+        assert profiles.names() == [DEFAULT_PROFILE, "prod", "remote"]
+        assert profiles.get("prod").font == "Monospace 11"
+        assert profiles.get("prod").background_color == "#400000"
+        assert profiles.get("remote").font == "Monospace 14"
+        assert profiles.get().name == DEFAULT_PROFILE
+
+    def test_unknown_profile_falls_back(self, config):
+        """Test an unknown name gives the default profile."""
+        assert TerminalProfiles(config).get("missing").name == DEFAULT_PROFILE
+
+    def test_invalid_profiles_ignored(self):
+        """Test malformed profiles and unknown settings do not break loading."""
+        config = FakeConfig({"terminal.profiles": {"bad": "x", "ok": {"font": "Sans 9", "future": 1}}})
+        profiles = TerminalProfiles(config)
+        assert profiles.names() == [DEFAULT_PROFILE, "ok"]
+        assert profiles.get("ok").font == "Sans 9"
+
+    def test_reload_reports_changed_fields(self, config):
+        """Test reload returns the changed appearance fields per profile."""
+        profiles = TerminalProfiles(config)
+        config.values["terminal.font"] = "Monospace 13"
+        config.values["terminal.profiles"]["remote"]["shell"] = "mosh host"
+        changes = profiles.reload()
+        # remote overrides the font, so only the profiles inheriting it change
+        assert changes == {DEFAULT_PROFILE: {"font"}, "prod": {"font"}}
+        assert profiles.get("remote").shell == "mosh host"
+
+    def test_appearance_cached_per_profile(self, config, monkeypatch):
+        """Test fonts and colors are parsed once per profile until it changes."""
+        parsed = []
+        monkeypatch.setattr(
+            profiles_module, "parse_appearance", lambda profile: parsed.append(profile.name) or object()
+        )
+        profiles = TerminalProfiles(config)
+        first = profiles.appearance(profiles.get("prod"))
+        assert profiles.appearance(profiles.get("prod")) is first
+        profiles.appearance(profiles.get("remote"))
+        assert parsed == ["prod", "remote"]
+
+        config.values["terminal.profiles"]["prod"]["background_color"] = "#000040"
+        profiles.reload()
+        profiles.appearance(profiles.get("prod"))
+        profiles.appearance(profiles.get("remote"))
+        assert parsed == ["prod", "remote", "prod"]